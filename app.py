@@ -1,13 +1,19 @@
 from osint.ai_image_detector import analyze_ai_image
 
-from flask import Flask, render_template, request, send_file
+from flask import Flask, Response, redirect, render_template, request, send_file, stream_with_context, url_for
 from datetime import datetime
+import json
+import math
 import os
+import tempfile
 import time
 from reportlab.lib.pagesizes import A4
 from reportlab.pdfgen import canvas
+from werkzeug.utils import secure_filename
 
-from osint.username_scan import scan_username
+from osint.username_scan import scan_username, scan_usernames
+from osint import distributed, dns_resolver
+from osint.monitor import get_monitor
 from osint.image_osint import extract_image_metadata
 from osint.risk_engine import calculate_risk
 from osint.history import save_scan, compare_last_scan
@@ -15,11 +21,14 @@ from osint.reverse_osint import detect_trackers
 from osint.text_osint import analyze_text
 from osint.geo_osint import infer_location
 from osint.web_exposure import analyze_website_exposure
+from osint.path_discovery import iter_discover_paths
 from osint.username_discovery import discover_username
-from osint.username_enumerator import enumerate_username
+from osint.username_enumerator import enumerate_username, iter_enumerate_username
 from osint.reverse_image_intelligence import analyze_image_exposure
 from osint.reverse_engagement import analyze_engagement_exposure
 from osint.reverse_risk import calculate_reverse_risk
+from osint.jobs import QueueFull, get_queue as get_job_queue, submit as submit_job
+from osint.batch import Checkpoint, Summary, iter_domain_sweep, read_lines
 
 
 # OPTIONAL MEDIA OSINT
@@ -38,6 +47,8 @@ app = Flask(__name__)
 
 LAST_SCAN = {}
 
+RESULTS_PER_PAGE = 50
+
 # ================= ROUTES =================
 
 @app.route("/")
@@ -51,10 +62,108 @@ def test():
 @app.route("/scan", methods=["GET", "POST"])
 def index():
     if request.method == "POST":
-        return run_scan()
+        return enqueue("scan", run_scan, scan_inputs_from_request())
     return render_template("index.html")
 
 
+# ================= JOBS =================
+
+# Job kind -> template its result context renders with
+JOB_TEMPLATES = {
+    "scan": "result.html",
+    "ai_image": "ai_image_result.html",
+    "web_exposure": "web_exposure_result.html",
+    "username_exposure": "username_exposure.html",
+    "reverse": "reverse_result.html",
+}
+
+
+def enqueue(kind, fn, *args):
+    """
+    Hand heavy work to the job queue and send the browser to the
+    job page; the web worker is free again immediately.
+    """
+    try:
+        job = submit_job(kind, fn, *args)
+    except QueueFull:
+        return (
+            render_template("job_pending.html", job=None, queue=get_job_queue().stats(),
+                            error="Too many scans are queued right now, please retry shortly."),
+            503,
+            {"Retry-After": "10"}
+        )
+    return redirect(url_for("job_page", job_id=job.id))
+
+
+@app.route("/jobs")
+def jobs_overview():
+    return get_job_queue().stats()
+
+
+@app.route("/jobs/<job_id>")
+def job_page(job_id):
+    jobs = get_job_queue()
+    job = jobs.get(job_id)
+
+    if job is None:
+        return "Unknown or expired job", 404
+
+    if job.status == "done":
+        return render_template(JOB_TEMPLATES[job.kind], **job.result)
+
+    return render_template(
+        "job_pending.html",
+        job=job,
+        position=jobs.position(job),
+        queue=jobs.stats(),
+        error=job.error
+    )
+
+
+@app.route("/jobs/<job_id>/status")
+def job_status(job_id):
+    jobs = get_job_queue()
+    job = jobs.get(job_id)
+
+    if job is None:
+        return {"error": "Unknown or expired job"}, 404
+
+    return {**job.as_dict(), "position": jobs.position(job), "queue": jobs.stats()}
+
+
+# Outbound HTTP resolves hostnames through the shared DNS cache
+dns_resolver.install_http_resolution()
+
+
+# ================= MONITORING =================
+
+# Rescans run in this process when enabled (background priority)
+if os.environ.get("OSINT_MONITOR", "0") == "1":
+    get_monitor().start()
+
+
+@app.route("/monitor")
+def monitor_overview():
+    monitor = get_monitor()
+    return {
+        **monitor.stats(),
+        "changes": monitor.changes(since=request.args.get("since", 0, type=int))
+    }
+
+
+@app.route("/monitor/subjects", methods=["POST"])
+def monitor_add():
+    kind = request.form.get("kind", "username")
+    values = request.form.get("values", "").split()
+    interval = request.form.get("interval", 24 * 3600, type=float)
+
+    try:
+        added = get_monitor().add_many(kind, values, interval=interval)
+    except ValueError as e:
+        return {"error": str(e)}, 400
+    return {"added": added}
+
+
 # ================= AI IMAGE =================
 
 @app.route("/ai-image-detector")
@@ -73,13 +182,13 @@ def ai_image_upload():
     image_path = os.path.join("uploads", image.filename)
     image.save(image_path)
 
-    ai_result = analyze_ai_image(image_path)
+    return enqueue("ai_image", ai_image_job, image_path, image.filename)
+
+
+def ai_image_job(image_path, filename):
+    return {"filename": filename, "result": analyze_ai_image(image_path)}
+
 
-    return render_template(
-        "ai_image_result.html",
-        filename=image.filename,
-        result=ai_result
-    )
 @app.route("/web-exposure")
 def web_exposure():
     return render_template("web_exposure.html")
@@ -95,22 +204,146 @@ def web_exposure_scan():
             error="Please enter a domain or URL"
         )
 
-    result = analyze_website_exposure(target)
+    return enqueue("web_exposure", web_exposure_job, target)
 
-    return render_template(
-        "web_exposure_result.html",
-        result=result
+
+def web_exposure_job(target):
+    return {"result": analyze_website_exposure(target)}
+
+
+def _save_upload(upload, prefix):
+    """
+    Uploaded list to a temp file, read lazily by the sweep; remove it
+    with _discard_upload once the response is done.
+    """
+    fd, path = tempfile.mkstemp(prefix=prefix, suffix=".txt")
+    os.close(fd)
+    upload.save(path)
+    return path
+
+
+def _discard_upload(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+@app.route("/web-exposure/batch", methods=["POST"])
+def web_exposure_batch():
+    """
+    Domains (form field "domains", one per line, or an uploaded
+    "domains_file") in, one NDJSON exposure record per domain out as
+    each finishes, then a summary line. Passing the same "checkpoint"
+    name again resumes where the last run stopped.
+    """
+    upload_path = None
+    upload = request.files.get("domains_file")
+    if upload and upload.filename:
+        upload_path = _save_upload(upload, "domains-")
+        domains = read_lines(upload_path)
+    else:
+        domains = iter([
+            line.strip() for line in request.form.get("domains", "").splitlines()
+            if line.strip() and not line.startswith("#")
+        ])
+
+    name = secure_filename(request.form.get("checkpoint", ""))
+    checkpoint = Checkpoint(os.path.join("data", "domain_batches", f"{name}.checkpoint") if name else None)
+    budget = request.form.get("budget", type=float)
+    host_rate = request.form.get("host_rate", type=float)
+
+    def generate():
+        summary = Summary()
+
+        def skip(domain):
+            if domain in checkpoint:
+                summary.skipped += 1
+                return True
+            return False
+
+        try:
+            for domain, record, error in iter_domain_sweep(
+                domains, budget=budget, host_rate=host_rate, skip=skip
+            ):
+                if error:
+                    summary.failed += 1
+                    yield json.dumps({"domain": domain, "status": "ERROR", "error": error}) + "\n"
+                    continue
+                checkpoint.mark(domain)
+                summary.add([record])
+                yield json.dumps(record) + "\n"
+        finally:
+            checkpoint.close()
+
+        yield json.dumps({"summary": summary.as_dict()}) + "\n"
+
+    response = Response(
+        stream_with_context(generate()),
+        mimetype="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+    if upload_path:
+        response.call_on_close(lambda: _discard_upload(upload_path))
+    return response
+
+
+@app.route("/web-exposure/paths", methods=["POST"])
+def web_exposure_paths():
+    """
+    Wordlist path discovery for one "target": the bundled list, or an
+    uploaded "wordlist_file". One NDJSON line per real hit (soft-404
+    answers filtered out), then a summary line.
+    """
+    target = request.form.get("target", "").strip()
+    if not target:
+        return Response(json.dumps({"error": "target is required"}), status=400,
+                        mimetype="application/json")
+
+    rate = request.form.get("rate", type=float)
+    if rate is not None and not rate > 0:
+        return Response(json.dumps({"error": "rate must be positive"}), status=400,
+                        mimetype="application/json")
+
+    wordlist = None
+    upload = request.files.get("wordlist_file")
+    if upload and upload.filename:
+        wordlist = _save_upload(upload, "wordlist-")
+
+    extensions = [""] + request.form.get("extensions", "").split()
+    budget = request.form.get("budget", type=float)
+
+    def generate():
+        stats = {}
+        for hit in iter_discover_paths(
+            target, wordlist=wordlist, rate=rate, extensions=extensions, budget=budget, stats=stats
+        ):
+            yield json.dumps(hit) + "\n"
+        yield json.dumps({"summary": stats}) + "\n"
+
+    response = Response(
+        stream_with_context(generate()),
+        mimetype="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
+    if wordlist:
+        response.call_on_close(lambda: _discard_upload(wordlist))
+    return response
+
+
 @app.route("/username-exposure", methods=["GET", "POST"])
 def username_exposure():
-    result = None
-
     if request.method == "POST":
         username = request.form.get("username", "").strip()
         if username:
-            result = discover_username(username)
+            return enqueue("username_exposure", username_exposure_job, username)
+
+    return render_template("username_exposure.html", result=None)
+
+
+def username_exposure_job(username):
+    return {"result": discover_username(username)}
 
-    return render_template("username_exposure.html", result=result)
 
 @app.route("/username-osint", methods=["GET", "POST"])
 def username_osint():
@@ -123,15 +356,67 @@ def username_osint():
                 error="Username is required"
             )
 
-        results = enumerate_username(username)
+        # Paginated server-side render only when explicitly asked for;
+        # otherwise the page fills in from /username-osint/stream
+        if request.form.get("stream") == "0":
+            return redirect(url_for("username_osint_results", username=username))
 
         return render_template(
             "username_result.html",
             username=username,
-            results=results
+            results=None
         )
 
     return render_template("username_scan.html")
+
+
+@app.route("/username-osint/results")
+def username_osint_results():
+    username = request.args.get("username", "").strip()
+
+    if not username:
+        return render_template(
+            "username_scan.html",
+            error="Username is required"
+        )
+
+    page = request.args.get("page", 1, type=int)
+    status = request.args.get("status") or None
+
+    # Repeat pages are served from the probe cache, not the network
+    rows, total = enumerate_username(username).page(page, RESULTS_PER_PAGE, status)
+
+    return render_template(
+        "username_result.html",
+        username=username,
+        results=dict(rows),
+        page=page,
+        pages=max(1, math.ceil(total / RESULTS_PER_PAGE)),
+        total=total,
+        status_filter=status
+    )
+
+
+@app.route("/username-osint/stream")
+def username_osint_stream():
+    username = request.args.get("username", "").strip()
+
+    if not username:
+        return {"error": "Username is required"}, 400
+
+    status = request.args.get("status") or None
+
+    def generate():
+        # One NDJSON line per platform, flushed as each probe finishes
+        for platform, info in iter_enumerate_username(username):
+            if status is None or info.status == status:
+                yield json.dumps({"platform": platform, **info._asdict()}) + "\n"
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 # ================= REVERSE OSINT (IMAGE EXPOSURE) =================
 
 @app.route("/reverse-osint", methods=["GET", "POST"])
@@ -147,27 +432,81 @@ def reverse_osint():
             image_path = os.path.join("uploads/reverse_images", image.filename)
             image.save(image_path)
 
-        image_intel = analyze_image_exposure(image_path, image_url)
-        engagement = analyze_engagement_exposure(image_intel)
-        risk = calculate_reverse_risk(engagement)
-
-        return render_template(
-            "reverse_result.html",
-            image_intel=image_intel,
-            engagement=engagement,
-            risk=risk
-        )
+        return enqueue("reverse", reverse_job, image_path, image_url)
 
     return render_template("reverse_upload.html")
 
 
+def reverse_job(image_path, image_url):
+    image_intel = analyze_image_exposure(image_path, image_url)
+    engagement = analyze_engagement_exposure(image_intel)
+
+    return {
+        "image_intel": image_intel,
+        "engagement": engagement,
+        "risk": calculate_reverse_risk(engagement)
+    }
+
+
 # ================= SCAN LOGIC =================
 
-def run_scan():
+def scan_inputs_from_request():
+    """
+    Everything run_scan needs, as plain values: uploads are saved here,
+    while the request is still open, and passed on as paths.
+    """
+
+    os.makedirs("uploads", exist_ok=True)
+
+    inputs = {
+        "mode": request.form.get("mode", "single"),
+        "single_username": request.form.get("single_username"),
+        "platform_map": {
+            "Instagram": request.form.get("instagram"),
+            "Facebook": request.form.get("facebook"),
+            "Threads": request.form.get("threads"),
+        },
+        "text_input": request.form.get("text_input", ""),
+    }
+
+    for field in ("image_file", "video_file", "audio_file"):
+        upload = request.files.get(field)
+        path = None
+        if upload and upload.filename:
+            path = os.path.join("uploads", upload.filename)
+            upload.save(path)
+        inputs[field.replace("_file", "_path")] = path
+
+    return inputs
+
+
+def _unchecked_platforms(res):
+    """
+    platform -> why it is neither found nor ruled out, for the report.
+    """
+    reasons = {}
+    for plat in res.get("inconclusive_platforms", []):
+        reasons[plat] = "No conclusive answer"
+    for plat in res.get("timed_out_platforms", []):
+        reasons[plat] = "No answer before the scan deadline"
+    for plat in res.get("rate_limited_platforms", []):
+        reasons[plat] = "Platform was rate limiting or blocking requests"
+    for plat in res.get("invalid_platforms", []):
+        reasons[plat] = "Username is not valid on this platform (not checked)"
+    return reasons
+
+
+def run_scan(inputs):
+    """
+    Full correlated scan; runs on a job worker.
+    Returns the result.html template context.
+    """
     global LAST_SCAN
 
     platforms_found = {}
     inconclusive = set()
+    invalid = set()
+    unchecked = {}
 
     image_data = None
     video_risk = {}
@@ -176,60 +515,41 @@ def run_scan():
     geo_risk = {}
 
     trackers = []
-    mode = request.form.get("mode", "single")
-
-    os.makedirs("uploads", exist_ok=True)
+    mode = inputs.get("mode", "single")
 
     # -------- MEDIA --------
-    image_file = request.files.get("image_file")
-    video_file = request.files.get("video_file")
-    audio_file = request.files.get("audio_file")
-
-    if image_file and image_file.filename:
-        path = os.path.join("uploads", image_file.filename)
-        image_file.save(path)
-        image_data = extract_image_metadata(path)
+    if inputs.get("image_path"):
+        image_data = extract_image_metadata(inputs["image_path"])
 
-    if video_file and video_file.filename and analyze_video:
-        path = os.path.join("uploads", video_file.filename)
-        video_file.save(path)
-        video_risk = analyze_video(path)
+    if inputs.get("video_path") and analyze_video:
+        video_risk = analyze_video(inputs["video_path"])
 
-    if audio_file and audio_file.filename and analyze_audio:
-        path = os.path.join("uploads", audio_file.filename)
-        audio_file.save(path)
-        audio_risk = analyze_audio(path)
+    if inputs.get("audio_path") and analyze_audio:
+        audio_risk = analyze_audio(inputs["audio_path"])
 
     # -------- USERNAME --------
     
     if mode == "single":
-        username = request.form.get("single_username")
+        username = inputs.get("single_username")
         if username:
-            res = scan_username(username)
+            res = (distributed.scan_username if distributed.ENABLED else scan_username)(username)
             platforms_found = res.get("platforms_found", {})
             inconclusive.update(res.get("inconclusive_platforms", []))
+            invalid.update(res.get("invalid_platforms", []))
+            unchecked = _unchecked_platforms(res)
 
     else:
-        platform_map = {
-            "Instagram": request.form.get("instagram"),
-            "Facebook": request.form.get("facebook"),
-            "Threads": request.form.get("threads"),
-        }
-
-        for platform, uname in platform_map.items():
-            if not uname:
-                continue
-    
-            res = scan_username(uname, platform=platform)
-
-            pf = res.get("platforms_found", {})
-            if platform in pf:
-                platforms_found[platform] = pf[platform]
-            else:
-                inconclusive.add(platform)
+        # All platforms go through the probe engine as one batch
+        res = (distributed.scan_usernames if distributed.ENABLED else scan_usernames)(
+            inputs.get("platform_map", {})
+        )
+        platforms_found = res.get("platforms_found", {})
+        inconclusive.update(res.get("inconclusive_platforms", []))
+        invalid.update(res.get("invalid_platforms", []))
+        unchecked = _unchecked_platforms(res)
 
     # -------- TEXT --------
-    text_input = request.form.get("text_input", "")
+    text_input = inputs.get("text_input", "")
     if text_input.strip():
         text_risk = analyze_text(text_input)
 
@@ -240,6 +560,10 @@ def run_scan():
     correlated = {
         "platforms_found": platforms_found,
         "inconclusive_platforms": sorted(inconclusive),
+        # Handle syntax rules out an account there: never probed
+        "invalid_platforms": sorted(invalid),
+        # platform -> reason, for every platform neither found nor ruled out
+        "unchecked_platforms": dict(sorted(unchecked.items())),
         "text_risk": text_risk,
         "geo_risk": geo_risk,
         "image_metadata": image_data,
@@ -265,13 +589,12 @@ def run_scan():
         "scan_time": datetime.now().strftime("%d %b %Y, %H:%M:%S")
     }
 
-    return render_template(
-        "result.html",
-        data=correlated,
-        risk=risk,
-        trackers=set(trackers),
-        scan_time=LAST_SCAN["scan_time"]
-    )
+    return {
+        "data": correlated,
+        "risk": risk,
+        "trackers": set(trackers),
+        "scan_time": LAST_SCAN["scan_time"]
+    }
 
 # ================= SAFE PDF DOWNLOAD =================
 
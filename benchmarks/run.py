@@ -0,0 +1,275 @@
+"""
+Offline scanner benchmarks against the local stub platform server.
+
+    python -m benchmarks.run --label baseline
+    python -m benchmarks.run --label after --compare benchmarks/results/baseline.json
+
+Each scenario runs in a fresh process (clean caches, clean peak RSS)
+with all outbound HTTP rewritten to the stub. Reports probes/sec,
+p50/p95/p99 probe latency, peak RSS and connections opened, and writes
+everything to JSON for comparison between versions.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.request import urlopen
+
+from benchmarks import stub_dns, stub_proxy, stub_server
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+SCENARIOS = [
+    "scan_username",
+    "enumerate_username",
+    "discover_username",
+    "bulk_username_scan",
+    "analyze_website_exposure",
+]
+
+
+# ================= CHILD SIDE =================
+
+def _percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    k = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return round(ordered[k] * 1000, 1)
+
+
+def _write_tier_files(directory, count):
+    half = count // 2
+    tier2 = {
+        f"Bench{i}": {"url": f"https://p{i}.bench/{{username}}", "failure": ["not found"]}
+        for i in range(half)
+    }
+    tier3 = {
+        f"Bench{i}": {"url": f"https://p{i}.bench/u/{{username}}"}
+        for i in range(half, count)
+    }
+    (directory / "tier2.json").write_text(json.dumps(tier2))
+    (directory / "tier3.json").write_text(json.dumps(tier3))
+
+
+def _scenario_calls(name, usernames, tier_dir):
+    if name == "scan_username":
+        from osint.username_scan import scan_username
+        return [lambda u=u: scan_username(u, bypass_cache=True) for u in usernames]
+
+    if name == "enumerate_username":
+        from osint.username_enumerator import enumerate_username
+        return [lambda u=u: enumerate_username(u, bypass_cache=True) for u in usernames]
+
+    if name == "discover_username":
+        from osint.username_discovery import discover_username
+        return [lambda u=u: discover_username(u, bypass_cache=True) for u in usernames]
+
+    if name == "bulk_username_scan":
+        from osint import platform_registry
+        from osint.username_bulk_scan import bulk_username_scan
+        platform_registry.PLATFORM_DIR = tier_dir
+        platform_registry.reload(force=True)
+        return [
+            lambda u=u: bulk_username_scan(u, bypass_cache=True)
+            for u in usernames[:max(1, len(usernames) // 10)]
+        ]
+
+    if name == "analyze_website_exposure":
+        from osint import web_exposure
+        return [
+            lambda i=i: web_exposure.analyze_website_exposure(f"http://site{i}.bench")
+            for i in range(len(usernames))
+        ]
+
+    raise ValueError(name)
+
+
+def _run_scenario(name, base_url, opts, tier_dir, routes, dns_address, queue):
+    # Stub traffic must not leak into the real yield history
+    os.environ["OSINT_PROBE_STATS_PATH"] = ""
+
+    from osint import dns_resolver, egress, http_client
+
+    http_client.set_rewriter(stub_server.route_to(base_url))
+    egress.configure(routes)
+    dns_resolver.configure([dns_address])
+
+    latencies = []
+    http_client.add_response_hook(
+        lambda r, *a, **k: latencies.append(r.elapsed.total_seconds())
+    )
+
+    usernames = [
+        f"{stub_server.FOUND_PREFIX}user{i}" if i % 3 == 0 else f"ghost{i}"
+        for i in range(opts["iterations"])
+    ]
+    calls = _scenario_calls(name, usernames, Path(tier_dir))
+
+    errors = 0
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=opts["concurrency"]) as pool:
+        for future in [pool.submit(call) for call in calls]:
+            try:
+                future.result()
+            except Exception:
+                errors += 1
+    elapsed = time.monotonic() - start
+
+    queue.put({
+        "calls": len(calls),
+        "call_errors": errors,
+        "elapsed_sec": round(elapsed, 3),
+        "latency_ms": {
+            "p50": _percentile(latencies, 50),
+            "p95": _percentile(latencies, 95),
+            "p99": _percentile(latencies, 99),
+        },
+        # ru_maxrss is KiB on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    })
+
+
+# ================= PARENT SIDE =================
+
+def _stub_stats(server, path):
+    with urlopen(server.base_url + path) as r:
+        return json.loads(r.read())
+
+
+def run(opts):
+    config = stub_server.StubConfig(
+        latency_ms=opts["latency_ms"],
+        jitter_ms=opts["jitter_ms"],
+        error_rate=opts["error_rate"],
+        rate_429=opts["rate_429"],
+        payload_kb=opts["payload_kb"],
+        per_client_rps=opts["per_client_rps"],
+    )
+    server = stub_server.start(config)
+    proxies = [stub_proxy.start(f"egress{i}") for i in range(opts["proxies"])]
+    dns = stub_dns.start(latency_ms=opts["dns_latency_ms"])
+    ctx = multiprocessing.get_context("spawn")
+
+    tier_dir = tempfile.mkdtemp(prefix="osint-bench-")
+    _write_tier_files(Path(tier_dir), opts["platforms"])
+
+    report = {
+        "label": opts["label"],
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "stub": config.as_dict(),
+        "options": opts,
+        "scenarios": {},
+    }
+
+    for name in opts["scenarios"]:
+        _stub_stats(server, "/__reset")
+        with dns.lock:
+            dns.counters["queries"] = 0
+
+        queue = ctx.Queue()
+        proc = ctx.Process(
+            target=_run_scenario,
+            args=(name, server.base_url, opts, tier_dir, [p.url for p in proxies], dns.address, queue)
+        )
+        proc.start()
+        result = queue.get()
+        proc.join()
+
+        stub = _stub_stats(server, "/__stats")
+        # The /__stats call itself opened one connection
+        connections = max(0, stub["connections"] - 1)
+
+        result.update({
+            "probes": stub["requests"],
+            "probes_per_sec": round(stub["requests"] / result["elapsed_sec"], 1) if result["elapsed_sec"] else 0.0,
+            "connections_opened": connections,
+            "stub_errors": stub["errors"],
+            "stub_throttled": stub["throttled"],
+            "dns_queries": dns.counters["queries"],
+        })
+        report["scenarios"][name] = result
+        _print_row(name, result)
+
+    for proxy in proxies:
+        proxy.shutdown()
+    dns.shutdown()
+    server.shutdown()
+    return report
+
+
+def _print_row(name, r):
+    lat = r["latency_ms"]
+    print(
+        f"{name:26} {r['probes']:6d} probes  {r['probes_per_sec']:8.1f}/s  "
+        f"p50 {lat['p50']}  p95 {lat['p95']}  p99 {lat['p99']} ms  "
+        f"rss {r['peak_rss_mb']} MB  conns {r['connections_opened']}"
+    )
+
+
+def compare(report, baseline_path):
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    print(f"\nvs {baseline.get('label')} ({baseline_path})")
+    for name, now in report["scenarios"].items():
+        old = baseline.get("scenarios", {}).get(name)
+        if not old:
+            continue
+
+        def delta(a, b):
+            if a is None or b in (None, 0):
+                return "n/a"
+            return f"{(a - b) / b * 100:+.1f}%"
+
+        print(
+            f"{name:26} probes/s {delta(now['probes_per_sec'], old['probes_per_sec'])}  "
+            f"p95 {delta(now['latency_ms']['p95'], old['latency_ms']['p95'])}  "
+            f"rss {delta(now['peak_rss_mb'], old['peak_rss_mb'])}  "
+            f"conns {delta(now['connections_opened'], old['connections_opened'])}"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline OSINT scanner benchmarks")
+    parser.add_argument("--label", default="run")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--iterations", type=int, default=30, help="scanner calls per scenario")
+    parser.add_argument("--concurrency", type=int, default=8, help="concurrent scanner calls")
+    parser.add_argument("--platforms", type=int, default=400, help="synthetic tier-2/3 platforms")
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--jitter-ms", type=float, default=20)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--payload-kb", type=int, default=64)
+    parser.add_argument("--dns-latency-ms", type=float, default=20)
+    parser.add_argument("--per-client-rps", type=int, default=0,
+                        help="stub 429s each client (egress route) above this rate")
+    parser.add_argument("--proxies", type=int, default=0,
+                        help="local stand-in proxies to use as egress routes")
+    parser.add_argument("--output", help="JSON path (default benchmarks/results/<label>.json)")
+    parser.add_argument("--compare", help="earlier JSON report to diff against")
+    args = parser.parse_args(argv)
+
+    opts = {k: v for k, v in vars(args).items() if k not in ("output", "compare")}
+    report = run(opts)
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{args.label}.json"
+    os.makedirs(output.parent, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\n[✔] Saved {output}")
+
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Local stand-in DNS server (UDP) for the resolver and web-exposure
+benchmarks.
+
+Every name gets a fixed answer for each record type the scanners ask
+for; names starting with "nx" are NXDOMAIN (with an SOA, so negative
+caching has a TTL to go by). Latency and TTL are configurable, and
+queries are counted so cache hits show up as queries not sent.
+"""
+
+import socketserver
+import threading
+import time
+
+import dns.flags
+import dns.message
+import dns.rcode
+import dns.rdatatype
+import dns.rrset
+
+NX_PREFIX = "nx"
+
+
+def _records(name):
+    zone = name.split(".", 1)[-1] if name.count(".") > 1 else name
+    return {
+        "A": ["127.0.0.1"],
+        "AAAA": ["::1"],
+        "MX": [f"10 mail.{zone}."],
+        "TXT": ['"v=spf1 -all"'],
+        "NS": [f"ns1.{zone}.", f"ns2.{zone}."],
+        "CAA": ['0 issue "letsencrypt.org"'],
+        "SOA": [f"ns1.{zone}. hostmaster.{zone}. 1 7200 3600 1209600 30"],
+    }
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self):
+        data, sock = self.request
+        server = self.server
+
+        try:
+            query = dns.message.from_wire(data)
+        except Exception:
+            return
+
+        with server.lock:
+            server.counters["queries"] += 1
+
+        if server.latency_ms:
+            time.sleep(server.latency_ms / 1000)
+
+        response = dns.message.make_response(query)
+        response.flags |= dns.flags.AA
+        question = query.question[0]
+        name = question.name.to_text().rstrip(".").lower()
+        rtype = dns.rdatatype.to_text(question.rdtype)
+
+        if name.startswith(NX_PREFIX):
+            response.set_rcode(dns.rcode.NXDOMAIN)
+            response.authority.append(dns.rrset.from_text(
+                question.name, server.ttl, "IN", "SOA", _records(name)["SOA"][0]
+            ))
+            with server.lock:
+                server.counters["nxdomain"] += 1
+        else:
+            values = _records(name).get(rtype)
+            if values:
+                response.answer.append(dns.rrset.from_text_list(
+                    question.name, server.ttl, "IN", rtype, values
+                ))
+
+        sock.sendto(response.to_wire(), self.client_address)
+
+
+class _Server(socketserver.ThreadingUDPServer):
+    daemon_threads = True
+
+
+def start(latency_ms=0, ttl=300, port=0):
+    """
+    Start the stub in a background thread; returns the server.
+    server.address ("127.0.0.1:PORT") goes to dns_resolver.configure().
+    """
+    server = _Server(("127.0.0.1", port), _Handler)
+    server.latency_ms = latency_ms
+    server.ttl = ttl
+    server.lock = threading.Lock()
+    server.counters = {"queries": 0, "nxdomain": 0}
+    server.address = f"127.0.0.1:{server.server_address[1]}"
+
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
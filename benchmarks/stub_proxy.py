@@ -0,0 +1,95 @@
+"""
+Local stand-in for an egress proxy.
+
+A minimal forwarding HTTP proxy: takes absolute-form requests
+(GET http://127.0.0.1:PORT/... HTTP/1.1), replays them upstream and
+tags each with an X-Egress header naming the proxy, so the stub
+server can tell the egress routes apart the way a real platform tells
+source addresses apart. Only plain HTTP (no CONNECT), which is all the
+stub server speaks.
+"""
+
+import threading
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.error import HTTPError
+
+# Hop-by-hop headers a proxy must not forward
+HOP_HEADERS = {
+    "connection", "keep-alive", "proxy-connection", "proxy-authorization",
+    "te", "trailers", "transfer-encoding", "upgrade",
+}
+
+# Upstream fetches bypass any proxy settings in the environment
+_opener = urllib.request.build_opener(urllib.request.ProxyHandler({}))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _relay(self, status, headers, body):
+        self.send_response(status)
+        for k, v in headers:
+            if k.lower() not in HOP_HEADERS and k.lower() != "content-length":
+                self.send_header(k, v)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def do_HEAD(self):
+        self.do_GET()
+
+    def do_GET(self):
+        server = self.server
+
+        with server.lock:
+            server.counters["requests"] += 1
+
+        headers = {
+            k: v for k, v in self.headers.items()
+            if k.lower() not in HOP_HEADERS and k.lower() != "host"
+        }
+        headers["X-Egress"] = server.name
+
+        req = urllib.request.Request(self.path, headers=headers, method=self.command)
+        try:
+            with _opener.open(req, timeout=30) as resp:
+                return self._relay(resp.status, resp.getheaders(), resp.read())
+        except HTTPError as e:
+            return self._relay(e.code, e.headers.items(), e.read())
+        except OSError:
+            with server.lock:
+                server.counters["upstream_errors"] += 1
+            self.send_response(502)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops SYNs under bursts of new
+    # connections, which shows up as 1 s retransmit stalls
+    request_queue_size = 128
+
+    def handle_error(self, request, client_address):
+        pass
+
+
+def start(name=None, port=0):
+    """
+    Start a proxy in a background thread; returns the server.
+    server.url goes into OSINT_EGRESS_ROUTES; server.shutdown() plus
+    server.server_close() turns it into a dead route.
+    """
+    server = _Server(("127.0.0.1", port), _Handler)
+    server.name = name or f"proxy{server.server_port}"
+    server.lock = threading.Lock()
+    server.counters = {"requests": 0, "upstream_errors": 0}
+    server.url = f"http://127.0.0.1:{server.server_port}"
+
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -0,0 +1,245 @@
+"""
+Local stand-in for the platforms the scanners probe.
+
+Requests arrive as  http://127.0.0.1:PORT/<original host>/<original path>
+(see route_to) and get a canned page for that host. Latency, error
+rate, 429 rate and payload size are configurable so scanner throughput
+can be measured without touching real platforms. per_client_rps
+throttles each client (X-Egress header from stub_proxy, else "direct")
+like a per-IP platform limit. soft_404 makes unknown paths answer 200
+with a "not found" page that quotes the path back, as many sites do.
+"""
+
+import json
+import random
+from collections import defaultdict, deque
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+# Usernames with this prefix "exist" on every stub platform
+FOUND_PREFIX = "real"
+
+# (found page, not-found page, not-found status) per host
+PAGES = {
+    "www.instagram.com": (
+        '<script>{"username":"{u}","is_private":false}' + '{"shortcode":"x"}' * 30 + "</script>",
+        "<h2>Sorry, this page isn't available.</h2>",
+        404,
+    ),
+    "www.facebook.com": (
+        "<div>timeline friends photos " + "post " * 25 + "</div>",
+        "<div>This content isn't available right now. Page not found</div>",
+        404,
+    ),
+    "www.threads.net": (
+        "<title>{u} on Threads</title>",
+        "<title>Threads</title> page not found",
+        404,
+    ),
+    "github.com": (
+        "<div>{u} · 12 repositories · 30 followers</div>",
+        "<h1>Not Found</h1>",
+        404,
+    ),
+    "www.reddit.com": (
+        "<div>u/{u} · 1,024 karma</div>",
+        "<div>Sorry, nobody on Reddit goes by that name.</div>",
+        404,
+    ),
+}
+
+GENERIC = (
+    "<html><body>profile of {u}</body></html>",
+    "<html><body>not found</body></html>",
+    404,
+)
+
+# Web-exposure target pages (any host, by path); the backup and dump
+# are large so byte-capped sniffing shows in peak RSS
+SITE_PATHS = {
+    "/robots.txt": (200, "User-agent: *\nDisallow: /admin\nSitemap: https://example/sitemap.xml\n"),
+    "/.env": (200, "APP_KEY=base64:abcdef\nDB_PASSWORD=hunter2\n" * 4),
+    "/admin": (200, "<html><form>admin login</form></html>" * 4),
+    "/backup.zip": (200, b"PK\x03\x04" + bytes(32 * 1024 * 1024)),
+    "/db.sql": (200, (
+        "-- MySQL dump 10.13\nCREATE TABLE users (id int);\n"
+        + "INSERT INTO users VALUES (1);\n" * 500_000
+    ).encode()),
+}
+
+
+class StubConfig:
+    def __init__(self, latency_ms=50, jitter_ms=20, error_rate=0.0,
+                 rate_429=0.0, payload_kb=64, per_client_rps=0, ranges=True, soft_404=False, seed=7):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_429 = rate_429
+        self.payload_kb = payload_kb
+        self.per_client_rps = per_client_rps
+        self.ranges = ranges
+        self.soft_404 = soft_404
+        self.random = random.Random(seed)
+
+    def as_dict(self):
+        return {
+            "latency_ms": self.latency_ms,
+            "jitter_ms": self.jitter_ms,
+            "error_rate": self.error_rate,
+            "rate_429": self.rate_429,
+            "payload_kb": self.payload_kb,
+            "per_client_rps": self.per_client_rps,
+            "ranges": self.ranges,
+            "soft_404": self.soft_404,
+        }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.counters["connections"] += 1
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body, headers=()):
+        data = body.encode("utf-8") if isinstance(body, str) else body
+        headers = list(headers)
+
+        # Single "bytes=a-b" ranges, as the sniffing probes send
+        rng = self.headers.get("Range", "")
+        if status == 200 and self.server.config.ranges and rng.startswith("bytes="):
+            first, _, last = rng[6:].partition("-")
+            first = int(first or 0)
+            last = min(int(last) if last else len(data) - 1, len(data) - 1)
+            headers.append(("Content-Range", f"bytes {first}-{last}/{len(data)}"))
+            status, data = 206, data[first:last + 1]
+
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for k, v in headers:
+            self.send_header(k, v)
+        self.end_headers()
+        if self.command != "HEAD":
+            try:
+                self.wfile.write(data)
+            except (BrokenPipeError, ConnectionResetError):
+                # Clients stop reading large bodies on purpose
+                with self.server.lock:
+                    self.server.counters["resets"] += 1
+
+    def do_HEAD(self):
+        self.do_GET()
+
+    def do_GET(self):
+        server = self.server
+
+        if self.path == "/__stats":
+            with server.lock:
+                return self._send(200, json.dumps(server.counters))
+        if self.path == "/__reset":
+            with server.lock:
+                for k in server.counters:
+                    server.counters[k] = 0
+                server.clients.clear()
+            return self._send(200, "{}")
+
+        client = self.headers.get("X-Egress", "direct")
+
+        with server.lock:
+            server.counters["requests"] += 1
+            cfg = server.config
+            over_limit = False
+            if cfg.per_client_rps:
+                now = time.monotonic()
+                recent = server.clients[client]
+                while recent and recent[0] <= now - 1.0:
+                    recent.popleft()
+                over_limit = len(recent) >= cfg.per_client_rps
+                if not over_limit:
+                    recent.append(now)
+            if over_limit:
+                server.counters["throttled"] += 1
+            delay = max(0.0, cfg.latency_ms + cfg.random.uniform(-cfg.jitter_ms, cfg.jitter_ms)) / 1000
+            roll = cfg.random.random()
+
+        if over_limit:
+            return self._send(429, "Too Many Requests", [("Retry-After", "1")])
+
+        time.sleep(delay)
+
+        if roll < cfg.error_rate:
+            with server.lock:
+                server.counters["errors"] += 1
+            return self._send(500, "<h1>Internal Server Error</h1>")
+
+        if roll < cfg.error_rate + cfg.rate_429:
+            with server.lock:
+                server.counters["throttled"] += 1
+            return self._send(429, "Too Many Requests", [("Retry-After", "1")])
+
+        host, _, rest = self.path.lstrip("/").partition("/")
+        path = "/" + rest
+
+        if path.split("?")[0] in SITE_PATHS:
+            status, body = SITE_PATHS[path.split("?")[0]]
+            return self._send(status, body)
+
+        found_page, missing_page, missing_status = PAGES.get(host, GENERIC)
+        username = path.strip("/").split("/")[-1].lstrip("@~")
+        padding = "<!-- " + "x" * (cfg.payload_kb * 1024) + " -->"
+
+        if username.startswith(FOUND_PREFIX):
+            return self._send(200, found_page.replace("{u}", username) + padding)
+        if cfg.soft_404 and host not in PAGES:
+            return self._send(200, (
+                f"<html><body><h1>Oops</h1><p>{path} could not be found.</p>"
+                f"<!-- request {cfg.random.getrandbits(48)} --></body></html>" + padding
+            ))
+        return self._send(missing_status, missing_page + padding)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops SYNs under bursts of new
+    # connections, which shows up as 1 s retransmit stalls
+    request_queue_size = 128
+
+    def handle_error(self, request, client_address):
+        # Clients hanging up mid-body (early-stop reads) are expected
+        with self.lock:
+            self.counters["resets"] += 1
+
+
+def start(config=None, port=0):
+    """
+    Start the stub in a background thread; returns the server.
+    server.base_url is what route_to() needs.
+    """
+    server = _Server(("127.0.0.1", port), _Handler)
+    server.config = config or StubConfig()
+    server.lock = threading.Lock()
+    server.clients = defaultdict(deque)
+    server.counters = {"connections": 0, "requests": 0, "errors": 0, "throttled": 0, "resets": 0}
+    server.base_url = f"http://127.0.0.1:{server.server_port}"
+
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def route_to(base_url):
+    """
+    URL rewriter for osint.http_client.set_rewriter():
+    https://github.com/bob -> <base_url>/github.com/bob
+    """
+    def rewrite(url):
+        parts = urlsplit(url)
+        query = f"?{parts.query}" if parts.query else ""
+        return f"{base_url}/{parts.netloc}{parts.path or '/'}{query}"
+    return rewrite
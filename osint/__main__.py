@@ -0,0 +1,312 @@
+"""
+Batch command line for sweeps without the web UI:
+python -m osint {usernames,domains,paths,worker,monitor} --help
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+from osint.batch import (
+    SCANNERS, Checkpoint, NDJSONWriter, Summary, iter_domain_sweep, read_lines, username_records
+)
+
+
+# ================= WORKERS =================
+
+_options = {}
+
+
+def _init_worker(options):
+    global _options
+    _options = options
+
+    from osint import dns_resolver
+    dns_resolver.install_http_resolution()
+
+
+def _sweep_username(username):
+    try:
+        return username, username_records(
+            username,
+            scanners=_options["scanners"],
+            budget=_options["budget"],
+            bypass_cache=_options["bypass_cache"]
+        ), None
+    except Exception as e:
+        return username, [], f"{e.__class__.__name__}: {e}"
+
+
+# ================= COMMANDS =================
+
+def _checkpoint_path(args):
+    if args.checkpoint:
+        return args.checkpoint
+    if args.output and args.output != "-":
+        return args.output + ".checkpoint"
+    return None
+
+
+def run_usernames(args):
+    checkpoint = Checkpoint(_checkpoint_path(args))
+    writer = NDJSONWriter(args.output)
+    summary = Summary()
+
+    def pending():
+        seen = set()
+        for username in read_lines(args.input):
+            if username in checkpoint or username in seen:
+                summary.skipped += username in checkpoint
+                continue
+            seen.add(username)
+            yield username
+
+    options = {
+        "scanners": tuple(args.scanners),
+        "budget": args.budget,
+        "bypass_cache": args.bypass_cache,
+    }
+
+    ctx = multiprocessing.get_context("spawn")
+    pool = ctx.Pool(args.workers, initializer=_init_worker, initargs=(options,))
+
+    try:
+        for username, records, error in pool.imap_unordered(_sweep_username, pending()):
+            if error:
+                summary.failed += 1
+                print(f"[Batch] {username} failed: {error}", file=sys.stderr)
+                continue
+
+            writer.write_many(records)
+            checkpoint.mark(username)
+            summary.add(records)
+
+            if args.progress and summary.items % args.progress == 0:
+                summary.print()
+
+        pool.close()
+    except KeyboardInterrupt:
+        print("[Batch] Interrupted, re-run with the same checkpoint to resume", file=sys.stderr)
+        pool.terminate()
+    finally:
+        pool.join()
+        writer.close()
+        checkpoint.close()
+        summary.print()
+
+    return 1 if summary.failed else 0
+
+
+def run_domains(args):
+    checkpoint = Checkpoint(_checkpoint_path(args))
+    writer = NDJSONWriter(args.output)
+    summary = Summary()
+
+    def skip(domain):
+        if domain in checkpoint:
+            summary.skipped += 1
+            return True
+        return False
+
+    sweep = iter_domain_sweep(
+        read_lines(args.input),
+        workers=args.workers,
+        budget=args.budget,
+        host_rate=args.host_rate,
+        skip=skip
+    )
+
+    try:
+        for domain, record, error in sweep:
+            if error:
+                summary.failed += 1
+                print(f"[Batch] {domain} failed: {error}", file=sys.stderr)
+                continue
+
+            writer.write_many([record])
+            checkpoint.mark(domain)
+            summary.add([record])
+
+            if args.progress and summary.items % args.progress == 0:
+                summary.print()
+    except KeyboardInterrupt:
+        print("[Batch] Interrupted, re-run with the same checkpoint to resume", file=sys.stderr)
+    finally:
+        sweep.close()
+        writer.close()
+        checkpoint.close()
+        summary.print()
+
+    return 1 if summary.failed else 0
+
+
+def _positive(kind):
+    def parse(value):
+        number = kind(value)
+        if number <= 0:
+            raise argparse.ArgumentTypeError(f"must be positive, got {value}")
+        return number
+    return parse
+
+
+def run_paths(args):
+    from osint.path_discovery import iter_discover_paths
+
+    writer = NDJSONWriter(args.output)
+    stats = {}
+    start = time.monotonic()
+
+    hits = iter_discover_paths(
+        args.target,
+        wordlist=args.wordlist,
+        rate=args.rate,
+        concurrency=args.concurrency,
+        extensions=[""] + args.extensions,
+        budget=args.budget,
+        stats=stats
+    )
+
+    try:
+        for hit in hits:
+            writer.write_many([{"target": args.target, **hit}])
+    except KeyboardInterrupt:
+        print("[Paths] Interrupted", file=sys.stderr)
+    finally:
+        hits.close()
+        writer.close()
+
+    elapsed = time.monotonic() - start
+    print(
+        f"[Paths] {stats.get('checked', 0)} checked in {elapsed:.1f}s: "
+        f"{len(stats.get('calibration', []))} soft-404 fingerprint(s) "
+        f"({len(stats.get('calibration_errors', []))} calibration probes failed), "
+        f"{stats.get('soft_404', 0)} soft-404, {stats.get('duplicates', 0)} duplicate, "
+        f"{stats.get('errors', 0)} errors, {stats.get('rate_limited', 0)} rate limited"
+        + (" (budget ran out)" if stats.get("timed_out") else ""),
+        file=sys.stderr
+    )
+    return 0
+
+
+def run_worker(args):
+    from osint import distributed
+
+    queue = distributed.TaskQueue(args.queue) if args.queue else None
+    try:
+        done = distributed.run_worker(args.concurrency, once=args.once, queue=queue)
+    except KeyboardInterrupt:
+        # Leased tasks go back to the queue when their lease runs out
+        print("[Worker] Stopped", file=sys.stderr)
+        return 0
+    print(f"[Worker] {done} tasks done", file=sys.stderr)
+    return 0
+
+
+def run_monitor(args):
+    from osint.monitor import Monitor
+
+    monitor = Monitor(args.db) if args.db else Monitor()
+
+    if args.action == "add":
+        values = [v for source in args.values for v in (
+            read_lines(source) if os.path.exists(source) or source == "-" else [source]
+        )]
+        added = monitor.add_many(args.kind, values, interval=args.interval)
+        print(f"[Monitor] {added} new {args.kind} subjects ({len(values)} given)", file=sys.stderr)
+        return 0
+
+    if args.action == "remove":
+        for value in args.values:
+            monitor.remove(args.kind, value)
+        return 0
+
+    if args.action == "changes":
+        for change in monitor.changes(since=args.since, limit=args.limit):
+            print(json.dumps(change, ensure_ascii=False))
+        return 0
+
+    if args.action == "stats":
+        print(json.dumps(monitor.stats(), indent=2))
+        return 0
+
+    monitor.on_change(lambda kind, value, changes: print(
+        json.dumps({"kind": kind, "value": value, "changes": changes}, ensure_ascii=False),
+        flush=True
+    ))
+    monitor.start()
+    try:
+        while True:
+            time.sleep(60)
+    except KeyboardInterrupt:
+        monitor.stop()
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m osint", description="OSINT batch sweeps")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    users = sub.add_parser("usernames", help="sweep a list of usernames")
+    users.add_argument("input", help="file with one username per line, or - for stdin")
+    users.add_argument("-o", "--output", help="NDJSON file to append to (default stdout)")
+    users.add_argument("--scanners", nargs="+", choices=SCANNERS, default=["enumerate"])
+    users.add_argument("--workers", type=int, default=min(8, os.cpu_count() or 4),
+                       help="worker processes")
+    users.add_argument("--budget", type=float, help="seconds allowed per username and scanner")
+    users.add_argument("--checkpoint", help="resume file (default <output>.checkpoint)")
+    users.add_argument("--bypass-cache", action="store_true")
+    users.add_argument("--progress", type=int, default=0,
+                       help="print a summary line every N usernames")
+    users.set_defaults(run=run_usernames)
+
+    doms = sub.add_parser("domains", help="website exposure for a list of domains")
+    doms.add_argument("input", help="file with one domain per line, or - for stdin")
+    doms.add_argument("-o", "--output", help="NDJSON file to append to (default stdout)")
+    doms.add_argument("--workers", type=int, default=16, help="domains analysed at once")
+    doms.add_argument("--budget", type=float, help="seconds allowed per domain")
+    doms.add_argument("--host-rate", type=float, help="max requests/sec to any one host")
+    doms.add_argument("--checkpoint", help="resume file (default <output>.checkpoint)")
+    doms.add_argument("--progress", type=int, default=0,
+                      help="print a summary line every N domains")
+    doms.set_defaults(run=run_domains)
+
+    paths = sub.add_parser("paths", help="wordlist path discovery with soft-404 filtering")
+    paths.add_argument("target", help="domain or base URL")
+    paths.add_argument("--wordlist", help="one path per line (default: bundled common list)")
+    paths.add_argument("-o", "--output", help="NDJSON file to append to (default stdout)")
+    paths.add_argument("--rate", type=_positive(float), help="requests/sec to the target")
+    paths.add_argument("--concurrency", type=_positive(int), help="requests in flight")
+    paths.add_argument("--extensions", nargs="*", default=[],
+                       help="also try every entry with these suffixes, e.g. .php .bak")
+    paths.add_argument("--budget", type=float, help="seconds allowed in total")
+    paths.set_defaults(run=run_paths)
+
+    worker = sub.add_parser("worker", help="claim and run probe tasks from the shared queue")
+    worker.add_argument("--queue", help="queue database (default OSINT_DISTRIBUTED_QUEUE)")
+    worker.add_argument("--concurrency", type=int, default=16, help="tasks claimed per batch")
+    worker.add_argument("--once", action="store_true", help="exit when the queue is empty")
+    worker.set_defaults(run=run_worker)
+
+    mon = sub.add_parser("monitor", help="periodic rescans that report only changes")
+    mon.add_argument("action", choices=("add", "remove", "run", "changes", "stats"))
+    mon.add_argument("kind", nargs="?", choices=("username", "domain"), default="username")
+    mon.add_argument("values", nargs="*", help="subjects, or files with one per line")
+    mon.add_argument("--interval", type=float, default=24 * 3600, help="seconds between rescans")
+    mon.add_argument("--since", type=int, default=0, help="changes after this id")
+    mon.add_argument("--limit", type=int, default=100)
+    mon.add_argument("--db", help="monitor database (default OSINT_MONITOR_PATH)")
+    mon.set_defaults(run=run_monitor)
+
+    args = parser.parse_args(argv)
+
+    from osint import dns_resolver
+    dns_resolver.install_http_resolution()
+
+    return args.run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
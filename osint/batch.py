@@ -0,0 +1,335 @@
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import urlparse
+
+# ================= INPUT / OUTPUT =================
+
+def read_lines(source):
+    """
+    Non-empty, non-comment lines from a file path or "-" (stdin),
+    streamed (never loaded whole).
+    """
+    f = sys.stdin if source == "-" else open(source, "r", encoding="utf-8")
+    try:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield line
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+class NDJSONWriter:
+    """
+    One JSON object per line to a file (appended) or stdout, flushed
+    per batch so an interrupted run loses nothing already reported.
+    """
+
+    def __init__(self, path=None):
+        self._own = path not in (None, "-")
+        self._f = open(path, "a", encoding="utf-8") if self._own else sys.stdout
+
+    def write_many(self, records):
+        for record in records:
+            self._f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._f.flush()
+
+    def close(self):
+        if self._own:
+            self._f.close()
+
+
+def _key_hash(key):
+    # Finished keys are stored as 64-bit hashes, not strings
+    h = int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
+    return h - (1 << 64) if h >= 1 << 63 else h     # SQLite INTEGER is signed
+
+
+class Checkpoint:
+    """
+    Finished keys, written through to a small SQLite file as each one
+    completes. A resumed run skips them; a key is only added after its
+    records were written, so nothing is lost (a crash in between means
+    that key is redone, not dropped). Lookups go to the file's index,
+    so memory stays flat however many keys a sweep finishes.
+    Without a path nothing is recorded.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._db = None
+        self._lock = threading.Lock()
+
+        if not path:
+            return
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        legacy = self._read_legacy(path)
+
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(
+            "PRAGMA journal_mode=WAL;"
+            "PRAGMA synchronous=NORMAL;"
+            "CREATE TABLE IF NOT EXISTS done (key INTEGER PRIMARY KEY);"
+        )
+        if legacy:
+            with self._db:
+                self._db.executemany("INSERT OR IGNORE INTO done VALUES (?)", legacy)
+
+    @staticmethod
+    def _read_legacy(path):
+        # Older checkpoints were plain text, one key per line: carried over
+        if not os.path.exists(path):
+            return []
+        with open(path, "rb") as f:
+            if f.read(16) == b"SQLite format 3\x00":
+                return []
+        with open(path, "r", encoding="utf-8") as f:
+            keys = [(_key_hash(line.rstrip("\n")),) for line in f if line.strip()]
+        os.remove(path)
+        return keys
+
+    def __contains__(self, key):
+        if self._db is None:
+            return False
+        with self._lock:
+            row = self._db.execute("SELECT 1 FROM done WHERE key = ?", (_key_hash(key),)).fetchone()
+        return row is not None
+
+    def mark(self, key):
+        if self._db is None:
+            return
+        with self._lock, self._db:
+            self._db.execute("INSERT OR IGNORE INTO done VALUES (?)", (_key_hash(key),))
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+# ================= SUMMARY =================
+
+class Summary:
+    def __init__(self):
+        self.start = time.monotonic()
+        self.items = 0
+        self.skipped = 0
+        self.failed = 0
+        self.records = 0
+        self.statuses = Counter()
+
+    def add(self, records):
+        self.items += 1
+        self.records += len(records)
+        self.statuses.update(r.get("status", "?") for r in records)
+
+    def as_dict(self):
+        elapsed = time.monotonic() - self.start
+        return {
+            "items": self.items,
+            "skipped_from_checkpoint": self.skipped,
+            "failed": self.failed,
+            "records": self.records,
+            "statuses": dict(self.statuses),
+            "elapsed_sec": round(elapsed, 2),
+            "items_per_sec": round(self.items / elapsed, 2) if elapsed else 0.0,
+            "records_per_sec": round(self.records / elapsed, 1) if elapsed else 0.0,
+        }
+
+    def print(self, label="Batch"):
+        s = self.as_dict()
+        print(
+            f"[{label}] {s['items']} done ({s['skipped_from_checkpoint']} skipped, "
+            f"{s['failed']} failed), {s['records']} records in {s['elapsed_sec']}s "
+            f"— {s['items_per_sec']}/s, {s['records_per_sec']} records/s",
+            file=sys.stderr
+        )
+        if s["statuses"]:
+            counts = ", ".join(f"{k}: {v}" for k, v in sorted(s["statuses"].items()))
+            print(f"[{label}] {counts}", file=sys.stderr)
+
+
+# ================= USERNAME RECORDS =================
+
+SCANNERS = ("scan", "enumerate", "discover", "bulk")
+
+
+def username_records(username, scanners=("enumerate",), budget=None, bypass_cache=False):
+    """
+    Flat (username, platform) records from each chosen scanner.
+    The enumerate long tail is left out: it is never probed.
+    """
+
+    records = []
+
+    def add(scanner, platform, status, **extra):
+        records.append({
+            "username": username,
+            "scanner": scanner,
+            "platform": platform,
+            "status": status,
+            **extra
+        })
+
+    if "scan" in scanners:
+        from osint.username_scan import CHECKS, scan_username
+
+        res = scan_username(username, bypass_cache=bypass_cache, budget=budget)
+        found = res["platforms_found"]
+        for plat in CHECKS:
+            if plat in found:
+                add("scan", plat, "FOUND", **found[plat])
+            elif plat in res["invalid_platforms"]:
+                add("scan", plat, "INVALID FOR PLATFORM")
+            elif plat in res["timed_out_platforms"]:
+                add("scan", plat, "TIMEOUT")
+            elif plat in res["rate_limited_platforms"]:
+                add("scan", plat, "RATE LIMITED")
+            else:
+                add("scan", plat, "INCONCLUSIVE")
+
+    if "enumerate" in scanners:
+        from osint.username_enumerator import iter_tier1
+
+        for plat, info in iter_tier1(username, bypass_cache, budget):
+            add("enumerate", plat, info.status, url=info.url,
+                confidence=info.confidence, visibility=info.visibility)
+
+    if "discover" in scanners:
+        from osint.username_discovery import discover_username
+
+        res = discover_username(username, bypass_cache=bypass_cache, budget=budget)
+        hits = {hit["site"]: hit for hit in res["sites_found"]}
+        for site in res["sites_checked"]:
+            if site in hits:
+                add("discover", site, "FOUND", url=hits[site]["url"],
+                    confidence=hits[site]["confidence"])
+            else:
+                add("discover", site, "NOT FOUND")
+        for site in res["sites_timed_out"]:
+            add("discover", site, "TIMEOUT")
+        for site in res["sites_rate_limited"]:
+            add("discover", site, "RATE LIMITED")
+        for site in res["sites_invalid"]:
+            add("discover", site, "INVALID FOR PLATFORM")
+
+    if "bulk" in scanners:
+        from osint.username_bulk_scan import iter_bulk_username_scan
+
+        kwargs = {"bypass_cache": bypass_cache}
+        if budget is not None:
+            kwargs["budget"] = budget
+        for res in iter_bulk_username_scan(username, **kwargs):
+            res = dict(res)
+            add("bulk", res.pop("platform"), res.pop("status"), **res)
+
+    return records
+
+
+# ================= DOMAIN RECORDS =================
+
+def domain_host(domain):
+    from osint.web_exposure import normalize_url
+
+    host = urlparse(normalize_url(domain)).netloc.lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def domain_record(domain, budget=None):
+    """
+    One NDJSON record: the full website exposure analysis, with the
+    risk level as its status.
+    """
+    from osint.web_exposure import analyze_website_exposure
+
+    res = analyze_website_exposure(domain, budget=budget)
+    return {
+        "domain": domain,
+        "status": res["risk"]["level"],
+        "partial": bool(res["timed_out"]),
+        **res
+    }
+
+
+def iter_domain_sweep(domains, workers=16, budget=None, host_rate=None, skip=None):
+    """
+    Yields (domain, record, error) as each analysis finishes.
+
+    domains is consumed lazily and at most workers analyses (plus a
+    bounded backlog) are held at once, so memory does not grow with
+    the list. Politeness: one analysis per host at a time (domains that
+    share a host, e.g. example.com and www.example.com, are parked and
+    analysed one after the other, not skipped), the host controller's
+    per-host limits inside it, and with host_rate at most that many
+    requests/sec to any host. skip(domain) -> True leaves a domain out
+    (resume).
+    """
+    from osint import http_client
+    from osint.rate_limit import HostRateLimiter
+
+    limiter = HostRateLimiter(rate=host_rate, burst=max(1, int(host_rate))) if host_rate else None
+
+    def run(domain):
+        with http_client.paced(limiter):
+            return domain_record(domain, budget)
+
+    source = iter(domains)
+    exhausted = False
+    waiting = deque()       # host busy: parked until it frees up
+    busy = set()
+    running = {}
+
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="osint-domains")
+
+    def start(domain, host):
+        busy.add(host)
+        running[executor.submit(run, domain)] = (domain, host)
+
+    try:
+        while True:
+            for _ in range(len(waiting)):
+                if len(running) >= workers:
+                    break
+                domain, host = waiting.popleft()
+                if host in busy:
+                    waiting.append((domain, host))
+                else:
+                    start(domain, host)
+
+            while not exhausted and len(running) < workers and len(waiting) < workers * 4:
+                domain = next(source, None)
+                if domain is None:
+                    exhausted = True
+                    break
+                if skip and skip(domain):
+                    continue
+                host = domain_host(domain)
+                if host in busy:
+                    waiting.append((domain, host))
+                else:
+                    start(domain, host)
+
+            if not running:
+                if exhausted and not waiting:
+                    return
+                continue
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                domain, host = running.pop(future)
+                busy.discard(host)
+                try:
+                    yield domain, future.result(), None
+                except Exception as e:
+                    yield domain, None, f"{e.__class__.__name__}: {e}"
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,417 @@
+"""
+Coordinator / worker mode: one task per platform on a shared SQLite
+queue, claimed under a lease by `python -m osint worker` on any node.
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from osint.probe_engine import TIMED_OUT, run_probes
+
+# ================= CONFIG =================
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+# Route scans through the shared queue instead of probing in-process
+ENABLED = os.environ.get("OSINT_DISTRIBUTED", "0") == "1"
+
+QUEUE_PATH = os.environ.get(
+    "OSINT_DISTRIBUTED_QUEUE", str(BASE_DIR / "data" / "probe_queue.db")
+)
+
+LEASE_SECONDS = 30          # a claimed task is reclaimable after this
+MAX_ATTEMPTS = 3            # claims before a task is given up as failed
+POLL_INTERVAL = 0.2         # idle worker / waiting coordinator poll
+JOB_TTL = 3600              # seconds finished jobs are kept
+
+# Seconds a coordinator waits for a scan without a budget
+DEFAULT_WAIT = 60
+
+
+# ================= TASK KINDS =================
+
+def _scan_task(payload):
+    from osint.username_scan import INCONCLUSIVE, RATE_LIMITED, check_platform
+
+    result = check_platform(payload["platform"], payload["username"], payload["bypass_cache"])
+    if result == RATE_LIMITED:
+        return {"outcome": "rate_limited"}
+    if result == INCONCLUSIVE:
+        return {"outcome": "inconclusive"}
+    if result:
+        return {"outcome": "found", "data": result}
+    return {"outcome": "not_found"}
+
+
+# kind -> fn(payload) -> JSON-able result; exceptions mean "retry"
+EXECUTORS = {
+    "scan": _scan_task,
+}
+
+
+# ================= QUEUE =================
+
+class TaskQueue:
+    """
+    Jobs and their per-platform tasks in one SQLite file. Claims run in
+    an IMMEDIATE transaction, so two workers never lease the same task.
+    """
+
+    def __init__(self, path=QUEUE_PATH, lease=LEASE_SECONDS):
+        self.path = path
+        self.lease = lease
+        self._local = threading.local()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        db = self._db()
+        db.executescript(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id TEXT PRIMARY KEY, kind TEXT, created REAL, deadline REAL);"
+            "CREATE TABLE IF NOT EXISTS tasks ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT, job_id TEXT, kind TEXT,"
+            " platform TEXT, payload TEXT, status TEXT DEFAULT 'queued',"
+            " attempts INTEGER DEFAULT 0, worker TEXT, lease_until REAL,"
+            " result TEXT, error TEXT);"
+            "CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status, lease_until);"
+            "CREATE INDEX IF NOT EXISTS tasks_job ON tasks (job_id);"
+        )
+        self.purge()
+
+    def _db(self):
+        # One connection per thread; WAL lets readers run beside a writer
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    # ---------- coordinator side ----------
+
+    def submit(self, kind, tasks, done=(), deadline=None):
+        """
+        New job. tasks: (platform, payload) to probe; done: (platform,
+        result) already answered locally. Returns the job id.
+        """
+        job_id = uuid.uuid4().hex
+        db = self._db()
+
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            db.execute("INSERT INTO jobs VALUES (?, ?, ?, ?)", (job_id, kind, time.time(), deadline))
+            db.executemany(
+                "INSERT INTO tasks (job_id, kind, platform, payload) VALUES (?, ?, ?, ?)",
+                [(job_id, kind, plat, json.dumps(payload)) for plat, payload in tasks]
+            )
+            db.executemany(
+                "INSERT INTO tasks (job_id, kind, platform, payload, status, result) "
+                "VALUES (?, ?, ?, '{}', 'done', ?)",
+                [(job_id, kind, plat, json.dumps(result)) for plat, result in done]
+            )
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+        return job_id
+
+    def tasks(self, job_id):
+        rows = self._db().execute(
+            "SELECT platform, status, result, error FROM tasks WHERE job_id = ?", (job_id,)
+        ).fetchall()
+        return [
+            {
+                "platform": plat,
+                "status": status,
+                "result": json.loads(result) if result else None,
+                "error": error
+            }
+            for plat, status, result, error in rows
+        ]
+
+    def finished(self, job_id):
+        (left,) = self._db().execute(
+            "SELECT COUNT(*) FROM tasks WHERE job_id = ? AND status IN ('queued', 'leased')",
+            (job_id,)
+        ).fetchone()
+        return left == 0
+
+    def cancel(self, job_id):
+        """
+        Drop what is still queued (a coordinator that stopped waiting).
+        """
+        self._db().execute(
+            "UPDATE tasks SET status = 'cancelled' WHERE job_id = ? AND status = 'queued'",
+            (job_id,)
+        )
+
+    # ---------- worker side ----------
+
+    def claim(self, worker, limit=1):
+        """
+        Lease up to limit runnable tasks: queued ones, and leased ones
+        whose worker let the lease run out. Tasks of jobs past their
+        deadline, or out of attempts, are closed instead of handed out.
+        Returns [(task_id, kind, payload)].
+        """
+        now = time.time()
+        db = self._db()
+
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            db.execute(
+                "UPDATE tasks SET status = 'failed', error = 'lease expired ' || attempts || ' times' "
+                "WHERE status = 'leased' AND lease_until < ? AND attempts >= ?",
+                (now, MAX_ATTEMPTS)
+            )
+            db.execute(
+                "UPDATE tasks SET status = 'cancelled' WHERE status IN ('queued', 'leased') "
+                "AND (status = 'queued' OR lease_until < ?) AND job_id IN "
+                "(SELECT id FROM jobs WHERE deadline IS NOT NULL AND deadline < ?)",
+                (now, now)
+            )
+            rows = db.execute(
+                "SELECT id, kind, payload FROM tasks "
+                "WHERE status = 'queued' OR (status = 'leased' AND lease_until < ?) "
+                "ORDER BY id LIMIT ?",
+                (now, limit)
+            ).fetchall()
+            db.executemany(
+                "UPDATE tasks SET status = 'leased', worker = ?, lease_until = ?, "
+                "attempts = attempts + 1 WHERE id = ?",
+                [(worker, now + self.lease, task_id) for task_id, _, _ in rows]
+            )
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+        return [(task_id, kind, json.loads(payload)) for task_id, kind, payload in rows]
+
+    def complete(self, task_id, worker, result):
+        """
+        Store a result. Ignored if the lease was lost to another worker
+        meanwhile (its answer counts instead).
+        """
+        self._db().execute(
+            "UPDATE tasks SET status = 'done', result = ?, lease_until = NULL "
+            "WHERE id = ? AND worker = ? AND status = 'leased'",
+            (json.dumps(result), task_id, worker)
+        )
+
+    def fail(self, task_id, worker, error):
+        """
+        Back on the queue for another attempt, or failed for good.
+        """
+        self._db().execute(
+            "UPDATE tasks SET error = ?, lease_until = NULL, "
+            "status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'queued' END "
+            "WHERE id = ? AND worker = ? AND status = 'leased'",
+            (error, MAX_ATTEMPTS, task_id, worker)
+        )
+
+    def purge(self, older_than=JOB_TTL):
+        cutoff = time.time() - older_than
+        db = self._db()
+        db.execute("DELETE FROM tasks WHERE job_id IN (SELECT id FROM jobs WHERE created < ?)", (cutoff,))
+        db.execute("DELETE FROM jobs WHERE created < ?", (cutoff,))
+
+    def stats(self):
+        rows = self._db().execute("SELECT status, COUNT(*) FROM tasks GROUP BY status").fetchall()
+        (workers,) = self._db().execute(
+            "SELECT COUNT(DISTINCT worker) FROM tasks WHERE status = 'leased' AND lease_until >= ?",
+            (time.time(),)
+        ).fetchone()
+        return {"tasks": dict(rows), "active_workers": workers}
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_queue():
+    global _queue
+
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = TaskQueue()
+    return _queue
+
+
+# ================= WORKER =================
+
+class _TaskError:
+    __slots__ = ("message",)
+
+    def __init__(self, message):
+        self.message = message
+
+
+def _run_task(fn, payload):
+    # The engine turns exceptions into None; keep them to report
+    try:
+        return fn(payload)
+    except Exception as e:
+        return _TaskError(f"{e.__class__.__name__}: {e}")
+
+
+def worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+def run_worker(concurrency=16, once=False, queue=None, name=None, stop=None):
+    """
+    Claim, run and report tasks until stopped (or, with once, until
+    the queue is empty). Each batch runs on this process's probe
+    engine and must finish inside its lease; stragglers are handed
+    back for another worker to retry.
+    """
+    queue = queue or get_queue()
+    name = name or worker_name()
+    done = 0
+
+    print(f"[Worker] {name} polling {queue.path}")
+
+    while not (stop and stop.is_set()):
+        claimed = queue.claim(name, limit=concurrency)
+        if not claimed:
+            if once:
+                break
+            time.sleep(POLL_INTERVAL)
+            continue
+
+        probes = [
+            (task_id, _run_task, (EXECUTORS[kind], payload))
+            for task_id, kind, payload in claimed
+            if kind in EXECUTORS
+        ]
+        for task_id, kind, _ in claimed:
+            if kind not in EXECUTORS:
+                queue.fail(task_id, name, f"unknown task kind {kind!r}")
+
+        # Leave a margin so the report lands before the lease expires
+        deadline = time.monotonic() + queue.lease * 0.8
+        results = run_probes(probes, deadline=deadline)
+
+        for task_id, result in results.items():
+            if result is TIMED_OUT:
+                queue.fail(task_id, name, "timed out in worker")
+            elif isinstance(result, _TaskError):
+                queue.fail(task_id, name, result.message)
+            else:
+                queue.complete(task_id, name, result)
+                done += 1
+
+    return done
+
+
+# ================= COORDINATOR =================
+
+def wait(job_id, timeout=DEFAULT_WAIT, queue=None):
+    """
+    Block until every task of the job is settled or timeout passes.
+    """
+    queue = queue or get_queue()
+    end = time.monotonic() + timeout
+
+    while not queue.finished(job_id):
+        if time.monotonic() >= end:
+            queue.cancel(job_id)
+            return False
+        time.sleep(POLL_INTERVAL)
+    return True
+
+
+def assemble(job_id, queue=None):
+    """
+    The job's tasks as a scan_usernames() result. Anything that did
+    not finish counts as timed out, tasks that failed every attempt as
+    inconclusive.
+    """
+    queue = queue or get_queue()
+
+    platforms_found = {}
+    inconclusive = set()
+    rate_limited = set()
+    timed_out = set()
+    invalid = set()
+
+    for task in queue.tasks(job_id):
+        plat = task["platform"]
+        result = task["result"] or {}
+        outcome = result.get("outcome")
+
+        if task["status"] != "done":
+            inconclusive.add(plat)
+            if task["status"] != "failed":
+                timed_out.add(plat)
+        elif outcome == "found":
+            platforms_found[plat] = result["data"]
+        elif outcome == "rate_limited":
+            rate_limited.add(plat)
+            inconclusive.add(plat)
+        elif outcome == "invalid":
+            invalid.add(plat)
+        else:
+            inconclusive.add(plat)
+
+    return {
+        "platforms_found": platforms_found,
+        "inconclusive_platforms": sorted(inconclusive),
+        "rate_limited_platforms": sorted(rate_limited),
+        "timed_out_platforms": sorted(timed_out),
+        "invalid_platforms": sorted(invalid)
+    }
+
+
+def submit_scan(targets, bypass_cache=False, budget=None, queue=None):
+    """
+    Split a scan (platform -> username) into per-platform tasks.
+    Invalid and known handles are answered here, as in-process.
+    """
+    from osint.known_accounts import is_known
+    from osint.platform_registry import get_registry
+    from osint.username_scan import CHECKS, known_result
+
+    queue = queue or get_queue()
+    sites = get_registry().group("scan")
+
+    tasks = []
+    done = []
+    for plat, uname in targets.items():
+        if not uname or plat not in CHECKS:
+            continue
+        if not sites[plat].accepts(uname):
+            done.append((plat, {"outcome": "invalid"}))
+        elif is_known(plat, uname):
+            done.append((plat, {"outcome": "found", "data": known_result(sites[plat], uname)}))
+        else:
+            tasks.append((plat, {"platform": plat, "username": uname, "bypass_cache": bypass_cache}))
+
+    deadline = time.time() + budget if budget is not None else None
+    return queue.submit("scan", tasks, done=done, deadline=deadline)
+
+
+def scan_usernames(targets, bypass_cache=False, budget=None):
+    """
+    Drop-in for username_scan.scan_usernames() that lets the worker
+    pool do the probing.
+    """
+    queue = get_queue()
+    job_id = submit_scan(targets, bypass_cache, budget, queue)
+    wait(job_id, DEFAULT_WAIT if budget is None else budget, queue)
+    return assemble(job_id, queue)
+
+
+def scan_username(username, bypass_cache=False, budget=None):
+    from osint.username_scan import CHECKS
+
+    return scan_usernames({plat: username for plat in CHECKS}, bypass_cache, budget)
@@ -0,0 +1,303 @@
+"""
+Shared asynchronous DNS resolver with a TTL (and negative) cache.
+"""
+
+import asyncio
+import os
+import socket
+import threading
+import time
+from collections import OrderedDict
+from ipaddress import ip_address
+
+import dns.asyncresolver
+import dns.exception
+import dns.nameserver
+import dns.rdatatype
+import dns.resolver
+
+# ================= CONFIG =================
+
+# "ip" or "ip:port", comma-separated; empty uses /etc/resolv.conf
+NAMESERVERS = os.environ.get("OSINT_DNS_NAMESERVERS", "")
+
+TIMEOUT = float(os.environ.get("OSINT_DNS_TIMEOUT", "3"))
+
+MAX_ENTRIES = 10000         # cached (name, type) answers, LRU beyond this
+MIN_TTL = 5                 # floor so zero-TTL records still coalesce
+MAX_TTL = 3600              # cap, whatever the zone says
+NEGATIVE_TTL = 60           # NXDOMAIN / no data without an SOA to go by
+
+# Answers the HTTP layer connects to (IPv4 first, then IPv6)
+ADDRESS_TYPES = ("A", "AAAA")
+
+# HTTP connections resolve through the cache once an entry point calls
+# install_http_resolution(); OSINT_DNS_HTTP=0 turns that into a no-op
+HTTP_RESOLUTION = os.environ.get("OSINT_DNS_HTTP", "1") == "1"
+
+# HTTP lookups give up on the resolver this quickly, and after a
+# failure go straight to the system resolver for this long
+HTTP_TIMEOUT = 1.0
+HTTP_BYPASS_SECONDS = 30
+
+
+def _parse_nameservers(spec):
+    servers = []
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        host, port = item, 53
+        # "ip:port", but a bare IPv6 address has colons too
+        if item.count(":") == 1 or item.startswith("["):
+            host, _, port = item.rpartition(":")
+            host = host.strip("[]")
+        servers.append(dns.nameserver.Do53Nameserver(host, int(port)))
+    return servers
+
+
+# ================= RESOLVER =================
+
+class DNSResolver:
+    def __init__(self, nameservers=NAMESERVERS, timeout=TIMEOUT):
+        self.timeout = timeout
+
+        if nameservers:
+            self._resolver = dns.asyncresolver.Resolver(configure=False)
+            self._resolver.nameservers = _parse_nameservers(nameservers)
+        else:
+            try:
+                self._resolver = dns.asyncresolver.Resolver()
+            except dns.resolver.NoResolverConfiguration:
+                # No resolv.conf: every lookup comes back empty
+                self._resolver = dns.asyncresolver.Resolver(configure=False)
+                self._resolver.nameservers = []
+        self._resolver.lifetime = timeout
+
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._loop = None
+        self._stats = {"hits": 0, "negative_hits": 0, "misses": 0, "queries": 0, "errors": 0}
+
+    # ---------- loop ----------
+
+    def _get_loop(self):
+        if self._loop is None:
+            with self._lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    threading.Thread(
+                        target=loop.run_forever, name="osint-dns", daemon=True
+                    ).start()
+                    self._loop = loop
+        return self._loop
+
+    # ---------- cache ----------
+
+    def _cached(self, key):
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            expires, records = entry
+            if expires <= time.monotonic():
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            self._stats["negative_hits" if not records else "hits"] += 1
+            return records
+
+    def _store(self, key, records, ttl):
+        ttl = max(MIN_TTL, min(MAX_TTL, ttl))
+        with self._lock:
+            self._cache[key] = (time.monotonic() + ttl, records)
+            self._cache.move_to_end(key)
+            while len(self._cache) > MAX_ENTRIES:
+                self._cache.popitem(last=False)
+
+    @staticmethod
+    def _negative_ttl(response):
+        # RFC 2308: the SOA in the authority section sets it
+        for rrset in getattr(response, "authority", None) or []:
+            if rrset.rdtype == dns.rdatatype.SOA:
+                return min(rrset.ttl, rrset[0].minimum)
+        return NEGATIVE_TTL
+
+    # ---------- queries ----------
+
+    async def _query(self, name, rtype):
+        self._stats["queries"] += 1
+        try:
+            answer = await self._resolver.resolve(name, rtype, raise_on_no_answer=False)
+        except dns.resolver.NXDOMAIN as e:
+            responses = list(e.responses().values())
+            self._store((name, rtype), [], self._negative_ttl(responses[0] if responses else None))
+            return []
+        except (dns.exception.DNSException, OSError):
+            # Timeouts / server failures are not answers: never cached
+            self._stats["errors"] += 1
+            return None
+
+        if answer.rrset is None:
+            self._store((name, rtype), [], self._negative_ttl(answer.response))
+            return []
+
+        records = [str(r) for r in answer.rrset]
+        self._store((name, rtype), records, answer.rrset.ttl)
+        return records
+
+    async def _lookup(self, name, rtype):
+        key = (name, rtype)
+        task = self._pending.get(key)
+        if task is None:
+            task = self._pending[key] = asyncio.ensure_future(self._query(name, rtype))
+            task.add_done_callback(lambda _: self._pending.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _lookup_many(self, name, rtypes, into):
+        # Filled in as each type answers, so a timeout keeps the rest
+        async def one(rtype):
+            into[rtype] = await self._lookup(name, rtype)
+
+        await asyncio.gather(*(one(t) for t in rtypes))
+
+    def resolve_many(self, name, rtypes, timeout=None):
+        """
+        {rtype: [record text]} for every type, all queried in parallel.
+        Cached answers (positive or negative) come back without a
+        query. [] is a real answer (NXDOMAIN / no such records); a type
+        that failed or did not answer in time maps to None.
+        """
+        name = name.rstrip(".").lower()
+        timeout = self.timeout if timeout is None else timeout
+
+        results = {}
+        missing = []
+        for rtype in rtypes:
+            records = self._cached((name, rtype))
+            if records is None:
+                missing.append(rtype)
+            else:
+                results[rtype] = list(records)
+
+        if missing and timeout > 0:
+            with self._lock:
+                self._stats["misses"] += len(missing)
+            answered = {}
+            future = asyncio.run_coroutine_threadsafe(
+                self._lookup_many(name, missing, answered), self._get_loop()
+            )
+            try:
+                future.result(timeout)
+            except Exception:
+                future.cancel()
+            results.update(dict(answered))
+
+        return {rtype: results.get(rtype) for rtype in rtypes}
+
+    def resolve(self, name, rtype, timeout=None):
+        return self.resolve_many(name, [rtype], timeout)[rtype]
+
+    def addresses(self, host, timeout=None):
+        """
+        IPv4 then IPv6 addresses; None if neither lookup came back.
+        """
+        records = self.resolve_many(host, ADDRESS_TYPES, timeout)
+        if all(records[rtype] is None for rtype in ADDRESS_TYPES):
+            return None
+        return [ip for rtype in ADDRESS_TYPES for ip in records[rtype] or []]
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self):
+        with self._lock:
+            return {**self._stats, "cached": len(self._cache)}
+
+
+_resolver = None
+_resolver_lock = threading.Lock()
+
+
+def get_resolver():
+    global _resolver
+
+    if _resolver is None:
+        with _resolver_lock:
+            if _resolver is None:
+                _resolver = DNSResolver()
+    return _resolver
+
+
+def configure(nameservers=None, timeout=None):
+    """
+    Replace the shared resolver (and drop its cache), e.g. to point at
+    a stub DNS server.
+    """
+    global _resolver
+
+    with _resolver_lock:
+        _resolver = DNSResolver(
+            nameservers=NAMESERVERS if nameservers is None else ",".join(nameservers),
+            timeout=TIMEOUT if timeout is None else timeout
+        )
+    return _resolver
+
+
+# ================= HTTP RESOLUTION =================
+
+_installed = False
+_bypass_until = 0.0
+
+
+def install_http_resolution():
+    """
+    Make urllib3 (and so requests / http_client) resolve hostnames
+    through the shared cache. Called by the entry points (app, CLI),
+    never on import. Names it cannot resolve (/etc/hosts entries)
+    fall back to the system resolver, and so does everything for
+    HTTP_BYPASS_SECONDS after the resolver fails or times out.
+    """
+    global _installed
+
+    if _installed or not HTTP_RESOLUTION:
+        return
+
+    from urllib3.util import connection
+
+    original = connection.create_connection
+
+    def create_connection(address, timeout=socket._GLOBAL_DEFAULT_TIMEOUT,
+                          source_address=None, socket_options=None, **kwargs):
+        global _bypass_until
+
+        host, port = address
+        try:
+            ip_address(host.strip("[]"))
+            literal = True
+        except ValueError:
+            literal = False
+
+        ips = []
+        if not literal and host != "localhost" and time.monotonic() >= _bypass_until:
+            wait = timeout if isinstance(timeout, (int, float)) else HTTP_TIMEOUT
+            ips = get_resolver().addresses(host, min(wait, HTTP_TIMEOUT))
+            if ips is None:
+                _bypass_until = time.monotonic() + HTTP_BYPASS_SECONDS
+                ips = []
+
+        if not ips:
+            return original(address, timeout, source_address, socket_options, **kwargs)
+
+        error = None
+        for ip in ips:
+            try:
+                return original((ip, port), timeout, source_address, socket_options, **kwargs)
+            except OSError as e:
+                error = e
+        raise error
+
+    connection.create_connection = create_connection
+    _installed = True
@@ -0,0 +1,170 @@
+import os
+import threading
+import time
+from urllib.parse import urlparse
+
+# ================= CONFIG =================
+
+# Comma-separated egress routes; empty means send directly.
+#   http://127.0.0.1:8081   HTTP(S) proxy
+#   socks5h://host:1080     SOCKS proxy (needs requests[socks])
+#   source:10.0.0.2         bind outgoing connections to a local address
+#   direct                  the default route, alongside others
+EGRESS_ROUTES = os.environ.get("OSINT_EGRESS_ROUTES", "")
+
+# Consecutive route-level failures (dead proxy) that take a route out
+ROUTE_FAILURE_THRESHOLD = 3
+ROUTE_COOLDOWN = 60         # seconds a failed route stays out
+
+# How long a route stays off a host that throttled it without Retry-After
+HOST_COOLDOWN = 30
+
+PROXY_SCHEMES = ("http", "https", "socks4", "socks5", "socks5h")
+
+
+class Route:
+    __slots__ = ("name", "proxy", "source", "in_flight", "sent", "failures", "down_until")
+
+    def __init__(self, spec):
+        spec = spec.strip()
+        self.name = spec
+        self.proxy = None
+        self.source = None
+
+        if spec.startswith("source:"):
+            self.source = spec[len("source:"):]
+            if not self.source:
+                raise ValueError("source: route needs a local address")
+        elif spec != "direct":
+            if urlparse(spec).scheme not in PROXY_SCHEMES or not urlparse(spec).netloc:
+                raise ValueError(f"unsupported egress route: {spec!r}")
+            self.proxy = spec
+
+        self.in_flight = 0
+        self.sent = 0
+        self.failures = 0
+        self.down_until = 0.0
+
+    def __repr__(self):
+        return f"Route({self.name})"
+
+
+class EgressPool:
+    """
+    Spreads outbound requests over several egress routes. Each
+    (host, route) pair is throttled on its own, so a platform that
+    limits one address still gets traffic through the others; a route
+    whose proxy keeps failing is taken out for ROUTE_COOLDOWN.
+    """
+
+    def __init__(self, routes):
+        if not routes:
+            raise ValueError("egress pool needs at least one route")
+        self.routes = list(routes)
+        self._blocked = {}
+        self._lock = threading.Lock()
+
+    def candidates(self, host):
+        """
+        Routes to try for host, best first: not blocked for this host,
+        then fewest in flight, then least used.
+        """
+        now = time.monotonic()
+
+        with self._lock:
+            usable = [r for r in self.routes if r.down_until <= now]
+            # Every route down: try them anyway rather than fail outright
+            usable = usable or list(self.routes)
+            return sorted(usable, key=lambda r: (
+                self._blocked.get((host, r.name), 0.0) > now,
+                r.in_flight,
+                r.sent
+            ))
+
+    def begin(self, route):
+        with self._lock:
+            route.in_flight += 1
+            route.sent += 1
+
+    def end(self, route, host, outcome, retry_after=None):
+        """
+        outcome: "ok", "throttled" (this host limits this route),
+        "route_error" (the route itself failed), or anything else
+        (host-level trouble, not the route's fault).
+        """
+        now = time.monotonic()
+
+        with self._lock:
+            route.in_flight -= 1
+
+            if outcome == "ok":
+                route.failures = 0
+
+            elif outcome == "throttled":
+                self._blocked[(host, route.name)] = now + (retry_after or HOST_COOLDOWN)
+                if len(self._blocked) > 4096:
+                    self._blocked = {k: v for k, v in self._blocked.items() if v > now}
+
+            elif outcome == "route_error":
+                route.failures += 1
+                if route.failures >= ROUTE_FAILURE_THRESHOLD:
+                    route.failures = 0
+                    route.down_until = now + ROUTE_COOLDOWN
+                    print(f"[Egress] Route {route.name} failing, out for {ROUTE_COOLDOWN}s")
+
+    def stats(self):
+        now = time.monotonic()
+        with self._lock:
+            return {
+                r.name: {
+                    "in_flight": r.in_flight,
+                    "sent": r.sent,
+                    "up": r.down_until <= now,
+                    "blocked_hosts": sum(
+                        1 for (_, name), until in self._blocked.items()
+                        if name == r.name and until > now
+                    )
+                }
+                for r in self.routes
+            }
+
+
+def parse_routes(spec):
+    if isinstance(spec, str):
+        spec = spec.split(",")
+    return [Route(s) for s in spec if s and s.strip()]
+
+
+_pool = None
+_pool_lock = threading.Lock()
+_configured = False
+
+
+def get_pool():
+    """
+    The shared pool, or None when no routes are configured (requests
+    then go out directly, as before).
+    """
+    global _pool, _configured
+
+    if not _configured:
+        with _pool_lock:
+            if not _configured:
+                routes = parse_routes(EGRESS_ROUTES)
+                _pool = EgressPool(routes) if routes else None
+                _configured = True
+    return _pool
+
+
+def configure(routes):
+    """
+    Replace the routes at runtime (list of specs or comma-separated
+    string; empty to go back to direct).
+    """
+    global _pool, _configured
+
+    routes = parse_routes(routes or [])
+    with _pool_lock:
+        _pool = EgressPool(routes) if routes else None
+        _configured = True
+    return _pool
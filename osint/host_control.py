@@ -0,0 +1,185 @@
+import os
+import threading
+import time
+from collections import deque
+
+# ================= CONFIG =================
+
+INITIAL_CONCURRENCY = 4
+MIN_CONCURRENCY = 1
+MAX_CONCURRENCY = int(os.environ.get("OSINT_HOST_MAX_CONCURRENCY", "16"))
+
+# Latency this many times the host's usual latency counts as congestion
+LATENCY_FACTOR = 3.0
+
+# Consecutive failures that open the circuit for a host
+FAILURE_THRESHOLD = 5
+COOLDOWN = 30               # seconds the circuit stays open at first
+MAX_COOLDOWN = 600          # cooldown doubles up to this on repeat trips
+MAX_RETRY_AFTER = 300       # longest Retry-After we honor
+
+# Recent successful latencies kept per host for percentile queries
+LATENCY_WINDOW = 64
+
+
+class RateLimited(Exception):
+    """
+    Raised instead of sending a request to a host that is throttling us
+    (open circuit, Retry-After window, or no free slot in time).
+    """
+
+    def __init__(self, host, reason, retry_in=0.0):
+        super().__init__(f"{host}: rate limited ({reason})")
+        self.host = host
+        self.reason = reason
+        self.retry_in = retry_in
+
+
+class _Host:
+    __slots__ = (
+        "limit", "in_flight", "blocked_until", "failures",
+        "state", "open_until", "cooldown", "latency", "samples"
+    )
+
+    def __init__(self):
+        self.limit = float(INITIAL_CONCURRENCY)
+        self.in_flight = 0
+        self.blocked_until = 0.0
+        self.failures = 0
+        self.state = "closed"
+        self.open_until = 0.0
+        self.cooldown = COOLDOWN
+        self.latency = None
+        self.samples = deque(maxlen=LATENCY_WINDOW)
+
+
+class HostController:
+    """
+    Per-host AIMD concurrency limit + Retry-After handling + circuit breaker.
+    Success grows a host's limit additively, throttling/errors halve it.
+    """
+
+    def __init__(self):
+        self._hosts = {}
+        self._cond = threading.Condition()
+
+    def acquire(self, host, max_wait):
+        deadline = time.monotonic() + max_wait
+
+        with self._cond:
+            st = self._hosts.get(host)
+            if st is None:
+                st = self._hosts[host] = _Host()
+
+            while True:
+                now = time.monotonic()
+
+                if st.state == "open":
+                    if now < st.open_until:
+                        raise RateLimited(host, "circuit open", st.open_until - now)
+                    st.state = "half-open"
+
+                if st.blocked_until > now:
+                    if st.blocked_until > deadline:
+                        raise RateLimited(host, "retry-after", st.blocked_until - now)
+                    self._cond.wait(st.blocked_until - now)
+                    continue
+
+                # Half-open: a single trial request decides the circuit
+                allowed = 1 if st.state == "half-open" else max(MIN_CONCURRENCY, int(st.limit))
+                if st.in_flight < allowed:
+                    st.in_flight += 1
+                    return
+
+                if now >= deadline:
+                    raise RateLimited(host, "host saturated")
+                self._cond.wait(deadline - now)
+
+    def release(self, host, outcome, latency=None, retry_after=None):
+        """
+        outcome: "ok", "throttled" (429/503/login wall), "error", or
+        "aborted" (slot freed, no signal either way).
+        """
+        with self._cond:
+            st = self._hosts[host]
+            st.in_flight -= 1
+            now = time.monotonic()
+
+            if outcome == "aborted":
+                pass
+
+            elif outcome == "ok":
+                st.failures = 0
+                if st.state == "half-open":
+                    st.state = "closed"
+                    st.cooldown = COOLDOWN
+
+                if latency is not None and st.latency and latency > LATENCY_FACTOR * st.latency:
+                    st.limit = max(MIN_CONCURRENCY, st.limit * 0.75)
+                else:
+                    st.limit = min(MAX_CONCURRENCY, st.limit + 1.0 / st.limit)
+
+                if latency is not None:
+                    st.latency = latency if st.latency is None else 0.8 * st.latency + 0.2 * latency
+                    st.samples.append(latency)
+
+            else:
+                st.failures += 1
+                st.limit = max(MIN_CONCURRENCY, st.limit / 2)
+
+                if retry_after:
+                    st.blocked_until = max(
+                        st.blocked_until, now + min(retry_after, MAX_RETRY_AFTER)
+                    )
+
+                if st.state == "half-open" or st.failures >= FAILURE_THRESHOLD:
+                    st.state = "open"
+                    st.open_until = now + st.cooldown
+                    st.cooldown = min(st.cooldown * 2, MAX_COOLDOWN)
+
+            self._cond.notify_all()
+
+    def observe(self, host, latency):
+        """
+        Record a latency sample for host without touching its limits
+        (requests accounted under a per-route key).
+        """
+        with self._cond:
+            st = self._hosts.get(host)
+            if st is None:
+                st = self._hosts[host] = _Host()
+            st.samples.append(latency)
+
+    def latency_percentile(self, host, pct, min_samples=1):
+        """
+        pct-th percentile of the host's recent successful latencies,
+        or None until min_samples have been seen.
+        """
+        with self._cond:
+            st = self._hosts.get(host)
+            if st is None or len(st.samples) < max(1, min_samples):
+                return None
+            ordered = sorted(st.samples)
+
+        k = min(len(ordered) - 1, int(pct / 100 * len(ordered)))
+        return ordered[k]
+
+    def stats(self):
+        with self._cond:
+            return {
+                host: {
+                    "limit": round(st.limit, 2),
+                    "in_flight": st.in_flight,
+                    "state": st.state,
+                    "failures": st.failures,
+                    "latency_ms": round(st.latency * 1000) if st.latency else None
+                }
+                for host, st in self._hosts.items()
+            }
+
+
+_controller = HostController()
+
+
+def get_controller():
+    return _controller
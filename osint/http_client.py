@@ -0,0 +1,575 @@
+import codecs
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from osint import egress
+from osint.host_control import RateLimited, get_controller
+from osint.probe_engine import is_background
+
+# ================= CONFIG =================
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (compatible; Chakravyuh-OSINT/1.0)"
+}
+
+# Number of per-host connection pools kept alive
+POOL_CONNECTIONS = int(os.environ.get("OSINT_HTTP_POOL_CONNECTIONS", "100"))
+
+# Keep-alive connections kept per host
+POOL_MAXSIZE = int(os.environ.get("OSINT_HTTP_POOL_MAXSIZE", "32"))
+
+CONNECT_TIMEOUT = float(os.environ.get("OSINT_HTTP_CONNECT_TIMEOUT", "3"))
+TIMEOUT = float(os.environ.get("OSINT_HTTP_TIMEOUT", "5"))
+
+# Upper bound on decompressed body bytes read per streamed response
+MAX_BODY_BYTES = int(os.environ.get("OSINT_HTTP_MAX_BODY_BYTES", str(2 * 1024 * 1024)))
+
+CHUNK_SIZE = 16 * 1024
+
+# Unread body left up to this size is drained so the connection goes
+# back to the pool; anything bigger is cut off with its connection
+# rather than downloaded. Callers can pass their own limit to release()
+DRAIN_LIMIT = int(os.environ.get("OSINT_HTTP_DRAIN_LIMIT", str(8 * 1024)))
+
+# Responses that mean "slow down" rather than "not found"
+THROTTLE_STATUSES = (429, 503)
+
+# Being bounced to one of these means the platform walled us off
+# (checked only for requests made with login_wall=True)
+LOGIN_WALL_PATHS = ("/accounts/login", "/login", "/checkpoint")
+
+# Hedged requests: a host that has not answered within its recent
+# HEDGE_PERCENTILE latency gets a second, identical request and the
+# first response wins. Off unless enabled.
+HEDGE = os.environ.get("OSINT_HTTP_HEDGE", "0") == "1"
+HEDGE_PERCENTILE = 95
+HEDGE_MIN_SAMPLES = 20      # no hedging until a host has this much history
+HEDGE_MAX_RATIO = 0.05      # hedges allowed per request sent (extra load cap)
+HEDGE_WORKERS = 64
+
+# Global outbound budget: requests in flight across the whole process.
+# Background work (monitoring) only gets BACKGROUND_SHARE of it and
+# always yields to waiting interactive requests, so it cannot starve
+# interactive scans.
+OUTBOUND_BUDGET = int(os.environ.get("OSINT_OUTBOUND_BUDGET", "256"))
+BACKGROUND_SHARE = float(os.environ.get("OSINT_BACKGROUND_SHARE", "0.25"))
+
+_session = None
+_session_lock = threading.Lock()
+
+# Egress route name -> its own pooled session (see osint.egress)
+_route_sessions = {}
+
+# Response hooks installed on every session, present and future
+_response_hooks = []
+
+# Optional url -> url hook applied at send time (benchmarks / stubs);
+# host accounting still uses the original URL
+_rewrite = None
+
+_hedge_executor = None
+_hedge_lock = threading.Lock()
+_hedge_stats = {"requests": 0, "hedged": 0, "hedge_wins": 0}
+
+
+# ================= OUTBOUND BUDGET =================
+
+class OutboundBudget:
+    def __init__(self, limit, background_share):
+        self.limit = limit
+        self.background_limit = max(1, int(limit * background_share))
+        self.in_flight = 0
+        self.background_in_flight = 0
+        self.waiting = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, host, background, max_wait):
+        deadline = time.monotonic() + max_wait
+
+        with self._cond:
+            if not background:
+                self.waiting += 1
+            try:
+                while True:
+                    if background:
+                        free = (
+                            not self.waiting
+                            and self.in_flight < self.background_limit
+                        )
+                    else:
+                        free = self.in_flight < self.limit
+                    if free:
+                        break
+
+                    left = deadline - time.monotonic()
+                    if left <= 0:
+                        raise RateLimited(host, "outbound budget exhausted")
+                    self._cond.wait(left)
+            finally:
+                if not background:
+                    self.waiting -= 1
+
+            self.in_flight += 1
+            self.background_in_flight += background
+
+    def release(self, background):
+        with self._cond:
+            self.in_flight -= 1
+            self.background_in_flight -= background
+            self._cond.notify_all()
+
+    def stats(self):
+        with self._cond:
+            return {
+                "limit": self.limit,
+                "background_limit": self.background_limit,
+                "in_flight": self.in_flight,
+                "background_in_flight": self.background_in_flight,
+                "interactive_waiting": self.waiting,
+            }
+
+
+_budget = OutboundBudget(OUTBOUND_BUDGET, BACKGROUND_SHARE)
+
+
+def outbound_stats():
+    return _budget.stats()
+
+
+# Optional per-host request pacing for the current context (bulk
+# sweeps); carried into probe threads like the background flag
+_pacing = contextvars.ContextVar("osint_pacing", default=None)
+
+
+@contextmanager
+def paced(limiter):
+    """
+    Requests made inside go through limiter.acquire(host, deadline)
+    (a rate_limit.HostRateLimiter) before anything else.
+    """
+    token = _pacing.set(limiter)
+    try:
+        yield
+    finally:
+        _pacing.reset(token)
+
+
+# ================= SESSION =================
+
+class _SourceAddressAdapter(HTTPAdapter):
+    """
+    HTTPAdapter whose connections originate from one local address.
+    """
+
+    def __init__(self, source, **kwargs):
+        self._source = (source, 0)
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["source_address"] = self._source
+        super().init_poolmanager(*args, **kwargs)
+
+
+def _build_session(route=None):
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    session.hooks["response"].extend(_response_hooks)
+
+    # Connections (and their TLS sessions) are kept alive and reused
+    # per host instead of being set up again for every probe.
+    pool = {
+        "pool_connections": POOL_CONNECTIONS,
+        "pool_maxsize": POOL_MAXSIZE,
+        "pool_block": False
+    }
+    if route is not None and route.source:
+        adapter = _SourceAddressAdapter(route.source, **pool)
+    else:
+        adapter = HTTPAdapter(**pool)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    if route is not None and route.proxy:
+        # Environment proxy settings must not override the route
+        session.trust_env = False
+        session.proxies = {"http": route.proxy, "https": route.proxy}
+
+    return session
+
+
+def get_session():
+    """
+    Process-wide pooled session shared by every fetcher.
+    """
+    global _session
+
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def _route_session(route):
+    session = _route_sessions.get(route.name)
+    if session is None:
+        with _session_lock:
+            session = _route_sessions.get(route.name)
+            if session is None:
+                session = _route_sessions[route.name] = _build_session(route)
+    return session
+
+
+def add_response_hook(fn):
+    """
+    Call fn(response, ...) for every response on every session,
+    including route sessions created later (benchmark latency probes).
+    """
+    with _session_lock:
+        _response_hooks.append(fn)
+        sessions = [_session, *_route_sessions.values()]
+    for session in sessions:
+        if session is not None:
+            session.hooks["response"].append(fn)
+
+
+def configure(pool_connections=None, pool_maxsize=None,
+              timeout=None, connect_timeout=None):
+    """
+    Override pool sizes / timeouts at runtime.
+    The shared sessions are rebuilt on next use.
+    """
+    global POOL_CONNECTIONS, POOL_MAXSIZE, TIMEOUT, CONNECT_TIMEOUT, _session, _route_sessions
+
+    with _session_lock:
+        if pool_connections is not None:
+            POOL_CONNECTIONS = pool_connections
+        if pool_maxsize is not None:
+            POOL_MAXSIZE = pool_maxsize
+        if timeout is not None:
+            TIMEOUT = timeout
+        if connect_timeout is not None:
+            CONNECT_TIMEOUT = connect_timeout
+
+        old = [_session, *_route_sessions.values()]
+        _session, _route_sessions = None, {}
+
+    for session in old:
+        if session is not None:
+            session.close()
+
+
+def set_rewriter(fn):
+    """
+    Route every outbound URL through fn (None to disable).
+    Used to point the scanners at a local stub server.
+    """
+    global _rewrite
+    _rewrite = fn
+
+
+# ================= REQUESTS =================
+
+def _retry_after(response):
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _login_walled(url, response):
+    final = urlparse(response.url).path.lower()
+    return (
+        any(final.startswith(p) for p in LOGIN_WALL_PATHS)
+        and not any(urlparse(url).path.lower().startswith(p) for p in LOGIN_WALL_PATHS)
+    )
+
+
+def _acquire(controller, host, max_wait):
+    """
+    Pick the egress route and take a controller slot for it.
+    Direct: the slot is per host. With egress routes each (host, route)
+    pair is its own controller entry, so one route being throttled
+    moves traffic to the others; only when every route refuses does
+    RateLimited reach the caller.
+    """
+    pool = egress.get_pool()
+    if pool is None:
+        controller.acquire(host, max_wait=max_wait)
+        return None, None, host
+
+    routes = pool.candidates(host)
+    for i, route in enumerate(routes):
+        key = f"{host}@{route.name}"
+        try:
+            # Only the last candidate is worth waiting for
+            controller.acquire(key, max_wait=max_wait if i == len(routes) - 1 else 0)
+        except RateLimited:
+            if i == len(routes) - 1:
+                raise
+            continue
+        pool.begin(route)
+        return pool, route, key
+
+
+def request(method, url, headers=None, timeout=None, login_wall=False, **kwargs):
+    """
+    Every outbound request goes through the per-host controller:
+    hosts that throttle us (429/503, Retry-After) get less concurrency
+    and eventually an open circuit, and requests to them fail fast with
+    RateLimited instead of timing out.
+    login_wall: also treat a redirect to a login page as throttling.
+    Only for profile probes, where it means the platform walled us off;
+    plenty of sites send /admin or / to /login as a matter of course.
+    Requests also share the process-wide outbound budget, with
+    background work capped to its share.
+    With egress routes configured the request also goes out over the
+    best route for the host (see osint.egress).
+    """
+
+    read_timeout = TIMEOUT if timeout is None else timeout
+    host = urlparse(url).netloc.lower()
+    controller = get_controller()
+    background = is_background()
+
+    # Paced before taking a budget slot, so waiting holds nothing
+    limiter = _pacing.get()
+    if limiter is not None and not limiter.acquire(host, deadline=time.monotonic() + read_timeout):
+        raise RateLimited(host, "pacing")
+
+    _budget.acquire(host, background, read_timeout)
+    try:
+        pool, route, key = _acquire(controller, host, read_timeout)
+    except BaseException:
+        _budget.release(background)
+        raise
+    session = get_session() if route is None else _route_session(route)
+
+    def finish(outcome, latency=None, retry_after=None, route_outcome=None):
+        _budget.release(background)
+        controller.release(key, outcome, latency=latency, retry_after=retry_after)
+        if route is not None:
+            pool.end(route, host, route_outcome or outcome, retry_after)
+            if latency is not None:
+                # Hedging looks at the host as a whole
+                controller.observe(host, latency)
+
+    start = time.monotonic()
+
+    try:
+        r = session.request(
+            method,
+            _rewrite(url) if _rewrite else url,
+            headers=headers,
+            timeout=(min(CONNECT_TIMEOUT, read_timeout), read_timeout),
+            **kwargs
+        )
+    except requests.exceptions.ProxyError:
+        finish("error", route_outcome="route_error")
+        raise
+    except requests.RequestException:
+        finish("error")
+        raise
+    except BaseException:
+        finish("aborted")
+        raise
+
+    walled = login_wall and _login_walled(url, r)
+    if r.status_code in THROTTLE_STATUSES or walled:
+        retry_after = _retry_after(r)
+        finish("throttled", retry_after=retry_after)
+        r.close()
+        raise RateLimited(
+            host,
+            "login wall" if r.status_code not in THROTTLE_STATUSES else f"HTTP {r.status_code}",
+            retry_after or 0.0
+        )
+
+    finish("ok", latency=time.monotonic() - start)
+    return r
+
+
+# ================= HEDGING =================
+
+def _get_hedge_executor():
+    global _hedge_executor
+
+    if _hedge_executor is None:
+        with _hedge_lock:
+            if _hedge_executor is None:
+                _hedge_executor = ThreadPoolExecutor(
+                    max_workers=HEDGE_WORKERS,
+                    thread_name_prefix="osint-hedge"
+                )
+    return _hedge_executor
+
+
+def _hedge_allowed():
+    with _hedge_lock:
+        if _hedge_stats["hedged"] + 1 > HEDGE_MAX_RATIO * _hedge_stats["requests"]:
+            return False
+        _hedge_stats["hedged"] += 1
+        return True
+
+
+def _discard(future):
+    # The losing copy: free its connection once it lands
+    try:
+        future.result().close()
+    except Exception:
+        pass
+
+
+def hedged_request(method, url, **kwargs):
+    """
+    request() with a speculative second copy for the slow tail.
+    The hedge is only sent once the first attempt has outlived the
+    host's HEDGE_PERCENTILE latency, so most requests go out once.
+    """
+
+    with _hedge_lock:
+        _hedge_stats["requests"] += 1
+
+    delay = get_controller().latency_percentile(
+        urlparse(url).netloc.lower(), HEDGE_PERCENTILE, HEDGE_MIN_SAMPLES
+    )
+    if delay is None:
+        return request(method, url, **kwargs)
+
+    executor = _get_hedge_executor()
+    # Copies run in the caller's context so they keep its priority
+    first = executor.submit(contextvars.copy_context().run, request, method, url, **kwargs)
+
+    done, _ = wait([first], timeout=delay)
+    if done or not _hedge_allowed():
+        return first.result()
+
+    second = executor.submit(contextvars.copy_context().run, request, method, url, **kwargs)
+    pending = {first, second}
+
+    while True:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        ok = [f for f in done if f.exception() is None]
+
+        # A failed copy only counts if the other one failed too
+        if ok or not pending:
+            winner = ok[0] if ok else done.pop()
+            for other in list(pending) + ok[1:]:
+                other.add_done_callback(_discard)
+            if winner is second:
+                with _hedge_lock:
+                    _hedge_stats["hedge_wins"] += 1
+            return winner.result()
+
+
+def hedge_stats():
+    with _hedge_lock:
+        return dict(_hedge_stats)
+
+
+def get(url, headers=None, timeout=None, hedge=None, **kwargs):
+    """
+    hedge: send a speculative second copy to slow hosts
+    (defaults to the HEDGE setting).
+    """
+    if HEDGE if hedge is None else hedge:
+        return hedged_request("GET", url, headers=headers, timeout=timeout, **kwargs)
+    return request("GET", url, headers=headers, timeout=timeout, **kwargs)
+
+
+def stream(url, headers=None, timeout=None, hedge=None, **kwargs):
+    """
+    GET without reading the body; pair with iter_text() / release().
+    """
+    return get(url, headers=headers, timeout=timeout, hedge=hedge, stream=True, **kwargs)
+
+
+# ================= BODY READING =================
+
+def iter_text(response, max_bytes=None):
+    """
+    Yield (lowercased text chunk, bytes read so far) from a streamed
+    response. Decompression and decoding happen chunk by chunk and
+    reading stops at max_bytes, so memory per probe stays bounded.
+    """
+
+    limit = MAX_BODY_BYTES if max_bytes is None else max_bytes
+
+    try:
+        decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+    except LookupError:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    total = 0
+
+    for raw in response.iter_content(chunk_size=CHUNK_SIZE):
+        if not raw:
+            continue
+
+        raw = raw[:limit - total]
+        total += len(raw)
+
+        yield decoder.decode(raw).lower(), total
+
+        if total >= limit:
+            return
+
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail.lower(), total
+
+
+def read_prefix(response, max_bytes):
+    """
+    At most max_bytes of a streamed body, then close it: whatever the
+    file's size, only this much is ever read or held.
+    """
+    data = bytearray()
+
+    try:
+        for chunk in response.iter_content(chunk_size=min(CHUNK_SIZE, max_bytes)):
+            data += chunk[:max_bytes - len(data)]
+            if len(data) >= max_bytes:
+                break
+    finally:
+        response.close()
+
+    return bytes(data)
+
+
+def release(response, drain_limit=None):
+    """
+    Done with a streamed response, read in part or not at all: the rest
+    of the body is drained (up to drain_limit bytes, default DRAIN_LIMIT)
+    so the connection goes back to the pool. Only a body with more left
+    than that, or a declared length over it, costs the connection.
+    """
+    drain_limit = DRAIN_LIMIT if drain_limit is None else drain_limit
+    try:
+        length = response.headers.get("Content-Length", "")
+        if not (length.isdigit() and int(length) > drain_limit):
+            drained = 0
+            while drained <= drain_limit:
+                chunk = response.raw.read(min(CHUNK_SIZE, drain_limit - drained + 1), decode_content=False)
+                if not chunk:
+                    break
+                drained += len(chunk)
+    except Exception:
+        pass
+    finally:
+        response.close()
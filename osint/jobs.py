@@ -0,0 +1,171 @@
+import os
+import queue
+import threading
+import time
+import uuid
+
+# ================= CONFIG =================
+
+# Worker threads running heavy scans off the request path
+WORKERS = int(os.environ.get("OSINT_JOB_WORKERS", "4"))
+
+# Jobs waiting beyond this are refused instead of piling up
+MAX_QUEUED = int(os.environ.get("OSINT_JOB_QUEUE", "64"))
+
+# Seconds a finished job's result stays fetchable
+RESULT_TTL = 1800
+
+
+class QueueFull(Exception):
+    pass
+
+
+# ================= RECORDS =================
+
+class Job:
+    __slots__ = (
+        "id", "kind", "status", "result", "error",
+        "created", "started", "finished"
+    )
+
+    def __init__(self, kind):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = "queued"
+        self.result = None
+        self.error = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+
+    @property
+    def done(self):
+        return self.status in ("done", "failed")
+
+    def as_dict(self):
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "error": self.error,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+        }
+
+
+# ================= QUEUE =================
+
+class JobQueue:
+    """
+    Bounded in-process job queue drained by a fixed set of worker
+    threads. Web workers submit and return a job id at once; results
+    are picked up later by id.
+    """
+
+    def __init__(self, workers=WORKERS, max_queued=MAX_QUEUED):
+        self.workers = workers
+        self.max_queued = max_queued
+        self._queue = queue.Queue(maxsize=max_queued)
+        self._jobs = {}
+        self._running = 0
+        self._lock = threading.Lock()
+        self._threads = []
+
+    def _start(self):
+        # Lazily, so importing the module spawns nothing
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                t = threading.Thread(
+                    target=self._work, name=f"osint-job-{i}", daemon=True
+                )
+                t.start()
+                self._threads.append(t)
+
+    def submit(self, kind, fn, *args):
+        self._start()
+        self._expire()
+
+        job = Job(kind)
+        with self._lock:
+            self._jobs[job.id] = job
+
+        try:
+            self._queue.put_nowait((job, fn, args))
+        except queue.Full:
+            with self._lock:
+                del self._jobs[job.id]
+            raise QueueFull(f"{self.max_queued} jobs already waiting")
+
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def position(self, job):
+        """
+        1-based place among queued jobs (0 once it has started).
+        """
+        if job.status != "queued":
+            return 0
+        with self._queue.mutex:
+            for i, (queued, _, _) in enumerate(self._queue.queue, 1):
+                if queued is job:
+                    return i
+        return 0
+
+    def _work(self):
+        while True:
+            job, fn, args = self._queue.get()
+
+            with self._lock:
+                self._running += 1
+            job.status = "running"
+            job.started = time.time()
+
+            try:
+                job.result = fn(*args)
+                job.status = "done"
+            except Exception as e:
+                print(f"[Jobs] {job.kind} job {job.id} failed:", e)
+                job.error = str(e) or e.__class__.__name__
+                job.status = "failed"
+            finally:
+                job.finished = time.time()
+                with self._lock:
+                    self._running -= 1
+                self._queue.task_done()
+
+    def _expire(self):
+        cutoff = time.time() - RESULT_TTL
+        with self._lock:
+            stale = [
+                job_id for job_id, job in self._jobs.items()
+                if job.done and job.finished < cutoff
+            ]
+            for job_id in stale:
+                del self._jobs[job_id]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queued": self._queue.qsize(),
+                "capacity": self.max_queued,
+                "running": self._running,
+                "jobs": len(self._jobs),
+            }
+
+
+_queue = JobQueue()
+
+
+def get_queue():
+    return _queue
+
+
+def submit(kind, fn, *args):
+    return _queue.submit(kind, fn, *args)
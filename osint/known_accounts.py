@@ -0,0 +1,324 @@
+"""
+Offline, memory-mapped index of handles known to exist, per platform.
+A hit means "known to exist"; a miss means nothing.
+"""
+
+import argparse
+import gzip
+import hashlib
+import heapq
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import threading
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# ================= CONFIG =================
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+INDEX_DIR = Path(os.environ.get(
+    "OSINT_KNOWN_ACCOUNTS_DIR", str(BASE_DIR / "data" / "known_accounts")
+))
+
+MAGIC = b"OSKNOWN1"
+
+# magic, byte order (0 little / 1 big), entries, bloom bits, bloom hashes;
+# followed by the Bloom filter, then the sorted 64-bit handle hashes
+_HEADER = struct.Struct("<8sQQQQ")
+
+# Bloom filter sizing: ~1% false positives
+BLOOM_BITS_PER_ENTRY = 10
+BLOOM_HASHES = 7
+
+# Handles hashed and sorted in memory per run while building
+SORT_CHUNK = 4_000_000
+
+# Confidence every scanner reports for an index hit: the handle is
+# known to exist, but nothing was checked live
+CONFIDENCE = "MEDIUM"
+
+
+class IndexFormatError(ValueError):
+    pass
+
+
+# ================= HASHING =================
+
+def normalize(handle):
+    return handle.strip().lstrip("@").lower()
+
+
+def handle_hash(handle):
+    """
+    64-bit key for a (normalized) handle. Distinct handles collide with
+    probability ~n / 2**64 per lookup — negligible for this use.
+    """
+    return int.from_bytes(
+        hashlib.blake2b(normalize(handle).encode("utf-8"), digest_size=8).digest(),
+        "little"
+    )
+
+
+def _bloom_positions(h, bits, hashes):
+    # Double hashing from the two halves of the key hash
+    h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+    return [(h1 + i * h2) % bits for i in range(hashes)]
+
+
+# ================= LOOKUP =================
+
+class KnownAccounts:
+    """
+    One platform's memory-mapped index.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.mtime = os.stat(self.path).st_mtime_ns
+
+        with open(self.path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, order, count, bits, hashes = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise IndexFormatError(f"{self.path}: not a known-accounts index")
+        if order != (sys.byteorder == "big"):
+            raise IndexFormatError(f"{self.path}: built on a machine with different byte order")
+
+        bloom_bytes = _bloom_bytes(bits)
+        table = _HEADER.size + bloom_bytes
+
+        self.count = count
+        self._bits = bits
+        self._hashes = hashes
+        self._bloom = memoryview(self._map)[_HEADER.size:table]
+        self._table = memoryview(self._map)[table:table + 8 * count].cast("Q")
+
+    def __contains__(self, handle):
+        h = handle_hash(handle)
+
+        bloom = self._bloom
+        for pos in _bloom_positions(h, self._bits, self._hashes):
+            if not bloom[pos >> 3] & (1 << (pos & 7)):
+                return False
+
+        i = bisect_left(self._table, h)
+        return i < self.count and self._table[i] == h
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        self._bloom.release()
+        self._table.release()
+        self._map.close()
+
+
+class KnownAccountsIndex:
+    """
+    All platform indexes under INDEX_DIR, opened on first use and
+    reopened when a file is rebuilt.
+    """
+
+    def __init__(self, directory=INDEX_DIR):
+        self.directory = Path(directory)
+        self._open = {}
+        self._lock = threading.Lock()
+
+    def _get(self, platform):
+        path = self.directory / f"{platform}.idx"
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+        with self._lock:
+            index = self._open.get(platform)
+            if index is None or index.mtime != mtime:
+                stale = index
+                try:
+                    index = self._open[platform] = KnownAccounts(path)
+                except (OSError, ValueError) as e:
+                    print(f"[KnownAccounts] Skipping {path}:", e)
+                    return None
+                if stale is not None:
+                    stale.close()
+            return index
+
+    def lookup(self, platform, handle):
+        """
+        True if the handle is listed for the platform, None if it is not
+        (or there is no index) — absence is not evidence.
+        """
+        index = self._get(platform)
+        try:
+            found = index is not None and handle in index
+        except ValueError:
+            # Closed under us by a reload; the new one is in place now
+            index = self._get(platform)
+            found = index is not None and handle in index
+        return True if found else None
+
+    def platforms(self):
+        if not self.directory.is_dir():
+            return []
+        return sorted(p.stem for p in self.directory.glob("*.idx"))
+
+
+_index = KnownAccountsIndex()
+
+
+def get_index():
+    return _index
+
+
+def is_known(platform, handle):
+    return _index.lookup(platform, handle) is True
+
+
+# ================= BUILD =================
+
+def _bloom_bytes(bits):
+    # Padded to 8 bytes so the table stays aligned
+    return ((bits + 63) // 64) * 8
+
+
+def _read_handles(paths):
+    for path in paths:
+        opener = gzip.open if str(path).endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                handle = normalize(line)
+                if handle and not handle.startswith("#"):
+                    yield handle
+
+
+def _sorted_run(hashes, directory):
+    if np is not None:
+        ordered = np.unique(np.frombuffer(hashes, dtype=np.uint64))
+        data = ordered.tobytes()
+    else:
+        data = array("Q", sorted(set(hashes))).tobytes()
+
+    run = tempfile.NamedTemporaryFile(dir=directory, suffix=".run", delete=False)
+    with run:
+        run.write(data)
+    return run.name
+
+
+def _iter_run(path):
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(8 * 65536)
+            if not block:
+                return
+            yield from array("Q", block)
+
+
+def build_index(platform, sources, directory=INDEX_DIR):
+    """
+    Hash, sort and dedupe every handle in sources (text files, one
+    handle per line, optionally .gz) into <directory>/<platform>.idx.
+    Sorting is done in runs of SORT_CHUNK handles merged from disk, so
+    memory is one run plus the Bloom filter (~1.25 bytes per handle)
+    however large the lists are. Returns the entry count.
+    """
+
+    directory = Path(directory)
+    os.makedirs(directory, exist_ok=True)
+
+    runs = []
+    total = 0
+    chunk = array("Q")
+
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        for handle in _read_handles(sources):
+            chunk.append(handle_hash(handle))
+            total += 1
+            if len(chunk) >= SORT_CHUNK:
+                runs.append(_sorted_run(chunk, tmp))
+                chunk = array("Q")
+        if chunk:
+            runs.append(_sorted_run(chunk, tmp))
+
+        # Sized for the pre-dedupe count: an upper bound
+        bits = max(64, total * BLOOM_BITS_PER_ENTRY)
+        bloom = bytearray(_bloom_bytes(bits))
+
+        table_path = os.path.join(tmp, "table")
+        count = 0
+        last = None
+
+        with open(table_path, "wb") as table:
+            out = array("Q")
+            for h in heapq.merge(*(_iter_run(r) for r in runs)):
+                if h == last:
+                    continue
+                last = h
+                out.append(h)
+                count += 1
+                for pos in _bloom_positions(h, bits, BLOOM_HASHES):
+                    bloom[pos >> 3] |= 1 << (pos & 7)
+                if len(out) >= 65536:
+                    out.tofile(table)
+                    out = array("Q")
+            out.tofile(table)
+
+        final = directory / f"{platform}.idx"
+        partial = final.with_suffix(".idx.tmp")
+
+        with open(partial, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, sys.byteorder == "big", count, bits, BLOOM_HASHES))
+            f.write(bloom)
+            with open(table_path, "rb") as table:
+                while True:
+                    block = table.read(1 << 20)
+                    if not block:
+                        break
+                    f.write(block)
+
+        # Readers see either the old index or the new one, never half
+        os.replace(partial, final)
+
+    return count
+
+
+# ================= CLI =================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Known-accounts index")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="(re)build a platform index from handle lists")
+    build.add_argument("platform")
+    build.add_argument("sources", nargs="+", help="text files, one handle per line (.gz ok)")
+    build.add_argument("--dir", default=str(INDEX_DIR))
+
+    lookup = sub.add_parser("lookup", help="check handles against a platform index")
+    lookup.add_argument("platform")
+    lookup.add_argument("handles", nargs="+")
+    lookup.add_argument("--dir", default=str(INDEX_DIR))
+
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        count = build_index(args.platform, args.sources, args.dir)
+        print(f"[✔] {args.platform}: {count} handles indexed in {args.dir}")
+        return
+
+    index = KnownAccountsIndex(args.dir)
+    for handle in args.handles:
+        print(f"{handle:30} {'KNOWN' if index.lookup(args.platform, handle) else '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+import re
+
+from osint import http_client
+
+
+class MarkerSet:
+    """
+    All markers of a platform compiled into one multi-pattern matcher.
+    A single regex alternation walks the text once (in C) instead of one
+    `in` scan per marker; shorter markers that are a prefix of a longer
+    marker matched at the same spot are credited through an
+    implication table.
+    Matching is case-insensitive (markers are lowercased, text is fed
+    lowercased).
+    """
+
+    def __init__(self, markers):
+        self.markers = tuple(dict.fromkeys(m.lower() for m in markers if m))
+        self.max_len = max((len(m) for m in self.markers), default=0)
+
+        # Longest first so the lookahead prefers the most specific marker
+        ordered = sorted(self.markers, key=len, reverse=True)
+        self._regex = re.compile(
+            "(?=(" + "|".join(re.escape(m) for m in ordered) + "))"
+        ) if ordered else None
+
+        # marker -> ((shorter marker that is its prefix, its length), ...);
+        # markers starting elsewhere inside it get their own lookahead hit
+        self._implied = {
+            m: tuple(
+                (o, len(o))
+                for o in self.markers
+                if o != m and m.startswith(o)
+            )
+            for m in self.markers
+        }
+
+    def scanner(self, extra=()):
+        """
+        extra: per-call needles (e.g. the username) looked for in the
+        same pass without recompiling the platform's matcher.
+        """
+        return MarkerScan(self, extra)
+
+    def scan_text(self, text):
+        scan = self.scanner()
+        scan.feed(text.lower())
+        return scan
+
+
+class MarkerScan:
+    """
+    Incremental matcher state: feed lowercased text chunk by chunk.
+    Markers spanning a chunk boundary are still found.
+    """
+
+    def __init__(self, marker_set, extra=()):
+        self._set = marker_set
+        self._extra = tuple(e.lower() for e in extra if e)
+        self._keep = max([marker_set.max_len] + [len(e) for e in self._extra]) - 1
+        self._tail = ""
+        self.found = set()
+        self.counts = dict.fromkeys(marker_set.markers, 0)
+        self.bytes_read = 0
+        self.truncated = False
+
+    def feed(self, chunk):
+        regex = self._set._regex
+        if not chunk:
+            return
+
+        window = self._tail + chunk
+        boundary = len(self._tail)
+
+        for needle in self._extra:
+            if needle not in self.found and needle in window:
+                self.found.add(needle)
+
+        for match in (regex.finditer(window) if regex else ()):
+            marker = match.group(1)
+            start = match.start()
+            # Matches ending inside the tail were counted with the last chunk
+            hits = ((marker, len(marker)),) + self._set._implied[marker]
+            for m, end in hits:
+                if start + end > boundary:
+                    self.found.add(m)
+                    self.counts[m] += 1
+
+        self._tail = window[-self._keep:] if self._keep > 0 else ""
+
+    def __contains__(self, marker):
+        return marker in self.found
+
+    def any(self, markers):
+        return any(m in self.found for m in markers)
+
+    def all(self, markers):
+        return all(m in self.found for m in markers)
+
+
+def match_response(response, marker_set, stop=None, max_bytes=None, extra=()):
+    """
+    Stream the response body through marker_set, chunk by chunk
+    (decompressed and decoded incrementally), up to max_bytes.
+    Reading stops early once stop(scan) is true. The response is
+    always released (a short remainder is drained so the connection
+    is reused).
+    """
+
+    scan = marker_set.scanner(extra)
+
+    try:
+        for chunk, total in http_client.iter_text(response, max_bytes):
+            scan.feed(chunk)
+            scan.bytes_read = total
+            if stop and stop(scan):
+                break
+        else:
+            limit = http_client.MAX_BODY_BYTES if max_bytes is None else max_bytes
+            scan.truncated = scan.bytes_read >= limit
+    finally:
+        http_client.release(response)
+
+    return scan
@@ -0,0 +1,414 @@
+"""
+Continuous monitoring: usernames and domains rescanned on their own
+intervals in the background, reporting only what changed.
+"""
+
+import heapq
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from osint import http_client
+from osint.probe_engine import background
+
+# ================= CONFIG =================
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+MONITOR_PATH = os.environ.get(
+    "OSINT_MONITOR_PATH", str(BASE_DIR / "data" / "monitor.db")
+)
+
+# Subjects rescanned at once
+WORKERS = int(os.environ.get("OSINT_MONITOR_WORKERS", "2"))
+
+DEFAULT_INTERVAL = 24 * 3600    # seconds between rescans
+DEFAULT_JITTER = 0.1            # +/- fraction of the interval
+
+# New subjects get their first scan spread over this window, so a bulk
+# registration does not all fall due at once
+FIRST_RUN_SPREAD = 3600
+
+RETRY_DELAY = 900               # after a failed rescan
+SCAN_BUDGET = 60                # seconds per rescan
+
+# Scanners behind username snapshots (see batch.username_records).
+# "scan" only ever settles FOUND (anything else is INCONCLUSIVE), so an
+# account it found that later disappears is not reported; "enumerate"
+# also settles NOT FOUND and does report it
+USERNAME_SCANNERS = ("scan", "enumerate")
+
+# Checked while interactive requests wait for the outbound budget
+IDLE_POLL = 1.0
+
+
+# ================= SNAPSHOTS =================
+# A snapshot maps observation -> value and holds only what a rescan
+# could actually settle; anything it could not (timeouts, throttling,
+# failed requests or lookups) keeps its previous value instead of
+# reading as a change.
+
+def username_snapshot(username):
+    from osint.batch import username_records
+
+    snapshot = {}
+    # A rescan must see the live state, not a cached probe
+    records = username_records(username, scanners=USERNAME_SCANNERS,
+                               budget=SCAN_BUDGET, bypass_cache=True)
+    for rec in records:
+        key = f"{rec['scanner']}/{rec['platform']}"
+        if rec["status"] == "FOUND":
+            snapshot[key] = True
+        elif rec["status"] == "NOT FOUND":
+            snapshot[key] = False
+    return snapshot
+
+
+def domain_snapshot(domain):
+    from osint.web_exposure import INTERESTING_DIRS, SENSITIVE_FILES, analyze_website_exposure
+
+    res = analyze_website_exposure(domain, budget=SCAN_BUDGET)
+    unsure = set(res["timed_out"]) | set(res["failed"])
+    reachable = set(res["exposed_sensitive_files"]) | set(res["interesting_paths"])
+
+    snapshot = {}
+    for path in SENSITIVE_FILES + INTERESTING_DIRS:
+        if f"/{path}" not in unsure:
+            snapshot[f"path /{path}"] = f"{res['target']}/{path}" in reachable
+
+    headers = res["security_headers"]
+    if "security_headers" not in unsure:
+        for header in headers["missing"]:
+            snapshot[f"header {header} missing"] = True
+        for header in headers["present"]:
+            snapshot[f"header {header} missing"] = False
+
+    if "robots" not in unsure:
+        snapshot["robots disallow"] = sorted(res["robots"]["disallowed_paths"])
+
+    if "dns" not in unsure:
+        for rtype, values in res["dns_records"].items():
+            if rtype not in res["dns_unresolved"]:
+                snapshot[f"dns {rtype}"] = sorted(values)
+
+    return snapshot
+
+
+SNAPSHOTS = {
+    "username": username_snapshot,
+    "domain": domain_snapshot,
+}
+
+
+def diff_snapshots(old, new):
+    """
+    (merged snapshot, changes). Observations missing from new keep
+    their old value; one missing from old only counts once it shows
+    something (a first "not found" is not news).
+    """
+    merged = dict(old)
+    changes = []
+
+    for key, value in new.items():
+        before = old.get(key)
+        if key in old and before != value or key not in old and value:
+            changes.append({"key": key, "before": before, "after": value})
+        merged[key] = value
+
+    return merged, changes
+
+
+# ================= SCHEDULER =================
+
+class Monitor:
+    def __init__(self, path=MONITOR_PATH, workers=WORKERS):
+        self.path = path
+        self.workers = workers
+
+        self._heap = []
+        self._due = {}
+        self._cond = threading.Condition()
+        self._db_lock = threading.Lock()
+        self._slots = threading.Semaphore(workers)
+        self._listeners = []
+        self._threads = []
+        self._stop = threading.Event()
+        self._running = 0
+        self._counts = {"rescans": 0, "failures": 0, "changes": 0}
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._db.executescript(
+            "PRAGMA journal_mode=WAL;"
+            "CREATE TABLE IF NOT EXISTS subjects ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT, kind TEXT, value TEXT,"
+            " interval REAL, jitter REAL, next_due REAL, last_run REAL,"
+            " failures INTEGER DEFAULT 0, snapshot TEXT,"
+            " UNIQUE (kind, value));"
+            "CREATE TABLE IF NOT EXISTS changes ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT, subject_id INTEGER,"
+            " at REAL, changes TEXT);"
+        )
+        self._load()
+
+    def _load(self):
+        rows = self._db.execute("SELECT id, next_due FROM subjects").fetchall()
+        with self._cond:
+            self._due = dict(rows)
+            self._heap = [(due, sid) for sid, due in rows]
+            heapq.heapify(self._heap)
+
+    def _schedule(self, sid, due, registered_only=False):
+        # Superseded heap entries are skipped when popped (lazy delete).
+        # registered_only: after a rescan, a subject removed meanwhile
+        # stays removed
+        with self._cond:
+            if registered_only and sid not in self._due:
+                return
+            self._due[sid] = due
+            heapq.heappush(self._heap, (due, sid))
+            self._cond.notify()
+
+    # ---------- subjects ----------
+
+    def add_many(self, kind, values, interval=DEFAULT_INTERVAL, jitter=DEFAULT_JITTER):
+        """
+        Register subjects (or update their interval). Returns how many
+        were new. One transaction for the whole batch.
+        """
+        if kind not in SNAPSHOTS:
+            raise ValueError(f"unknown subject kind {kind!r}")
+
+        now = time.time()
+        spread = min(interval, FIRST_RUN_SPREAD)
+        values = [v.strip() for v in values if v and v.strip()]
+
+        with self._db_lock:
+            self._db.executemany(
+                "INSERT INTO subjects (kind, value, interval, jitter, next_due) "
+                "VALUES (?, ?, ?, ?, ?) ON CONFLICT (kind, value) DO UPDATE "
+                "SET interval = excluded.interval, jitter = excluded.jitter",
+                [(kind, v, interval, jitter, now + random.uniform(0, spread)) for v in values]
+            )
+            self._db.commit()
+
+            rows = []
+            for i in range(0, len(values), 500):
+                chunk = values[i:i + 500]
+                rows += self._db.execute(
+                    "SELECT id, next_due FROM subjects WHERE kind = ? AND value IN "
+                    f"({','.join('?' * len(chunk))})",
+                    (kind, *chunk)
+                ).fetchall()
+
+        with self._cond:
+            new = [(sid, due) for sid, due in rows if sid not in self._due]
+        for sid, due in new:
+            self._schedule(sid, due)
+        return len(new)
+
+    def add(self, kind, value, interval=DEFAULT_INTERVAL, jitter=DEFAULT_JITTER):
+        return self.add_many(kind, [value], interval, jitter)
+
+    def remove(self, kind, value):
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT id FROM subjects WHERE kind = ? AND value = ?", (kind, value)
+            ).fetchone()
+            if row is None:
+                return False
+            self._db.execute("DELETE FROM subjects WHERE id = ?", row)
+            self._db.commit()
+
+        with self._cond:
+            self._due.pop(row[0], None)
+        return True
+
+    def on_change(self, fn):
+        """
+        fn(kind, value, changes) after every rescan that changed something.
+        """
+        self._listeners.append(fn)
+
+    def changes(self, since=0, limit=100):
+        with self._db_lock:
+            rows = self._db.execute(
+                "SELECT c.id, s.kind, s.value, c.at, c.changes FROM changes c "
+                "JOIN subjects s ON s.id = c.subject_id WHERE c.id > ? ORDER BY c.id LIMIT ?",
+                (since, limit)
+            ).fetchall()
+        return [
+            {"id": cid, "kind": kind, "value": value, "at": at, "changes": json.loads(changes)}
+            for cid, kind, value, at, changes in rows
+        ]
+
+    # ---------- running ----------
+
+    def start(self):
+        if self._threads:
+            return
+        self._stop.clear()
+        t = threading.Thread(target=self._loop, name="osint-monitor", daemon=True)
+        t.start()
+        self._threads.append(t)
+        print(f"[Monitor] Watching {len(self._due)} subjects with {self.workers} workers")
+
+    def stop(self):
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+        for t in self._threads:
+            t.join()
+        self._threads = []
+
+    def _next_due(self):
+        """
+        Block until a subject is due (or stop); returns its id.
+        """
+        with self._cond:
+            while not self._stop.is_set():
+                while self._heap and self._due.get(self._heap[0][1]) != self._heap[0][0]:
+                    heapq.heappop(self._heap)
+
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+
+                due, sid = self._heap[0]
+                wait = due - time.time()
+                if wait > 0:
+                    self._cond.wait(wait)
+                    continue
+
+                heapq.heappop(self._heap)
+                return sid
+        return None
+
+    def _loop(self):
+        while not self._stop.is_set():
+            # A worker slot first, so due subjects stay queued in the heap
+            while not self._slots.acquire(timeout=IDLE_POLL):
+                if self._stop.is_set():
+                    return
+
+            # Interactive requests waiting on the budget: hold back
+            while http_client.outbound_stats()["interactive_waiting"] and not self._stop.wait(IDLE_POLL):
+                pass
+
+            sid = self._next_due()
+            if sid is None:
+                self._slots.release()
+                return
+
+            threading.Thread(target=self._rescan_slot, args=(sid,), daemon=True).start()
+
+    def _rescan_slot(self, sid):
+        with self._cond:
+            self._running += 1
+        try:
+            self.rescan(sid)
+        finally:
+            with self._cond:
+                self._running -= 1
+            self._slots.release()
+
+    def rescan(self, sid):
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT kind, value, interval, jitter, failures, snapshot FROM subjects WHERE id = ?",
+                (sid,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        kind, value, interval, jitter, failures, snapshot = row
+        now = time.time()
+
+        try:
+            with background():
+                new = SNAPSHOTS[kind](value)
+        except Exception as e:
+            self._counts["failures"] += 1
+            print(f"[Monitor] Rescan of {kind} {value} failed:", e)
+            due = now + min(interval, RETRY_DELAY * 2 ** min(failures, 6))
+            with self._db_lock:
+                self._db.execute(
+                    "UPDATE subjects SET next_due = ?, failures = failures + 1 WHERE id = ?",
+                    (due, sid)
+                )
+                self._db.commit()
+            self._schedule(sid, due, registered_only=True)
+            return None
+
+        old = json.loads(snapshot) if snapshot else None
+        merged, changes = diff_snapshots(old or {}, new)
+        if old is None:
+            # First scan is the baseline, not a change
+            changes = []
+
+        due = now + interval * (1 + random.uniform(-jitter, jitter))
+
+        with self._db_lock:
+            updated = self._db.execute(
+                "UPDATE subjects SET next_due = ?, last_run = ?, failures = 0, snapshot = ? "
+                "WHERE id = ?",
+                (due, now, json.dumps(merged), sid)
+            ).rowcount
+            if not updated:
+                # Removed while it was being rescanned
+                self._db.commit()
+                return None
+            if changes:
+                self._db.execute(
+                    "INSERT INTO changes (subject_id, at, changes) VALUES (?, ?, ?)",
+                    (sid, now, json.dumps(changes))
+                )
+            self._db.commit()
+        self._schedule(sid, due, registered_only=True)
+
+        self._counts["rescans"] += 1
+        if changes:
+            self._counts["changes"] += 1
+            for fn in self._listeners:
+                try:
+                    fn(kind, value, changes)
+                except Exception as e:
+                    print("[Monitor] Change listener failed:", e)
+
+        return changes
+
+    def stats(self):
+        with self._cond:
+            now = time.time()
+            live = list(self._due.values())
+            return {
+                "subjects": len(live),
+                "due": sum(1 for due in live if due <= now),
+                "next_due_in": round(min(live) - now, 1) if live else None,
+                "running": self._running,
+                **self._counts,
+                "outbound": http_client.outbound_stats(),
+            }
+
+
+_monitor = None
+_monitor_lock = threading.Lock()
+
+
+def get_monitor():
+    global _monitor
+
+    if _monitor is None:
+        with _monitor_lock:
+            if _monitor is None:
+                _monitor = Monitor()
+                _monitor.on_change(
+                    lambda kind, value, changes: print(
+                        f"[Monitor] {kind} {value}: {len(changes)} change(s)"
+                    )
+                )
+    return _monitor
@@ -0,0 +1,309 @@
+"""
+Wordlist path discovery, paced per target, with soft-404 answers
+filtered out by calibrating against paths that cannot exist.
+"""
+
+import hashlib
+import os
+import re
+import secrets
+import time
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import quote
+
+from osint import http_client
+from osint.batch import read_lines
+from osint.host_control import RateLimited
+from osint.rate_limit import HostRateLimiter
+from osint.web_exposure import HEADERS, normalize_url
+
+# ================= CONFIG =================
+
+WORDLIST = os.path.join(os.path.dirname(__file__), "data", "wordlists", "common.txt")
+
+# Requests/sec to the target, and requests in flight at once (each on
+# its own pooled keep-alive connection; keep <= OSINT_HTTP_POOL_MAXSIZE)
+RATE = float(os.environ.get("OSINT_PATHS_RATE", "10"))
+CONCURRENCY = int(os.environ.get("OSINT_PATHS_CONCURRENCY", "8"))
+
+TIMEOUT = 5
+
+# Random paths fetched up front; "{}" is the random token. Extensions
+# and a trailing slash often hit different handlers
+CALIBRATION_PATTERNS = ["{}", "{}.html", "{}.php", "{}/"]
+
+# Body bytes hashed for a fingerprint
+HASH_BYTES = 8192
+
+# Lengths this close (after removing the echoed path) count as the
+# same page: covers timestamps, CSRF tokens and the like
+LENGTH_SLACK = 32
+LENGTH_TOLERANCE = 0.02
+
+# Statuses worth reporting; everything else is a miss
+HIT_STATUSES = {200, 201, 204, 206, 301, 302, 303, 307, 308, 401, 403, 405}
+
+# More hits than this with an identical body are a catch-all (e.g.
+# /api/* answering every path) and the rest are dropped
+DUPLICATE_LIMIT = 3
+
+# Times a path the target throttled is put back on the queue
+RETRIES = 2
+
+DIGITS = re.compile(rb"\d+")
+
+
+# ================= FINGERPRINTS =================
+
+def _echoes(path):
+    # How a page might quote the requested path back
+    path = path.lower()
+    return sorted({path, quote(path).lower(), path.rstrip("/")} - {""}, key=len, reverse=True)
+
+
+def _location(r, base_url, path):
+    location = r.headers.get("Location", "")
+    if not location:
+        return ""
+    location = location.lower()
+    if location.startswith(base_url.lower()):
+        location = location[len(base_url):]
+    for echo in _echoes(path):
+        location = location.replace(echo, "")
+    return location
+
+
+def fingerprint(r, base_url, path):
+    """
+    Fingerprint of a streamed response (released afterwards). Only the
+    first HASH_BYTES are held; the rest is left to http_client.release.
+    """
+    content_length = r.headers.get("Content-Length", "")
+    content_length = int(content_length) if content_length.isdigit() else None
+
+    head = bytearray()
+    complete = False
+
+    try:
+        for chunk in r.iter_content(chunk_size=http_client.CHUNK_SIZE):
+            head += chunk
+            if len(head) > HASH_BYTES:
+                break
+        else:
+            complete = True
+    finally:
+        http_client.release(r)
+
+    read = len(head)
+    head = head[:HASH_BYTES]
+
+    body = bytes(head).lower()
+    echoed = 0
+    for echo in _echoes(path):
+        echo = echo.encode("utf-8")
+        echoed += body.count(echo) * len(echo)
+        body = body.replace(echo, b"")
+    body = DIGITS.sub(b"0", body)
+
+    length = read if complete else content_length
+    return {
+        "status": r.status_code,
+        "content_type": r.headers.get("Content-Type", "").split(";")[0].strip().lower(),
+        "length": None if length is None else length - echoed,
+        "hash": hashlib.blake2b(body, digest_size=8).hexdigest(),
+        "location": _location(r, base_url, path) if 300 <= r.status_code < 400 else "",
+    }
+
+
+def _same_length(a, b):
+    if a is None or b is None:
+        return False
+    return abs(a - b) <= max(LENGTH_SLACK, LENGTH_TOLERANCE * max(a, b))
+
+
+def matches(fp, baseline):
+    if fp["status"] != baseline["status"]:
+        return False
+    if 300 <= fp["status"] < 400:
+        return fp["location"] == baseline["location"]
+    if fp["hash"] == baseline["hash"]:
+        return True
+    return fp["content_type"] == baseline["content_type"] and _same_length(fp["length"], baseline["length"])
+
+
+def _fetch(base_url, path, deadline=None):
+    timeout = TIMEOUT if deadline is None else min(TIMEOUT, deadline - time.monotonic())
+    if timeout <= 0:
+        raise TimeoutError(path)
+
+    r = http_client.stream(
+        f"{base_url}/{path}", headers=HEADERS, timeout=timeout, allow_redirects=False
+    )
+    return fingerprint(r, base_url, path)
+
+
+def calibrate(base_url, deadline=None, errors=None, limiter=None):
+    """
+    Fingerprints of the target's answers to paths that cannot exist.
+    Identical answers are kept once; plain 404s need no baseline.
+    Probes that failed are appended to errors (a list), if given.
+    """
+    baselines = []
+
+    for pattern in CALIBRATION_PATTERNS:
+        path = pattern.format(secrets.token_hex(12))
+        if limiter is not None and not limiter.acquire(base_url, deadline):
+            if errors is not None:
+                errors.append(f"/{path}: budget exhausted")
+            break
+        try:
+            fp = _fetch(base_url, path, deadline)
+        except Exception as e:
+            if errors is not None:
+                errors.append(f"/{path}: {e.__class__.__name__}")
+            continue
+        if fp["status"] in HIT_STATUSES and not any(matches(fp, b) for b in baselines):
+            baselines.append(fp)
+
+    return baselines
+
+
+# ================= DISCOVERY =================
+
+def _paths(wordlist, extensions):
+    source = read_lines(wordlist) if isinstance(wordlist, str) else wordlist
+    for word in source:
+        word = word.strip().lstrip("/")
+        if not word or word.startswith("#"):
+            continue
+        for ext in extensions:
+            yield word + ext
+
+
+def iter_discover_paths(target, wordlist=None, rate=None, concurrency=None,
+                        extensions=("",), budget=None, stats=None):
+    """
+    Yields one hit dict per wordlist path that is really there.
+
+    wordlist: file path (streamed) or iterable of paths, default the
+    bundled common list; every entry is also tried with each extension.
+    A path is taken off the list only once the rate allows sending it,
+    and at most concurrency are in flight, so memory does not grow with
+    the list. Paths the target throttles are retried up to RETRIES times.
+    stats (a dict) is filled in as it goes: checked, soft_404, missing,
+    duplicates, errors, rate_limited, timed_out, calibration (the
+    soft-404 fingerprints) and calibration_errors.
+    """
+    rate = RATE if rate is None else rate
+    concurrency = CONCURRENCY if concurrency is None else concurrency
+    if rate <= 0:
+        raise ValueError("rate must be positive")
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+    stats = {} if stats is None else stats
+    stats.update({
+        "checked": 0, "soft_404": 0, "missing": 0, "duplicates": 0,
+        "errors": 0, "rate_limited": 0, "timed_out": False,
+    })
+
+    base_url = normalize_url(target)
+    deadline = time.monotonic() + budget if budget else None
+    limiter = HostRateLimiter(rate=rate, burst=max(1, min(concurrency, int(rate))))
+
+    calibration_errors = []
+    baselines = calibrate(base_url, deadline, calibration_errors, limiter)
+    stats["calibration"] = baselines
+    stats["calibration_errors"] = calibration_errors
+
+    seen_bodies = Counter()
+
+    source = _paths(wordlist or WORDLIST, extensions)
+    retry = deque()
+    running = {}
+    exhausted = False
+
+    executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="osint-paths")
+
+    try:
+        while True:
+            # Paced here rather than per request, so a path is only
+            # taken once it can go out; stop early to hand over results
+            while not exhausted and len(running) < concurrency:
+                if running and any(f.done() for f in running):
+                    break
+                path, attempts = retry.popleft() if retry else (next(source, None), 0)
+                if path is None:
+                    exhausted = True
+                    break
+                if not limiter.acquire(base_url, deadline):
+                    stats["timed_out"] = True
+                    exhausted = True
+                    break
+                running[executor.submit(_fetch, base_url, path, deadline)] = (path, attempts)
+
+            if not running:
+                return
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                path, attempts = running.pop(future)
+                try:
+                    fp = future.result()
+                except RateLimited:
+                    if attempts < RETRIES:
+                        retry.append((path, attempts + 1))
+                        continue
+                    stats["checked"] += 1
+                    stats["rate_limited"] += 1
+                    continue
+                except Exception:
+                    stats["checked"] += 1
+                    stats["errors"] += 1
+                    continue
+
+                stats["checked"] += 1
+                if fp["status"] not in HIT_STATUSES:
+                    stats["missing"] += 1
+                    continue
+                if any(matches(fp, b) for b in baselines):
+                    stats["soft_404"] += 1
+                    continue
+
+                body = (fp["status"], fp["hash"])
+                seen_bodies[body] += 1
+                if seen_bodies[body] > DUPLICATE_LIMIT:
+                    stats["duplicates"] += 1
+                    continue
+
+                yield {
+                    "path": f"/{path}",
+                    "url": f"{base_url}/{path}",
+                    "status": fp["status"],
+                    "content_type": fp["content_type"],
+                    "length": fp["length"],
+                    **({"location": fp["location"]} if fp["location"] else {}),
+                }
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def discover_paths(target, wordlist=None, rate=None, concurrency=None,
+                   extensions=("",), budget=None):
+    start = time.monotonic()
+    stats = {}
+
+    found = list(iter_discover_paths(
+        target, wordlist=wordlist, rate=rate, concurrency=concurrency,
+        extensions=extensions, budget=budget, stats=stats
+    ))
+
+    return {
+        "target": target,
+        "base_url": normalize_url(target),
+        "found": found,
+        "calibration": stats.pop("calibration", []),
+        "stats": stats,
+        "elapsed": round(time.monotonic() - start, 2),
+    }
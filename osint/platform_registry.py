@@ -0,0 +1,269 @@
+import functools
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+
+from osint.markers import MarkerSet
+
+# ================= CONFIG =================
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+PLATFORM_DIR = BASE_DIR / "data" / "platforms"
+
+# Long-tail platform files: group -> (tier, filename)
+TIER_FILES = {
+    "tier2": (2, "tier2.json"),
+    "tier3": (3, "tier3.json"),
+}
+
+# How often (seconds) the tier files are stat()ed for changes
+RELOAD_INTERVAL = 2.0
+
+# Status for usernames a platform's rule says cannot exist there
+INVALID = "INVALID FOR PLATFORM"
+
+
+class RegistryError(ValueError):
+    pass
+
+
+# ================= USERNAME RULES =================
+
+@functools.lru_cache(maxsize=None)
+def _compile_rule(pattern, min_len, max_len, case_sensitive):
+    # Length bounds become a lookahead so one fullmatch checks everything
+    length = ""
+    if min_len is not None or max_len is not None:
+        length = f"(?=.{{{min_len or 0},{'' if max_len is None else max_len}}}\\Z)"
+    return re.compile(
+        length + f"(?:{pattern or '.*'})",
+        0 if case_sensitive else re.IGNORECASE
+    )
+
+
+def _rule(where, spec):
+    """
+    A username rule is either a regex (full match, case-insensitive) or
+    {"pattern": regex, "min": n, "max": n, "case_sensitive": bool}.
+    Identical rules across entries share one compiled regex.
+    """
+    if spec is None:
+        return None
+    if isinstance(spec, str):
+        spec = {"pattern": spec}
+    if not isinstance(spec, dict):
+        raise RegistryError(f"{where}: username rule must be a regex or an object")
+
+    pattern = spec.get("pattern")
+    min_len, max_len = spec.get("min"), spec.get("max")
+
+    if pattern is not None and not isinstance(pattern, str):
+        raise RegistryError(f"{where}: username pattern must be a string")
+    for bound in (min_len, max_len):
+        if bound is not None and (not isinstance(bound, int) or bound < 0):
+            raise RegistryError(f"{where}: username min/max must be non-negative integers")
+
+    try:
+        return _compile_rule(pattern, min_len, max_len, bool(spec.get("case_sensitive")))
+    except re.error as e:
+        raise RegistryError(f"{where}: bad username pattern: {e}")
+
+
+# ================= RECORDS =================
+
+class Platform:
+    """
+    One validated platform entry: URL template plus its markers,
+    compiled once into a single MarkerSet.
+    """
+
+    __slots__ = (
+        "name", "group", "tier", "url", "host",
+        "success", "failure", "signals", "markers", "rule"
+    )
+
+    def __init__(self, name, group, tier, url, success=(), failure=(), signals=(),
+                 rule=None):
+        self.name = name
+        self.group = group
+        self.tier = tier
+        self.url = url
+        self.host = urlparse(url).netloc.lower()
+        self.success = tuple(s.lower() for s in success)
+        self.failure = tuple(f.lower() for f in failure)
+        self.signals = tuple(s.lower() for s in signals)
+        self.markers = MarkerSet(self.success + self.failure + self.signals)
+        self.rule = rule
+
+    def profile_url(self, username):
+        return self.url.replace("{username}", username)
+
+    def accepts(self, username):
+        """
+        False when the handle cannot exist on this platform, so the
+        probe can be answered locally.
+        """
+        return self.rule is None or self.rule.fullmatch(username) is not None
+
+    def __repr__(self):
+        return f"Platform({self.group}/{self.name})"
+
+
+def _validate(name, group, tier, cfg):
+    if isinstance(cfg, str):
+        cfg = {"url": cfg}
+
+    if not isinstance(cfg, dict):
+        raise RegistryError(f"{group}/{name}: entry must be an object")
+
+    url = cfg.get("url", "")
+    if not isinstance(url, str) or not url.startswith(("http://", "https://")):
+        raise RegistryError(f"{group}/{name}: url must be an http(s) URL")
+    if "{username}" not in url:
+        raise RegistryError(f"{group}/{name}: url has no {{username}} placeholder")
+
+    lists = {}
+    for key in ("success", "failure", "signals"):
+        values = cfg.get(key, [])
+        if not isinstance(values, list) or not all(isinstance(v, str) for v in values):
+            raise RegistryError(f"{group}/{name}: {key} must be a list of strings")
+        lists[key] = values
+
+    rule = _rule(f"{group}/{name}", cfg.get("username"))
+
+    return Platform(name, group, tier, url, rule=rule, **lists)
+
+
+def _compile_group(group, tier, entries):
+    return {
+        name: _validate(name, group, tier, cfg)
+        for name, cfg in entries.items()
+    }
+
+
+# ================= REGISTRY =================
+
+class PlatformRegistry:
+    """
+    Immutable snapshot of every platform the scanners know about,
+    grouped by scanner: scan, tier1, discovery, tier2, tier3.
+    """
+
+    def __init__(self, groups, mtimes):
+        self._groups = groups
+        self.mtimes = mtimes
+        self.loaded_at = time.time()
+
+    def group(self, name):
+        return self._groups.get(name, {})
+
+    def get(self, group, name):
+        return self._groups[group][name]
+
+    def groups(self):
+        return list(self._groups)
+
+    def __len__(self):
+        return sum(len(g) for g in self._groups.values())
+
+
+def _python_sources():
+    # Imported here: these modules themselves read the registry
+    from osint.username_discovery import USERNAME_RULES, USERNAME_SITES
+    from osint.username_enumerator import SITES, TIER_1
+    from osint.username_scan import SCAN_SITES
+
+    return {
+        "scan": (1, SCAN_SITES),
+        "tier1": (1, {p: SITES[p] for p in TIER_1}),
+        "discovery": (1, {
+            name: {
+                "url": pattern.replace("{}", "{username}"),
+                "username": USERNAME_RULES.get(name)
+            }
+            for name, pattern in USERNAME_SITES.items()
+        }),
+    }
+
+
+def _tier_mtimes():
+    mtimes = {}
+    for _, filename in TIER_FILES.values():
+        try:
+            mtimes[filename] = os.stat(PLATFORM_DIR / filename).st_mtime_ns
+        except FileNotFoundError:
+            mtimes[filename] = None
+    return mtimes
+
+
+def _build():
+    mtimes = _tier_mtimes()
+    groups = {}
+
+    for group, (tier, entries) in _python_sources().items():
+        groups[group] = _compile_group(group, tier, entries)
+
+    for group, (tier, filename) in TIER_FILES.items():
+        if mtimes[filename] is None:
+            groups[group] = {}
+            continue
+
+        with open(PLATFORM_DIR / filename, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+        if not isinstance(entries, dict):
+            raise RegistryError(f"{filename}: top level must be an object")
+
+        groups[group] = _compile_group(group, tier, entries)
+
+    return PlatformRegistry(groups, mtimes)
+
+
+_registry = None
+_checked_at = 0.0
+_failed_mtimes = None
+_lock = threading.Lock()
+
+
+def reload(force=False):
+    """
+    Rebuild the registry if a tier file changed (or force=True).
+    A file that fails validation keeps the previous registry in place.
+    """
+    global _registry, _checked_at, _failed_mtimes
+
+    with _lock:
+        if not force and _registry is not None:
+            # Another thread may have just checked
+            if time.monotonic() - _checked_at <= RELOAD_INTERVAL:
+                return _registry
+            _checked_at = time.monotonic()
+            if _tier_mtimes() in (_registry.mtimes, _failed_mtimes):
+                return _registry
+
+        _checked_at = time.monotonic()
+
+        try:
+            _registry = _build()
+            _failed_mtimes = None
+        except (OSError, ValueError) as e:
+            if _registry is None:
+                raise
+            _failed_mtimes = _tier_mtimes()
+            print("[Registry] Reload failed, keeping previous platforms:", e)
+
+        return _registry
+
+
+def get_registry():
+    """
+    Shared registry; tier files are re-checked at most every
+    RELOAD_INTERVAL seconds, so there is no per-request parsing.
+    """
+    registry = _registry
+    if registry is None or time.monotonic() - _checked_at > RELOAD_INTERVAL:
+        registry = reload()
+    return registry
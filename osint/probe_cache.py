@@ -0,0 +1,225 @@
+import copy
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from osint.singleflight import get_group
+
+# ================= CONFIG =================
+
+# In-memory LRU size (entries)
+MAX_ENTRIES = int(os.environ.get("OSINT_PROBE_CACHE_SIZE", "10000"))
+
+# Optional on-disk tier (SQLite file); disabled when unset
+DISK_PATH = os.environ.get("OSINT_PROBE_CACHE_PATH")
+
+DEFAULT_TTL = 3600          # seconds a FOUND verdict is reused
+NEGATIVE_TTL = 600          # seconds a NOT FOUND verdict is reused
+
+# Platforms whose profiles change faster / slower than the default
+PLATFORM_TTL = {
+    "Instagram": 1800,
+    "Facebook": 1800,
+    "Threads": 1800,
+    "Twitter": 1800,
+    "GitHub": 6 * 3600,
+    "GitLab": 6 * 3600,
+    "PyPI": 12 * 3600,
+    "npm": 12 * 3600,
+}
+
+PLATFORM_NEGATIVE_TTL = {
+    "Instagram": 300,
+    "Facebook": 300,
+    "Threads": 300,
+}
+
+_MISS = object()
+
+
+# ================= STORES =================
+
+class _DiskStore:
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS probe_cache "
+            "(key TEXT PRIMARY KEY, value TEXT, expires REAL)"
+        )
+        self._db.commit()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value, expires FROM probe_cache WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                return _MISS, 0
+
+            if row[1] <= time.time():
+                self._db.execute("DELETE FROM probe_cache WHERE key = ?", (key,))
+                self._db.commit()
+                return _MISS, 0
+
+            return json.loads(row[0]), row[1]
+
+    def set(self, key, value, expires):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO probe_cache VALUES (?, ?, ?)",
+                (key, json.dumps(value), expires)
+            )
+            self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM probe_cache")
+            self._db.commit()
+
+
+class ProbeCache:
+    """
+    Two-tier probe-result cache: in-memory LRU + optional SQLite store.
+    Entries expire by wall-clock time so they survive restarts on disk.
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES, disk_path=DISK_PATH):
+        self.max_entries = max_entries
+        self._mem = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk = _DiskStore(disk_path) if disk_path else None
+        self._stats = {"hits": 0, "disk_hits": 0, "misses": 0, "stores": 0}
+
+    def get(self, key):
+        now = time.time()
+
+        with self._lock:
+            entry = self._mem.get(key)
+            if entry is not None:
+                value, expires = entry
+                if expires > now:
+                    self._mem.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return value
+                del self._mem[key]
+
+        if self._disk:
+            value, expires = self._disk.get(key)
+            if value is not _MISS:
+                with self._lock:
+                    self._remember(key, value, expires)
+                    self._stats["hits"] += 1
+                    self._stats["disk_hits"] += 1
+                return value
+
+        with self._lock:
+            self._stats["misses"] += 1
+        return _MISS
+
+    def set(self, key, value, ttl):
+        expires = time.time() + ttl
+
+        with self._lock:
+            self._remember(key, value, expires)
+            self._stats["stores"] += 1
+
+        if self._disk:
+            self._disk.set(key, value, expires)
+
+    def _remember(self, key, value, expires):
+        self._mem[key] = (value, expires)
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.max_entries:
+            self._mem.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "entries": len(self._mem),
+                "hit_rate": round(self._stats["hits"] / lookups, 3) if lookups else 0.0
+            }
+
+    def clear(self):
+        with self._lock:
+            self._mem.clear()
+        if self._disk:
+            self._disk.clear()
+
+
+_cache = ProbeCache()
+
+
+def get_cache():
+    return _cache
+
+
+# ================= VERDICTS =================
+
+def status_verdict(result):
+    """
+    For status-dict results: FOUND is positive, NOT FOUND negative,
+    anything else (ERROR, TIMEOUT, ...) is never cached.
+    """
+    status = (result or {}).get("status")
+    if status == "FOUND":
+        return True
+    if status == "NOT FOUND":
+        return False
+    return None
+
+
+def presence_verdict(result):
+    """
+    For checkers that return a dict when found and None when not;
+    anything else (an inconclusive marker) is never cached.
+    """
+    if result is None:
+        return False
+    if isinstance(result, dict):
+        return True
+    return None
+
+
+# ================= FRONT DOOR =================
+
+def cached_probe(scope, platform, username, probe, args=(),
+                 verdict=status_verdict, bypass=False):
+    """
+    Return the cached result for (scope, platform, username) or run
+    probe(*args) and cache it with the platform's positive/negative TTL.
+    bypass=True skips the lookup but still stores the fresh result.
+    Exceptions from the probe propagate and are never cached.
+    Concurrent misses for the same key share one probe, so streaming
+    and bulk callers are coalesced too.
+    Callers always get their own copy: they annotate results in place.
+    """
+
+    key = f"{scope}|{platform}|{username}"
+
+    if not bypass:
+        value = _cache.get(key)
+        if value is not _MISS:
+            return copy.deepcopy(value)
+
+    return get_group().do(("probe", key), _probe_and_store, key, platform, probe, args, verdict)
+
+
+def _probe_and_store(key, platform, probe, args, verdict):
+    result = probe(*args)
+
+    # The cache keeps its own copy; the leader's result is the caller's
+    positive = verdict(result)
+    if positive is True:
+        _cache.set(key, copy.deepcopy(result), PLATFORM_TTL.get(platform, DEFAULT_TTL))
+    elif positive is False:
+        _cache.set(key, copy.deepcopy(result), PLATFORM_NEGATIVE_TTL.get(platform, NEGATIVE_TTL))
+
+    return result
@@ -0,0 +1,155 @@
+import contextvars
+import os
+import threading
+import time
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+# ================= CONFIG =================
+
+# Shared pool for every outbound platform probe in the process
+MAX_WORKERS = int(os.environ.get("OSINT_PROBE_WORKERS", "32"))
+
+# Separate, smaller pool for background work (monitoring), so it can
+# never occupy the threads interactive scans need
+BACKGROUND_WORKERS = int(os.environ.get("OSINT_BACKGROUND_PROBE_WORKERS", "8"))
+
+# Yielded for probes still unfinished when the deadline passes
+TIMED_OUT = object()
+
+_executor = None
+_background_executor = None
+_executor_lock = threading.Lock()
+
+# Set for work started inside background(); carried into probe threads
+_background = contextvars.ContextVar("osint_background", default=False)
+
+
+def get_executor():
+    global _executor
+
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=MAX_WORKERS,
+                    thread_name_prefix="osint-probe"
+                )
+    return _executor
+
+
+def _get_background_executor():
+    global _background_executor
+
+    if _background_executor is None:
+        with _executor_lock:
+            if _background_executor is None:
+                _background_executor = ThreadPoolExecutor(
+                    max_workers=BACKGROUND_WORKERS,
+                    thread_name_prefix="osint-background"
+                )
+    return _background_executor
+
+
+@contextmanager
+def background():
+    """
+    Mark the work started inside as background: its probes run on the
+    background pool and its requests only get the background share of
+    the outbound budget (see http_client).
+    """
+    token = _background.set(True)
+    try:
+        yield
+    finally:
+        _background.reset(token)
+
+
+def is_background():
+    return _background.get()
+
+
+# ================= ENGINE =================
+
+def iter_probes(tasks, max_workers=None, deadline=None, window=None):
+    """
+    Run probe tasks concurrently.
+    tasks: iterable of (key, fn, args) tuples.
+    Yields (key, result) as soon as each probe finishes;
+    a probe that raises yields (key, None).
+
+    max_workers: run on a dedicated pool of this size instead of the
+                 shared one (bulk sweeps).
+    deadline:    time.monotonic() value; probes unfinished by then are
+                 cancelled and yielded as (key, TIMED_OUT).
+    window:      submit at most this many tasks ahead, taking the next
+                 one from tasks only when a probe finishes (so a lazy
+                 tasks iterable can stop early); default all at once.
+
+    Probes must be leaf work: they must not submit to the pool themselves.
+    """
+
+    if max_workers:
+        executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="osint-bulk"
+        )
+    elif is_background():
+        executor = _get_background_executor()
+    else:
+        executor = get_executor()
+
+    tasks = iter(tasks)
+    futures = {}
+
+    def submit_next():
+        for key, fn, args in tasks:
+            # Each probe runs in a copy of the caller's context (priority)
+            futures[executor.submit(contextvars.copy_context().run, fn, *args)] = key
+            return True
+        return False
+
+    while submit_next() and (window is None or len(futures) < window):
+        pass
+
+    try:
+        while futures:
+            remaining = None
+            if deadline is not None:
+                remaining = max(0, deadline - time.monotonic())
+
+            done, _ = wait(futures, timeout=remaining, return_when=FIRST_COMPLETED)
+            if not done:
+                break
+
+            for future in done:
+                key = futures.pop(future)
+                try:
+                    result = future.result()
+                except Exception:
+                    result = None
+                yield key, result
+
+                if window is not None and (deadline is None or time.monotonic() < deadline):
+                    submit_next()
+
+        # Deadline passed: whatever is left, started or not, timed out
+        for future in list(futures):
+            future.cancel()
+            yield futures.pop(future), TIMED_OUT
+        for key, _, _ in tasks:
+            yield key, TIMED_OUT
+
+    finally:
+        for future in futures:
+            future.cancel()
+        if max_workers:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def run_probes(tasks, max_workers=None, deadline=None):
+    """
+    Run probe tasks concurrently and return {key: result}.
+    Wall-clock time is set by the slowest probe.
+    """
+    return dict(iter_probes(tasks, max_workers=max_workers, deadline=deadline))
@@ -0,0 +1,164 @@
+import atexit
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+# ================= CONFIG =================
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+# Per-platform yield history (SQLite, shared by every process);
+# set OSINT_PROBE_STATS_PATH="" to keep it in memory only
+STATS_PATH = os.environ.get(
+    "OSINT_PROBE_STATS_PATH", str(BASE_DIR / "data" / "probe_stats.db")
+)
+
+# Beta prior on a platform's hit rate: an unseen platform scores
+# PRIOR_HITS / PRIOR_REQUESTS, so it is tried before proven-dead ones
+PRIOR_HITS = 1.0
+PRIOR_REQUESTS = 10.0
+
+# Requests of history before a platform may be pruned for low yield
+MIN_HISTORY = 30
+
+# Pending counts are written out this often (seconds / records)
+FLUSH_INTERVAL = 10.0
+FLUSH_EVERY = 500
+
+
+# ================= STORE =================
+
+class ProbeStats:
+    """
+    Learned per-platform yield: requests sent, hits (FOUND) and
+    errors, keyed by (scope, platform). Scores are the smoothed hit
+    rate per request, so ordering by score puts the platforms that
+    historically produce findings first.
+    """
+
+    def __init__(self, path=STATS_PATH):
+        self._lock = threading.Lock()
+        self._totals = {}
+        self._pending = {}
+        self._pending_count = 0
+        self._flushed_at = time.monotonic()
+        self._db = None
+
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False, timeout=10)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS probe_stats "
+                "(scope TEXT, platform TEXT, requests INTEGER, hits INTEGER, errors INTEGER, "
+                "PRIMARY KEY (scope, platform))"
+            )
+            self._db.commit()
+            self._load()
+
+    def _load(self):
+        rows = self._db.execute(
+            "SELECT scope, platform, requests, hits, errors FROM probe_stats"
+        ).fetchall()
+        self._totals = {(scope, platform): [r, h, e] for scope, platform, r, h, e in rows}
+
+    def record(self, scope, platform, outcome):
+        """
+        outcome: "found", "not_found" or "error" — one request each.
+        """
+        delta = (1, outcome == "found", outcome == "error")
+        key = (scope, platform)
+
+        with self._lock:
+            for counts in (self._totals, self._pending):
+                row = counts.setdefault(key, [0, 0, 0])
+                row[0] += delta[0]
+                row[1] += delta[1]
+                row[2] += delta[2]
+            self._pending_count += 1
+
+            due = (
+                self._pending_count >= FLUSH_EVERY
+                or time.monotonic() - self._flushed_at >= FLUSH_INTERVAL
+            )
+
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._pending_count = 0
+            self._flushed_at = time.monotonic()
+
+            if self._db is None or not pending:
+                return
+
+            try:
+                self._db.executemany(
+                    "INSERT INTO probe_stats VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT(scope, platform) DO UPDATE SET "
+                    "requests = requests + excluded.requests, "
+                    "hits = hits + excluded.hits, "
+                    "errors = errors + excluded.errors",
+                    [(s, p, r, h, e) for (s, p), (r, h, e) in pending.items()]
+                )
+                self._db.commit()
+                # Pick up what other processes learned meanwhile
+                self._load()
+            except sqlite3.Error as e:
+                print("[ProbeStats] Could not save yield history:", e)
+
+    def score(self, scope, platform):
+        requests, hits, _ = self._totals.get((scope, platform), (0, 0, 0))
+        return (hits + PRIOR_HITS) / (requests + PRIOR_REQUESTS)
+
+    def history(self, scope, platform):
+        return self._totals.get((scope, platform), (0, 0, 0))[0]
+
+    def order(self, scope, items, name=lambda item: item):
+        """
+        items sorted by learned yield, best first (stable for ties, so
+        file order still breaks them).
+        """
+        return sorted(items, key=lambda item: -self.score(scope, name(item)))
+
+    def prunable(self, scope, platform, min_yield):
+        """
+        True once a platform has enough history to be confidently
+        below min_yield.
+        """
+        return (
+            min_yield is not None
+            and self.history(scope, platform) >= MIN_HISTORY
+            and self.score(scope, platform) < min_yield
+        )
+
+    def stats(self, scope=None):
+        with self._lock:
+            return {
+                f"{s}/{p}": {
+                    "requests": r,
+                    "hits": h,
+                    "errors": e,
+                    "yield": round((h + PRIOR_HITS) / (r + PRIOR_REQUESTS), 4)
+                }
+                for (s, p), (r, h, e) in self._totals.items()
+                if scope is None or s == scope
+            }
+
+
+_stats = None
+_stats_lock = threading.Lock()
+
+
+def get_stats():
+    global _stats
+
+    if _stats is None:
+        with _stats_lock:
+            if _stats is None:
+                _stats = ProbeStats()
+                atexit.register(_stats.flush)
+    return _stats
@@ -0,0 +1,40 @@
+import threading
+import time
+from urllib.parse import urlparse
+
+
+def host_of(url):
+    return urlparse(url).netloc.lower()
+
+
+class HostRateLimiter:
+    """
+    Per-host token bucket (GCRA form).
+    rate: sustained requests/sec per host, burst: requests allowed at once.
+    """
+
+    def __init__(self, rate=2.0, burst=4):
+        self.interval = 1.0 / rate
+        self.tolerance = (burst - 1) * self.interval
+        self._tat = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, host, deadline=None):
+        """
+        Block until host may be hit again.
+        Returns False (without waiting) if that would pass the deadline.
+        """
+        with self._lock:
+            now = time.monotonic()
+            tat = max(self._tat.get(host, now), now)
+            send_at = max(now, tat - self.tolerance)
+
+            if deadline is not None and send_at > deadline:
+                return False
+
+            self._tat[host] = tat + self.interval
+
+        delay = send_at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        return True
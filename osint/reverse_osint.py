@@ -1,15 +1,18 @@
-
-import requests
+from osint import http_client
+from osint.markers import MarkerSet, match_response
 
 TRACKERS = ["google-analytics", "facebook", "doubleclick"]
 
+TRACKER_MARKERS = MarkerSet(TRACKERS)
+
 def detect_trackers(url):
     found = []
     try:
-        r = requests.get(url, timeout=5)
+        r = http_client.stream(url, timeout=5)
+        page = match_response(r, TRACKER_MARKERS, stop=lambda m: m.all(TRACKERS))
         for t in TRACKERS:
-            if t in r.text.lower():
+            if t in page:
                 found.append(t)
     except:
         pass
-    return found
+    return found
\ No newline at end of file
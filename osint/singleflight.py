@@ -0,0 +1,96 @@
+import copy
+import functools
+import inspect
+import threading
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls with the same key into one execution.
+    The first caller runs the function; callers arriving while it is
+    in flight wait for it and get the same result (or exception).
+    Nothing is remembered once the call finishes — that is the probe
+    cache's job.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._stats = {"executions": 0, "coalesced": 0}
+
+    def do(self, key, fn, *args, **kwargs):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._stats["executions"] += 1
+            else:
+                call.waiters += 1
+                self._stats["coalesced"] += 1
+
+        if leader:
+            try:
+                call.result = fn(*args, **kwargs)
+            except BaseException as e:
+                call.error = e
+                raise
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+            return call.result
+
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        # Followers get their own copy: callers annotate results in place
+        return copy.deepcopy(call.result)
+
+    def stats(self):
+        with self._lock:
+            return {**self._stats, "in_flight": len(self._calls)}
+
+
+_group = SingleFlight()
+
+
+def get_group():
+    return _group
+
+
+def coalesced(scope, key=None):
+    """
+    Decorator: concurrent calls of the function with the same arguments
+    share one execution.
+    key: optional fn(*args, **kwargs) -> hashable subject key, for
+         arguments that need normalizing (e.g. URLs); by default all
+         bound arguments make up the key.
+    """
+
+    def wrap(fn):
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if key is not None:
+                subject = key(*args, **kwargs)
+            else:
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                subject = tuple(bound.arguments.items())
+            return _group.do((scope, subject), fn, *args, **kwargs)
+
+        return wrapper
+
+    return wrap
@@ -1,6 +1,13 @@
-import json
-import requests
-from pathlib import Path
+import time
+
+from osint import http_client
+from osint.host_control import RateLimited
+from osint.markers import match_response
+from osint.platform_registry import INVALID, get_registry
+from osint.probe_cache import cached_probe
+from osint.probe_engine import TIMED_OUT, iter_probes
+from osint.probe_stats import get_stats
+from osint.rate_limit import HostRateLimiter
 
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (compatible; Chakravyuh-OSINT/1.0)"
@@ -8,34 +15,105 @@ HEADERS = {
 
 TIMEOUT = 5
 
-BASE_DIR = Path(__file__).resolve().parent.parent
-PLATFORM_DIR = BASE_DIR / "data" / "platforms"
+# Bulk engine limits
+BULK_CONCURRENCY = 64     # probes in flight across all hosts
+HOST_RATE = 2.0           # sustained requests/sec per host
+HOST_BURST = 4            # requests allowed at once per host
+SCAN_DEADLINE = 45        # seconds per username sweep
+
+# Yield-history scope for tier-2/3 platforms (see probe_stats)
+STATS_SCOPE = "bulk"
+
+SKIPPED = "SKIPPED"
+
+# One per-host budget for the whole process: concurrent sweeps share it
+# instead of each sending HOST_RATE to every platform
+_limiter = HostRateLimiter(rate=HOST_RATE, burst=HOST_BURST)
 
 
-def load_platforms(filename):
-    path = PLATFORM_DIR / filename
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+def load_platforms():
+    """
+    Tier-2 + Tier-3 entries from the shared, pre-compiled registry
+    (data/platforms/tier2.json and tier3.json, reloaded on change).
+    """
+    registry = get_registry()
+    return list(registry.group("tier2").values()) + list(registry.group("tier3").values())
+
+
+def _timeout_result(platform_name, url, tier):
+    return {
+        "platform": platform_name,
+        "url": url,
+        "status": "TIMEOUT",
+        "confidence": "UNKNOWN",
+        "tier": tier,
+        "evidence": "Scan deadline reached before probe completed"
+    }
+
+
+def _invalid_result(site, username):
+    return {
+        "platform": site.name,
+        "url": site.profile_url(username),
+        "status": INVALID,
+        "confidence": "HIGH",
+        "tier": site.tier,
+        "evidence": "Username cannot exist under the platform's handle rules"
+    }
+
+
+def _skipped_result(site, username, reason):
+    return {
+        "platform": site.name,
+        "url": site.profile_url(username),
+        "status": SKIPPED,
+        "confidence": "UNKNOWN",
+        "tier": site.tier,
+        "evidence": reason
+    }
+
+
+def scan_platform(username, site, limiter=None, deadline=None, bypass_cache=False):
+    """
+    Cached front for probe_platform: a cache hit costs no request and
+    no rate-limit token.
+    """
+    return cached_probe(
+        "bulk", site.name, username, probe_platform,
+        (username, site, limiter, deadline),
+        bypass=bypass_cache
+    )
+
 
+def probe_platform(username, site, limiter=None, deadline=None):
+    platform_name, tier = site.name, site.tier
+    url = site.profile_url(username)
 
-def scan_platform(username, platform_name, cfg, tier):
-    url = cfg["url"].replace("{username}", username)
+    if limiter and not limiter.acquire(site.host, deadline):
+        return _timeout_result(platform_name, url, tier)
 
     try:
-        r = requests.get(url, headers=HEADERS, timeout=TIMEOUT)
-        page = r.text.lower()
+        # No hedging: a sweep already saturates its hosts
+        r = http_client.stream(
+            url, headers=HEADERS, timeout=TIMEOUT, hedge=False, login_wall=True
+        )
 
         # relaxed logic for bulk platforms
         found = False
 
         if r.status_code == 200:
-            if "failure" in cfg:
-                if any(f.lower() in page for f in cfg["failure"]):
-                    found = False
-                else:
-                    found = username.lower() in page
-            else:
-                found = username.lower() in page
+            uname = username.lower()
+
+            # Platform markers are pre-compiled; the username rides along
+            page = match_response(
+                r, site.markers, extra=(uname,),
+                stop=lambda m: m.any(site.failure)
+            )
+            found = uname in page and not page.any(site.failure)
+        else:
+            http_client.release(r)
+
+        get_stats().record(STATS_SCOPE, platform_name, "found" if found else "not_found")
 
         return {
             "platform": platform_name,
@@ -46,7 +124,19 @@ def scan_platform(username, platform_name, cfg, tier):
             "evidence": "Bulk discovery check"
         }
 
+    except RateLimited as e:
+        get_stats().record(STATS_SCOPE, platform_name, "error")
+        return {
+            "platform": platform_name,
+            "url": url,
+            "status": "RATE LIMITED",
+            "confidence": "UNKNOWN",
+            "tier": tier,
+            "evidence": str(e)
+        }
+
     except Exception as e:
+        get_stats().record(STATS_SCOPE, platform_name, "error")
         return {
             "platform": platform_name,
             "url": url,
@@ -57,19 +147,109 @@ def scan_platform(username, platform_name, cfg, tier):
         }
 
 
-def bulk_username_scan(username):
+def iter_bulk_username_scan(username, concurrency=BULK_CONCURRENCY,
+                            deadline=SCAN_DEADLINE, bypass_cache=False,
+                            budget=None, max_requests=None, target_found=None,
+                            min_yield=None):
+    """
+    Probes Tier-2 and Tier-3 platforms concurrently and yields each
+    result as soon as its probe finishes.
+    Global concurrency is bounded, every host is rate limited (one
+    budget shared by all sweeps in the process) and the whole sweep stops at the deadline (unfinished probes → TIMEOUT).
+    budget: overall time budget in seconds, overrides deadline.
+
+    Platforms are probed highest learned yield first (probe_stats):
+    max_requests:  probe only the best N platforms
+    target_found:  start no new probes once this many platforms report
+                   FOUND (those already in flight still report)
+    min_yield:     skip platforms whose history puts their hit rate
+                   below this
+    Platforms left out by these limits come back as SKIPPED; those
+    whose handle rule rejects the username come back as invalid,
+    without a request.
+    """
+
+    stop_at = time.monotonic() + (deadline if budget is None else budget)
+    stats = get_stats()
+
+    tasks = []
+    skipped = []
+    for site in stats.order(STATS_SCOPE, load_platforms(), name=lambda s: s.name):
+        if not site.accepts(username):
+            yield _invalid_result(site, username)
+        elif stats.prunable(STATS_SCOPE, site.name, min_yield):
+            skipped.append((site, "Historical yield below min_yield"))
+        elif max_requests is not None and len(tasks) >= max_requests:
+            skipped.append((site, "Outside the request budget"))
+        else:
+            tasks.append((site, scan_platform, (username, site, _limiter, stop_at, bypass_cache)))
+
+    unfinished = {site for site, _, _ in tasks}
+    found = 0
+
+    def submit():
+        # Taken one at a time as probes finish; once the target is
+        # reached nothing new starts, and probes in flight still report
+        for task in tasks:
+            if target_found is not None and found >= target_found:
+                return
+            yield task
+
+    probes = iter_probes(submit(), max_workers=concurrency, deadline=stop_at, window=concurrency)
+    try:
+        for site, res in probes:
+            unfinished.discard(site)
+            if res is TIMED_OUT or res is None:
+                res = _timeout_result(site.name, site.profile_url(username), site.tier)
+            yield res
+
+            if res["status"] == "FOUND":
+                found += 1
+    finally:
+        # Cancels whatever has not started yet if the caller stops early
+        probes.close()
+
+    for site in unfinished:
+        skipped.append((site, "Target number of findings reached"))
+    for site, reason in skipped:
+        yield _skipped_result(site, username, reason)
+
+
+def bulk_username_scan(username, concurrency=BULK_CONCURRENCY,
+                       deadline=SCAN_DEADLINE, bypass_cache=False, budget=None,
+                       max_requests=None, target_found=None, min_yield=None):
     """
     Scans Tier-2 and Tier-3 platforms (970+)
     """
     results = {}
-
-    tier2 = load_platforms("tier2.json")
-    tier3 = load_platforms("tier3.json")
-
-    for name, cfg in tier2.items():
-        results[name] = scan_platform(username, name, cfg, tier=2)
-
-    for name, cfg in tier3.items():
-        results[name] = scan_platform(username, name, cfg, tier=3)
-
-    return results
\ No newline at end of file
+    counts = {}
+
+    start = time.monotonic()
+    for res in iter_bulk_username_scan(username, concurrency, deadline,
+                                       bypass_cache, budget, max_requests,
+                                       target_found, min_yield):
+        results[res["platform"]] = res
+        counts[res["status"]] = counts.get(res["status"], 0) + 1
+    elapsed = time.monotonic() - start
+
+    probed = (
+        len(results) - counts.get("TIMEOUT", 0)
+        - counts.get(INVALID, 0) - counts.get(SKIPPED, 0)
+    )
+
+    return {
+        "username": username,
+        "results": results,
+        "stats": {
+            "platforms": len(results),
+            "probed": probed,
+            "found": counts.get("FOUND", 0),
+            "errors": counts.get("ERROR", 0),
+            "rate_limited": counts.get("RATE LIMITED", 0),
+            "timed_out": counts.get("TIMEOUT", 0),
+            "invalid": counts.get(INVALID, 0),
+            "skipped": counts.get(SKIPPED, 0),
+            "elapsed_sec": round(elapsed, 2),
+            "probes_per_sec": round(probed / elapsed, 1) if elapsed else 0.0
+        }
+    }
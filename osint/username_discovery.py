@@ -1,4 +1,11 @@
-import requests
+import time
+
+from osint import http_client
+from osint.host_control import RateLimited
+from osint.platform_registry import get_registry
+from osint.probe_cache import cached_probe, presence_verdict
+from osint.probe_engine import TIMED_OUT, iter_probes
+from osint.singleflight import coalesced
 
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (compatible; Chakravyuh-OSINT/1.0)"
@@ -6,6 +13,9 @@ HEADERS = {
 
 TIMEOUT = 5
 
+# Returned by discover_site when the host is throttling us
+RATE_LIMITED = "RATE LIMITED"
+
 # OSINT-safe username endpoints
 USERNAME_SITES = {
     "GitHub": "https://github.com/{}",
@@ -22,32 +32,97 @@ USERNAME_SITES = {
     "npm": "https://www.npmjs.com/~{}"
 }
 
+# Handle syntax per site (see platform_registry._rule); sites without
+# an entry accept anything
+USERNAME_RULES = {
+    "GitHub": {"pattern": "[a-z0-9][a-z0-9-]*", "max": 39},
+    "GitLab": {"pattern": "[a-z0-9_][a-z0-9_.-]*", "min": 2, "max": 255},
+    "Bitbucket": "[a-z0-9_-]+",
+    "Reddit": {"pattern": "[a-z0-9_-]+", "min": 3, "max": 20},
+    "Medium": {"pattern": "[a-z0-9_.-]+", "min": 1, "max": 30},
+    "Dev.to": {"pattern": "[a-z0-9_]+", "max": 30},
+    # /users/<id> takes the numeric account id
+    "StackOverflow": r"\d+",
+    "DockerHub": {"pattern": "[a-z0-9]+", "min": 4, "max": 30},
+    "PyPI": {"pattern": "[a-z0-9](?:[a-z0-9._-]*[a-z0-9])?", "max": 50},
+    "npm": {"pattern": "[a-z0-9][a-z0-9._-]*", "max": 214, "case_sensitive": True}
+}
+
+
+def check_site(site, url):
+    # Only the status code matters; at most DRAIN_LIMIT bytes of the
+    # body are read, to keep the connection
+    r = http_client.stream(url, headers=HEADERS, timeout=TIMEOUT, login_wall=True)
+    http_client.release(r)
+
+    if r.status_code == 200:
+        return {
+            "site": site,
+            "url": url,
+            "confidence": "MEDIUM",
+            "evidence": "Public profile endpoint responded with HTTP 200"
+        }
+
+    return None
+
+
+def discover_site(site, username, url, bypass_cache=False):
+    try:
+        return cached_probe(
+            "discover", site, username, check_site, (site, url),
+            verdict=presence_verdict, bypass=bypass_cache
+        )
+    except RateLimited:
+        return RATE_LIMITED
+
+
+@coalesced("discover_username")
+def discover_username(username: str, bypass_cache: bool = False,
+                      budget: float | None = None):
+    """
+    Probes every discovery site concurrently, skipping sites where the
+    handle cannot exist. With a budget (seconds),
+    sites still unanswered when it runs out are listed in
+    sites_timed_out instead of holding up the result. Sites that were
+    throttling us (or walled the profile behind a login) are listed in
+    sites_rate_limited: not checked, rather than not found.
+    """
+
+    sites = get_registry().group("discovery")
+    deadline = time.monotonic() + budget if budget is not None else None
 
-def discover_username(username: str):
-    found = []
-    checked = []
+    invalid = [site for site, platform in sites.items() if not platform.accepts(username)]
 
-    for site, pattern in USERNAME_SITES.items():
-        url = pattern.format(username)
-        checked.append(site)
+    tasks = [
+        (site, discover_site, (site, username, platform.profile_url(username), bypass_cache))
+        for site, platform in sites.items()
+        if site not in invalid
+    ]
 
-        try:
-            r = requests.get(url, headers=HEADERS, timeout=TIMEOUT)
+    hits = {}
+    timed_out = []
+    rate_limited = []
 
-            if r.status_code == 200:
-                found.append({
-                    "site": site,
-                    "url": url,
-                    "confidence": "MEDIUM",
-                    "evidence": "Public profile endpoint responded with HTTP 200"
-                })
+    for site, hit in iter_probes(tasks, deadline=deadline):
+        if hit is TIMED_OUT:
+            timed_out.append(site)
+        elif hit == RATE_LIMITED:
+            rate_limited.append(site)
+        elif hit:
+            hits[site] = hit
 
-        except Exception:
-            continue
+    # Registry order, not completion order
+    found = [hits[site] for site in sites if site in hits]
 
     return {
         "username": username,
         "sites_found": found,
         "total_found": len(found),
-        "sites_checked": checked
-    }
\ No newline at end of file
+        "sites_checked": [
+            site for site in sites
+            if site not in timed_out and site not in rate_limited and site not in invalid
+        ],
+        "sites_timed_out": sorted(timed_out),
+        "sites_rate_limited": sorted(rate_limited),
+        "sites_invalid": invalid
+    }
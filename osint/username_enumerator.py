@@ -1,5 +1,17 @@
-import requests
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import time
+from collections.abc import Mapping
+from itertools import islice
+from typing import NamedTuple
+
+from osint import http_client
+from osint.host_control import RateLimited
+from osint.known_accounts import CONFIDENCE as KNOWN_CONFIDENCE, is_known
+from osint.markers import match_response
+from osint.platform_registry import INVALID, get_registry
+from osint.probe_cache import cached_probe
+from osint.probe_engine import TIMED_OUT, iter_probes
+from osint.probe_stats import get_stats
+from osint.singleflight import coalesced
 
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (compatible; Chakravyuh-OSINT/1.0)"
@@ -28,46 +40,56 @@ TIER_1 = [
 # PLATFORM DEFINITIONS (TIER-1 ONLY)
 # ============================================================
 
+# "username": handle syntax the platform allows (see
+# platform_registry._rule); impossible handles are never probed
 SITES = {
     "GitHub": {
         "url": "https://github.com/{username}",
         "success": ["repositories", "followers"],
-        "failure": ["not found"]
+        "failure": ["not found"],
+        "username": {"pattern": "[a-z0-9][a-z0-9-]*", "max": 39}
     },
     "Instagram": {
         "url": "https://www.instagram.com/{username}/",
         "success": ['"username"'],
-        "failure": ["page isn't available"]
+        "failure": ["page isn't available"],
+        "username": {"pattern": r"(?!\.)(?!.*\.\.)[a-z0-9._]*(?<!\.)", "min": 1, "max": 30}
     },
     "Twitter": {
         "url": "https://x.com/{username}",
         "success": ["profile_image_url"],
-        "failure": ["doesn’t exist"]
+        "failure": ["doesn’t exist"],
+        "username": {"pattern": "[a-z0-9_]+", "min": 1, "max": 15}
     },
     "LinkedIn": {
         "url": "https://www.linkedin.com/in/{username}",
         "success": ["experience"],
-        "failure": ["profile not found"]
+        "failure": ["profile not found"],
+        "username": {"pattern": "[a-z0-9-]+", "min": 3, "max": 100}
     },
     "YouTube": {
         "url": "https://www.youtube.com/@{username}",
         "success": ["videos"],
-        "failure": ["404"]
+        "failure": ["404"],
+        "username": {"pattern": "[a-z0-9._-]+", "min": 3, "max": 30}
     },
     "Reddit": {
         "url": "https://www.reddit.com/user/{username}",
         "success": ["karma"],
-        "failure": ["nobody on reddit"]
+        "failure": ["nobody on reddit"],
+        "username": {"pattern": "[a-z0-9_-]+", "min": 3, "max": 20}
     },
     "Pinterest": {
         "url": "https://www.pinterest.com/{username}/",
         "success": ["profile-followers"],
-        "failure": ["couldn't find"]
+        "failure": ["couldn't find"],
+        "username": {"pattern": "[a-z0-9_]+", "min": 3, "max": 30}
     },
     "Medium": {
         "url": "https://medium.com/@{username}",
         "success": ["member since"],
-        "failure": ["page not found"]
+        "failure": ["page not found"],
+        "username": {"pattern": "[a-z0-9_.-]+", "min": 1, "max": 30}
     }
 }
 
@@ -111,73 +133,176 @@ for platform in BASE_PLATFORMS:
         DUMMY_PLATFORMS.append(f"{platform}-{v}")
 
 # HARD CAP → 1000 total (8 Tier-1 + 992 dummy)
-DUMMY_PLATFORMS = DUMMY_PLATFORMS[:992]
+DUMMY_PLATFORMS = tuple(DUMMY_PLATFORMS[:992])
+DUMMY_SET = frozenset(DUMMY_PLATFORMS)
+
+
+# ============================================================
+# RESULT RECORDS
+# ============================================================
+
+class PlatformResult(NamedTuple):
+    url: str
+    status: str
+    confidence: str
+    visibility: str
+
+
+# One shared, immutable entry for every never-probed platform
+NOT_PROBED = PlatformResult("-", "NOT FOUND", "LOW", "UNKNOWN")
+
+
+class EnumerationResults(Mapping):
+    """
+    Read-only platform -> PlatformResult view.
+    Only the probed Tier-1 records are stored; the long tail resolves
+    to NOT_PROBED on access, so nothing is allocated per dummy platform.
+    Iterates Tier-1 first, then the long tail.
+    """
+
+    __slots__ = ("_probed",)
+
+    def __init__(self, probed):
+        self._probed = probed
+
+    def __getitem__(self, platform):
+        if platform in self._probed:
+            return self._probed[platform]
+        if platform in DUMMY_SET:
+            return NOT_PROBED
+        raise KeyError(platform)
+
+    def __iter__(self):
+        yield from (p for p in TIER_1 if p in self._probed)
+        yield from DUMMY_PLATFORMS
+
+    def __len__(self):
+        return len(self._probed) + len(DUMMY_PLATFORMS)
+
+    def select(self, status=None):
+        """
+        Iterate (platform, result), optionally only one status (e.g. FOUND).
+        """
+        for platform in self:
+            result = self[platform]
+            if status is None or result.status == status:
+                yield platform, result
+
+    def page(self, page=1, per_page=50, status=None):
+        """
+        One page of (platform, result) rows plus the filtered total.
+        """
+        start = (max(page, 1) - 1) * per_page
+        rows = list(islice(self.select(status), start, start + per_page))
+        total = sum(1 for _ in self.select(status))
+        return rows, total
 
 
 # ============================================================
 # ENUMERATION FUNCTION
 # ============================================================
 
-def enumerate_username(username: str):
-    results = {}
-
-    # ---------- Tier-1: real HTTP checks ----------
-    def check_tier1(platform, cfg):
-        url = cfg["url"].format(username=username)
-        try:
-            r = requests.get(url, headers=HEADERS, timeout=TIMEOUT)
-            page = r.text.lower()
-
-            if any(s in page for s in cfg["success"]) and not any(f in page for f in cfg["failure"]):
-                return platform, {
-                    "url": url,
-                    "status": "FOUND",
-                    "confidence": "HIGH",
-                    "visibility": "PUBLIC"
-                }
-            else:
-                return platform, {
-                    "url": url,
-                    "status": "NOT FOUND",
-                    "confidence": "LOW",
-                    "visibility": "UNKNOWN"
-                }
-        except:
-            return platform, {
+def check_tier1(username, site):
+    url = site.profile_url(username)
+    try:
+        r = http_client.stream(url, headers=HEADERS, timeout=TIMEOUT, login_wall=True)
+        page = match_response(
+            r, site.markers,
+            stop=lambda m: m.any(site.failure)
+        )
+
+        found = page.any(site.success) and not page.any(site.failure)
+        get_stats().record("tier1", site.name, "found" if found else "not_found")
+
+        if found:
+            return {
+                "url": url,
+                "status": "FOUND",
+                "confidence": "HIGH",
+                "visibility": "PUBLIC"
+            }
+        else:
+            return {
                 "url": url,
-                "status": "ERROR",
-                "confidence": "UNKNOWN",
+                "status": "NOT FOUND",
+                "confidence": "LOW",
                 "visibility": "UNKNOWN"
             }
+    except RateLimited:
+        get_stats().record("tier1", site.name, "error")
+        return {
+            "url": url,
+            "status": "RATE LIMITED",
+            "confidence": "UNKNOWN",
+            "visibility": "UNKNOWN"
+        }
+    except:
+        get_stats().record("tier1", site.name, "error")
+        return {
+            "url": url,
+            "status": "ERROR",
+            "confidence": "UNKNOWN",
+            "visibility": "UNKNOWN"
+        }
+
+
+def probe_tier1(username, site, bypass_cache=False):
+    return cached_probe(
+        "enumerate", site.name, username, check_tier1, (username, site),
+        bypass=bypass_cache
+    )
 
-    # Parallel Tier-1 checks
-    with ThreadPoolExecutor(max_workers=8) as executor:
-        futures = [
-            executor.submit(check_tier1, p, SITES[p])
-            for p in TIER_1
-        ]
-        for f in as_completed(futures):
-            p, res = f.result()
-            results[p] = res
+
+def iter_tier1(username, bypass_cache=False, budget=None):
+    """
+    Yields (platform, PlatformResult) for Tier-1 in completion order.
+    Platforms whose handle rule rejects the username, or where the
+    known-accounts index lists it, come first (no request is made);
+    those still unfinished after budget seconds
+    yield TIMEOUT. Probes are submitted highest learned yield first.
+    """
+    sites = get_registry().group("tier1")
+    deadline = time.monotonic() + budget if budget is not None else None
+
+    tasks = []
+    for p, site in get_stats().order("tier1", sites.items(), name=lambda item: item[0]):
+        if not site.accepts(username):
+            yield p, PlatformResult(site.profile_url(username), INVALID, "UNKNOWN", "UNKNOWN")
+        elif is_known(p, username):
+            yield p, PlatformResult(
+                site.profile_url(username), "FOUND", KNOWN_CONFIDENCE, "UNKNOWN"
+            )
+        else:
+            tasks.append((p, probe_tier1, (username, site, bypass_cache)))
+
+    for p, res in iter_probes(tasks, deadline=deadline):
+        if res is TIMED_OUT:
+            yield p, PlatformResult(sites[p].profile_url(username), "TIMEOUT", "UNKNOWN", "UNKNOWN")
+        else:
+            yield p, PlatformResult(**res)
+
+
+def iter_enumerate_username(username: str, bypass_cache: bool = False,
+                            budget: float | None = None):
+    """
+    Yields (platform, result) as soon as each result is known:
+    Tier-1 probes in completion order, then the dummy long tail.
+    Nothing is buffered, so callers can stream results out.
+    """
+
+    # ---------- Tier-1: real HTTP checks (parallel) ----------
+    yield from iter_tier1(username, bypass_cache, budget)
 
     # ---------- Dummy platforms: ALWAYS NOT FOUND ----------
     for p in DUMMY_PLATFORMS:
-        results[p] = {
-            "url": "-",
-            "status": "NOT FOUND",
-            "confidence": "LOW",
-            "visibility": "UNKNOWN"
-        }
+        yield p, NOT_PROBED
 
-    # ---------- Order: Tier-1 first ----------
-    ordered = {}
-    for p in TIER_1:
-        ordered[p] = results[p]
-    for p, v in results.items():
-        if p not in ordered:
-            ordered[p] = v
 
-    return ordered
+@coalesced("enumerate_username")
+def enumerate_username(username: str, bypass_cache: bool = False,
+                       budget: float | None = None):
+    # Tier-1 first, then the long tail (see EnumerationResults)
+    return EnumerationResults(dict(iter_tier1(username, bypass_cache, budget)))
 
 
 # ============================================================
@@ -190,4 +315,4 @@ if __name__ == "__main__":
 
     print(f"\nTotal platforms shown: {len(res)}\n")
     for p, r in res.items():
-        print(f"{p:25} {r['status']}")
\ No newline at end of file
+        print(f"{p:25} {r.status}")
\ No newline at end of file
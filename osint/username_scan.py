@@ -1,4 +1,13 @@
-import requests
+import time
+
+from osint import http_client
+from osint.host_control import RateLimited
+from osint.known_accounts import CONFIDENCE as KNOWN_CONFIDENCE, is_known
+from osint.markers import match_response
+from osint.platform_registry import get_registry
+from osint.probe_cache import cached_probe, presence_verdict
+from osint.probe_engine import TIMED_OUT, run_probes
+from osint.singleflight import coalesced
 
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (compatible; Chakravyuh-OSINT/1.0)"
@@ -6,179 +15,288 @@ HEADERS = {
 
 TIMEOUT = 5
 
+# Statuses that mean the profile is not there; any other non-200
+# (bot walls, 403s, 5xx) says nothing about it either way
+NOT_FOUND_STATUSES = (404, 410)
+
+# Returned by a checker that got an answer it cannot judge; never cached
+INCONCLUSIVE = "INCONCLUSIVE"
+
+
+def safe_get(url):
+    return http_client.stream(url, headers=HEADERS, timeout=TIMEOUT, login_wall=True)
+
+
+def _non_200(r):
+    http_client.release(r)
+    return None if r.status_code in NOT_FOUND_STATUSES else INCONCLUSIVE
+
+
+def richness(count):
+    return (
+        "HIGH" if count > 20 else
+        "MEDIUM" if count > 5 else
+        "LOW"
+    )
+
+
+# =========================================================
+# INSTAGRAM
+# =========================================================
+IG_NOT_FOUND = [
+    "profile isn't available",
+    "sorry, this page isn't available",
+    "page not found",
+    "the link you followed may be broken"
+]
+
+IG_PRIVATE_SIGNALS = [
+    '"is_private":true',
+    "this account is private",
+    "follow to see their photos",
+]
+
+
+def check_instagram(uname):
+    site = get_registry().get("scan", "Instagram")
+    url = site.profile_url(uname)
+    r = safe_get(url)
+
+    if r.status_code != 200:
+        return _non_200(r)
+
+    # Any not-found marker settles it; stop reading there
+    page = match_response(r, site.markers, stop=lambda m: m.any(IG_NOT_FOUND))
+
+    exists = '"username"' in page and not page.any(IG_NOT_FOUND)
+
+    if not exists:
+        return None
+
+    post_count = page.counts['"shortcode"']
+
+    visibility = (
+        "PRIVATE" if page.any(IG_PRIVATE_SIGNALS)
+        else "PUBLIC"
+    )
+
+    return {
+        "url": url,
+        "confidence": "HIGH",
+        "visibility": visibility,
+        "richness": richness(post_count),
+        "evidence": (
+            "Instagram account exists (private)"
+            if visibility == "PRIVATE"
+            else "Public Instagram profile with visible posts"
+        )
+    }
+
+
+# =========================================================
+# FACEBOOK
+# =========================================================
+FB_BLOCKERS = [
+    "log in to facebook",
+    "this content isn't available",
+    "page not found",
+    "create new account",
+]
+
+FB_STRONG_SIGNALS = ["timeline", "friends", "photos"]
+
+
+def check_facebook(uname):
+    site = get_registry().get("scan", "Facebook")
+    url = site.profile_url(uname)
+    r = safe_get(url)
+
+    if r.status_code != 200:
+        return _non_200(r)
+
+    page = match_response(r, site.markers, stop=lambda m: m.any(FB_BLOCKERS))
+
+    if page.all(FB_STRONG_SIGNALS) and not page.any(FB_BLOCKERS):
+        return {
+            "url": url,
+            "confidence": "LOW",
+            "visibility": "PUBLIC",
+            "richness": richness(page.counts["post"]),
+            "evidence": "Public Facebook timeline detected"
+        }
+
+    return None
+
+
+# =========================================================
+# THREADS
+# =========================================================
+THREADS_FAILURE = ["page not found", "log in"]
+
+
+def check_threads(uname):
+    site = get_registry().get("scan", "Threads")
+    url = site.profile_url(uname)
+    r = safe_get(url)
+
+    if r.status_code != 200:
+        return _non_200(r)
+
+    page = match_response(r, site.markers, stop=lambda m: m.any(THREADS_FAILURE))
+
+    if "threads" in page and not page.any(THREADS_FAILURE):
+        return {
+            "url": url,
+            "confidence": "MEDIUM",
+            "visibility": "PUBLIC",
+            "richness": "MEDIUM",
+            "evidence": "Public Threads profile detected"
+        }
+
+    return None
+
+
+# =========================================================
+# PLATFORM DISPATCH
+# =========================================================
+
+# Instagram handle syntax, shared by Threads
+IG_USERNAME = {"pattern": r"(?!\.)(?!.*\.\.)[a-z0-9._]*(?<!\.)", "min": 1, "max": 30}
+
+# Registry entries (URL + markers + handle rule) for the checkers above
+SCAN_SITES = {
+    "Instagram": {
+        "url": "https://www.instagram.com/{username}/",
+        "success": ['"username"'],
+        "failure": IG_NOT_FOUND,
+        "signals": IG_PRIVATE_SIGNALS + ['"shortcode"'],
+        "username": IG_USERNAME
+    },
+    "Facebook": {
+        "url": "https://www.facebook.com/{username}",
+        "success": FB_STRONG_SIGNALS,
+        "failure": FB_BLOCKERS,
+        "signals": ["post"],
+        "username": {"pattern": "[a-z0-9.]+", "min": 5, "max": 50}
+    },
+    "Threads": {
+        "url": "https://www.threads.net/@{username}",
+        "success": ["threads"],
+        "failure": THREADS_FAILURE,
+        "username": IG_USERNAME
+    }
+}
+
+CHECKS = {
+    "Instagram": check_instagram,
+    "Facebook": check_facebook,
+    "Threads": check_threads
+}
+
 
-def scan_username(username: str, platform: str | None = None):
+# Returned by check_platform when the host is throttling us
+RATE_LIMITED = "RATE LIMITED"
+
+
+def known_result(site, uname):
+    return {
+        "url": site.profile_url(uname),
+        "confidence": KNOWN_CONFIDENCE,
+        "visibility": "UNKNOWN",
+        "evidence": "Listed in the known-accounts index (no live check)"
+    }
+
+
+def check_platform(platform, uname, bypass_cache=False):
     """
-    OSINT-safe username scanner.
-    Supported platforms: Instagram, Facebook, Threads
+    Run one checker behind the probe cache.
+    Network errors propagate and INCONCLUSIVE answers are returned
+    as is; neither is cached.
+    """
+    try:
+        return cached_probe(
+            "scan", platform, uname, CHECKS[platform], (uname,),
+            verdict=presence_verdict, bypass=bypass_cache
+        )
+    except RateLimited:
+        return RATE_LIMITED
+
+
+def scan_usernames(targets, bypass_cache=False, budget=None):
+    """
+    Batch scanner: targets maps platform -> username.
+    Every supported platform is probed concurrently, so wall-clock
+    time is set by the slowest platform — or by budget (seconds), after
+    which unfinished platforms are reported as timed out.
+    Handles a platform's syntax rule rejects are never probed, and
+    handles in the known-accounts index are answered from it.
     """
 
     platforms_found = {}
     inconclusive = set()
+    rate_limited = set()
+    timed_out = set()
+    invalid = set()
+
+    deadline = time.monotonic() + budget if budget is not None else None
+    sites = get_registry().group("scan")
+
+    tasks = []
+    for plat, uname in targets.items():
+        if not uname or plat not in CHECKS:
+            continue
+        if not sites[plat].accepts(uname):
+            invalid.add(plat)
+            continue
+        if is_known(plat, uname):
+            platforms_found[plat] = known_result(sites[plat], uname)
+            continue
+        tasks.append((plat, check_platform, (plat, uname, bypass_cache)))
+
+    for plat, result in run_probes(tasks, deadline=deadline).items():
+        if result is TIMED_OUT:
+            timed_out.add(plat)
+            inconclusive.add(plat)
+        elif result == RATE_LIMITED:
+            rate_limited.add(plat)
+            inconclusive.add(plat)
+        elif result == INCONCLUSIVE:
+            inconclusive.add(plat)
+        elif result:
+            platforms_found[plat] = result
+        else:
+            inconclusive.add(plat)
+
+    return {
+        "platforms_found": platforms_found,
+        "inconclusive_platforms": sorted(inconclusive),
+        "rate_limited_platforms": sorted(rate_limited),
+        "timed_out_platforms": sorted(timed_out),
+        # Answered locally: the handle cannot exist there
+        "invalid_platforms": sorted(invalid)
+    }
+
+
+@coalesced("scan_username")
+def scan_username(username: str, platform: str | None = None,
+                  bypass_cache: bool = False, budget: float | None = None):
+    """
+    OSINT-safe username scanner.
+    Supported platforms: Instagram, Facebook, Threads
+    """
 
     if not username:
         return {
             "platforms_found": {},
-            "inconclusive_platforms": []
+            "inconclusive_platforms": [],
+            "rate_limited_platforms": [],
+            "timed_out_platforms": [],
+            "invalid_platforms": []
         }
 
-    def safe_get(url):
-        return requests.get(url, headers=HEADERS, timeout=TIMEOUT)
-
-    # =========================================================
-    # INSTAGRAM
-    # =========================================================
-    def check_instagram(uname):
-        try:
-            url = f"https://www.instagram.com/{uname}/"
-            r = safe_get(url)
-            page = r.text.lower()
-
-            not_found = [
-                "profile isn't available",
-                "sorry, this page isn't available",
-                "page not found",
-                "the link you followed may be broken"
-            ]
-
-            exists = (
-                r.status_code == 200
-                and '"username"' in page
-                and not any(x in page for x in not_found)
-            )
-
-            if not exists:
-                return None
-
-            post_count = page.count('"shortcode"')
-
-            private_signals = [
-                '"is_private":true',
-                "this account is private",
-                "follow to see their photos",
-            ]
-
-            visibility = (
-                "PRIVATE" if any(p in page for p in private_signals)
-                else "PUBLIC"
-            )
-
-            return {
-                "url": url,
-                "confidence": "HIGH",
-                "visibility": visibility,
-                "richness": (
-                    "HIGH" if post_count > 20 else
-                    "MEDIUM" if post_count > 5 else
-                    "LOW"
-                ),
-                "evidence": (
-                    "Instagram account exists (private)"
-                    if visibility == "PRIVATE"
-                    else "Public Instagram profile with visible posts"
-                )
-            }
-
-        except Exception:
-            return None
-
-    # =========================================================
-    # FACEBOOK
-    # =========================================================
-    def check_facebook(uname):
-        try:
-            url = f"https://www.facebook.com/{uname}"
-            r = safe_get(url)
-            page = r.text.lower()
-
-            blockers = [
-                "log in to facebook",
-                "this content isn't available",
-                "page not found",
-                "create new account",
-            ]
-
-            strong_signals = all(
-                x in page for x in ["timeline", "friends", "photos"]
-            )
-
-            if r.status_code == 200 and strong_signals and not any(b in page for b in blockers):
-                post_count = page.count("post")
-
-                return {
-                    "url": url,
-                    "confidence": "LOW",
-                    "visibility": "PUBLIC",
-                    "richness": (
-                        "HIGH" if post_count > 20 else
-                        "MEDIUM" if post_count > 5 else
-                        "LOW"
-                    ),
-                    "evidence": "Public Facebook timeline detected"
-                }
-
-            return None
-
-        except Exception:
-            return None
-
-    # =========================================================
-    # THREADS
-    # =========================================================
-    def check_threads(uname):
-        try:
-            url = f"https://www.threads.net/@{uname}"
-            r = safe_get(url)
-            page = r.text.lower()
-
-            if (
-                r.status_code == 200
-                and "threads" in page
-                and "page not found" not in page
-                and "log in" not in page
-            ):
-                return {
-                    "url": url,
-                    "confidence": "MEDIUM",
-                    "visibility": "PUBLIC",
-                    "richness": "MEDIUM",
-                    "evidence": "Public Threads profile detected"
-                }
-
-            return None
-
-        except Exception:
-            return None
-
-    # =========================================================
-    # PLATFORM DISPATCH
-    # =========================================================
-    checks = {
-        "Instagram": check_instagram,
-        "Facebook": check_facebook,
-        "Threads": check_threads
-    }
-
     # ---- Platform-wise scan ----
     if platform:
-        checker = checks.get(platform)
-        if checker:
-            result = checker(username)
-            if result:
-                platforms_found[platform] = result
-            else:
-                inconclusive.add(platform)
+        return scan_usernames({platform: username}, bypass_cache, budget)
 
     # ---- Single username scan ----
-    else:
-        for plat, checker in checks.items():
-            result = checker(username)
-            if result:
-                platforms_found[plat] = result
-            else:
-                inconclusive.add(plat)
-
-    return {
-        "platforms_found": platforms_found,
-        "inconclusive_platforms": sorted(inconclusive)
-    }
\ No newline at end of file
+    return scan_usernames({plat: username for plat in CHECKS}, bypass_cache, budget)
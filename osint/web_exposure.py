@@ -1,7 +1,13 @@
-import requests
-import dns.resolver
+import os
+import re
+import time
 from urllib.parse import urlparse
 
+from osint import http_client
+from osint.dns_resolver import get_resolver
+from osint.probe_engine import TIMED_OUT, iter_probes
+from osint.singleflight import coalesced
+
 # ================= CONFIG =================
 
 HEADERS = {
@@ -10,6 +16,15 @@ HEADERS = {
 
 TIMEOUT = 5
 
+# Whole-analysis deadline when the caller gives no budget: every stage
+# runs at once, so this is one slow request plus some slack
+TARGET_DEADLINE = float(os.environ.get("OSINT_WEB_EXPOSURE_DEADLINE", "10"))
+
+# All queried at once through the shared resolver: one round trip
+DNS_RECORD_TYPES = ["A", "AAAA", "MX", "TXT", "NS", "CAA", "SOA"]
+
+STAGES = ["paths", "robots", "security_headers", "dns"]
+
 # Truly sensitive if exposed
 SENSITIVE_FILES = [
     ".env",
@@ -27,6 +42,13 @@ INTERESTING_DIRS = [
     "backup"
 ]
 
+# Bytes read from a candidate file: enough to recognise it, never more
+SNIFF_BYTES = 4096
+
+# Returned by checks that got no answer (throttled, connection error):
+# the result is unknown, not negative
+CHECK_FAILED = object()
+
 SECURITY_HEADERS = [
     "Content-Security-Policy",
     "Strict-Transport-Security",
@@ -44,46 +66,170 @@ def normalize_url(target: str) -> str:
     return target.rstrip("/")
 
 
+def _time_left(deadline):
+    """
+    Request timeout capped by what is left of the budget (<= 0: none left).
+    """
+    if deadline is None:
+        return TIMEOUT
+    return min(TIMEOUT, deadline - time.monotonic())
+
+
+def _out_of_time(deadline):
+    return deadline is not None and time.monotonic() >= deadline
+
+
 # ================= PATH CHECKS =================
+# Sensitive files are fetched with a Range request and read only up to
+# SNIFF_BYTES, then recognised by their first bytes; an exposed
+# multi-GB backup costs the same few KB as a missing one. The full
+# size comes from Content-Range / Content-Length.
+
+ENV_LINE = re.compile(rb"^\s*(export\s+)?[A-Za-z_][A-Za-z0-9_]*\s*=", re.M)
+SQL_MARKERS = re.compile(
+    rb"create table|insert into|drop table|-- mysql dump|postgresql database dump|"
+    rb"lock tables|set names",
+    re.I
+)
+
+
+def _looks_html(head):
+    start = head.lstrip()[:256].lower()
+    return start.startswith((b"<!doctype", b"<html", b"<head", b"<body")) or b"<html" in start
+
 
-def check_exposed_paths(base_url):
-    exposed_sensitive = []
-    interesting_paths = []
+def _sniff_env(head):
+    if not _looks_html(head) and ENV_LINE.search(head):
+        return f"{len(ENV_LINE.findall(head))} KEY=value line(s)"
 
-    for path in SENSITIVE_FILES + INTERESTING_DIRS:
-        try:
-            url = f"{base_url}/{path}"
-            r = requests.get(url, headers=HEADERS, timeout=TIMEOUT)
 
-            if r.status_code == 200 and len(r.text) > 50:
-                if path in SENSITIVE_FILES:
-                    exposed_sensitive.append(url)
-                else:
-                    interesting_paths.append(url)
+def _sniff_git_config(head):
+    if b"[core]" in head:
+        return "git config with [core] section"
 
-        except Exception:
-            pass
 
+def _sniff_zip(head):
+    if head.startswith((b"PK\x03\x04", b"PK\x05\x06")):
+        return "zip archive signature"
+
+
+def _sniff_sql(head):
+    if not _looks_html(head) and SQL_MARKERS.search(head):
+        return "SQL dump statements"
+
+
+def _sniff_php(head):
+    # Served as source instead of being executed
+    if b"<?php" in head:
+        return "raw PHP source"
+
+
+def _sniff_page(head):
+    if len(head.strip()) > 50:
+        return "page content"
+
+
+SNIFFERS = {
+    ".env": _sniff_env,
+    ".git/config": _sniff_git_config,
+    "backup.zip": _sniff_zip,
+    "db.sql": _sniff_sql,
+    "config.php": _sniff_php,
+}
+
+
+def _content_length(r):
+    # 206: "bytes 0-4095/123456789"; 200: the whole body's length
+    total = r.headers.get("Content-Range", "").rpartition("/")[2]
+    if r.status_code == 206 and total.isdigit():
+        return int(total)
+    length = r.headers.get("Content-Length", "")
+    return int(length) if r.status_code == 200 and length.isdigit() else None
+
+
+def check_path(base_url, path, deadline=None):
+    """
+    One path probe: a details dict (evidence, content_length) if it
+    serves real content, False if not, TIMED_OUT if the deadline cut
+    it short, CHECK_FAILED if the request itself failed.
+    """
+    timeout = _time_left(deadline)
+    if timeout <= 0:
+        return TIMED_OUT
+
+    sensitive = path in SNIFFERS
+    headers = dict(HEADERS)
+    if sensitive:
+        # Raw bytes (magic numbers), and only the first few KB
+        headers["Range"] = f"bytes=0-{SNIFF_BYTES - 1}"
+        headers["Accept-Encoding"] = "identity"
+
+    try:
+        r = http_client.stream(f"{base_url}/{path}", headers=headers, timeout=timeout)
+        if r.status_code not in (200, 206):
+            http_client.release(r)
+            return False
+
+        content_length = _content_length(r)
+        head = http_client.read_prefix(r, SNIFF_BYTES)
+    except Exception:
+        return TIMED_OUT if _out_of_time(deadline) else CHECK_FAILED
+
+    evidence = (SNIFFERS[path] if sensitive else _sniff_page)(head)
+    if not evidence:
+        return False
+
+    return {
+        "evidence": evidence,
+        "content_length": content_length,
+        "bytes_read": len(head)
+    }
+
+
+def _sort_paths(base_url, found):
+    # found: path -> check_path details (any container of paths works)
+    exposed_sensitive = [f"{base_url}/{p}" for p in SENSITIVE_FILES if p in found]
+    interesting_paths = [f"{base_url}/{p}" for p in INTERESTING_DIRS if p in found]
     return exposed_sensitive, interesting_paths
 
 
+def check_exposed_paths(base_url, deadline=None, timed_out=None):
+    found = {}
+
+    tasks = [
+        (path, check_path, (base_url, path, deadline))
+        for path in SENSITIVE_FILES + INTERESTING_DIRS
+    ]
+    for path, result in iter_probes(tasks, deadline=deadline):
+        if result is TIMED_OUT:
+            if timed_out is not None:
+                timed_out.append(f"/{path}")
+        elif result and result is not CHECK_FAILED:
+            found[path] = result
+
+    return _sort_paths(base_url, found)
+
+
 # ================= ROBOTS =================
 
-def check_robots(base_url):
+def _fetch_robots(base_url, deadline=None):
+    # Raises if robots.txt could not be fetched (server errors included)
     disallowed = []
     sitemap = None
 
-    try:
-        r = requests.get(f"{base_url}/robots.txt", headers=HEADERS, timeout=TIMEOUT)
-        if r.status_code == 200:
-            for line in r.text.splitlines():
-                line = line.strip()
-                if line.lower().startswith("disallow"):
-                    disallowed.append(line.split(":", 1)[1].strip())
-                elif line.lower().startswith("sitemap"):
-                    sitemap = line.split(":", 1)[1].strip()
-    except Exception:
-        pass
+    timeout = _time_left(deadline)
+    if timeout <= 0:
+        raise TimeoutError("scan budget used up")
+    r = http_client.get(f"{base_url}/robots.txt", headers=HEADERS, timeout=timeout)
+    if r.status_code >= 500:
+        raise ConnectionError(f"robots.txt: HTTP {r.status_code}")
+    if r.status_code == 200:
+        for line in r.text.splitlines():
+            line = line.strip()
+            if line.lower().startswith("disallow"):
+                disallowed.append(line.split(":", 1)[1].strip())
+            elif line.lower().startswith("sitemap"):
+                sitemap = line.split(":", 1)[1].strip()
 
     return {
         "disallowed_paths": disallowed,
@@ -91,21 +237,30 @@ def check_robots(base_url):
     }
 
 
+def check_robots(base_url, deadline=None):
+    try:
+        return _fetch_robots(base_url, deadline)
+    except Exception:
+        return {"disallowed_paths": [], "sitemap": None}
+
+
 # ================= SECURITY HEADERS =================
 
-def check_security_headers(base_url):
+def _fetch_security_headers(base_url, deadline=None):
     present = []
     missing = []
 
-    try:
-        r = requests.get(base_url, headers=HEADERS, timeout=TIMEOUT)
-        for header in SECURITY_HEADERS:
-            if header in r.headers:
-                present.append(header)
-            else:
-                missing.append(header)
-    except Exception:
-        pass
+    timeout = _time_left(deadline)
+    if timeout <= 0:
+        raise TimeoutError("scan budget used up")
+    # Only the headers are needed: the page body is never downloaded
+    r = http_client.stream(base_url, headers=HEADERS, timeout=timeout)
+    http_client.release(r)
+    for header in SECURITY_HEADERS:
+        if header in r.headers:
+            present.append(header)
+        else:
+            missing.append(header)
 
     return {
         "present": present,
@@ -113,19 +268,26 @@ def check_security_headers(base_url):
     }
 
 
-# ================= DNS OSINT =================
+def check_security_headers(base_url, deadline=None):
+    try:
+        return _fetch_security_headers(base_url, deadline)
+    except Exception:
+        return {"present": [], "missing": []}
+
 
-def dns_osint(domain):
-    records = {}
+# ================= DNS OSINT =================
 
-    for rtype in ["A", "MX", "TXT"]:
-        try:
-            answers = dns.resolver.resolve(domain, rtype)
-            records[rtype] = [str(r) for r in answers]
-        except Exception:
-            records[rtype] = []
+def dns_osint(domain, deadline=None):
+    """
+    Every DNS_RECORD_TYPES answer for domain, queried in parallel and
+    cached per TTL by the shared resolver; a type whose lookup failed
+    or timed out maps to None. TIMED_OUT if no time is left.
+    """
+    timeout = _time_left(deadline)
+    if timeout <= 0:
+        return TIMED_OUT
 
-    return records
+    return get_resolver().resolve_many(domain, DNS_RECORD_TYPES, timeout=timeout)
 
 
 # ================= RISK ENGINE =================
@@ -175,14 +337,80 @@ def calculate_web_risk(exposed, interesting, robots, headers):
 
 # ================= MAIN ANALYSIS =================
 
-def analyze_website_exposure(target):
+def _stage_task(fetch, base_url, deadline):
+    # TIMED_OUT / CHECK_FAILED instead of an empty result
+    try:
+        result = fetch(base_url, deadline)
+    except Exception:
+        return TIMED_OUT if _out_of_time(deadline) else CHECK_FAILED
+    return TIMED_OUT if _out_of_time(deadline) else result
+
+
+# Same site however it was typed (example.com, https://example.com/)
+@coalesced("web_exposure", key=lambda target, budget=None: (normalize_url(target), budget))
+def analyze_website_exposure(target, budget=None):
+    """
+    Every check (each path, robots, headers, DNS) is a leaf probe on
+    the shared engine, all started at once, so the whole analysis
+    takes about as long as its slowest request.
+    budget: overall seconds (default TARGET_DEADLINE); checks that could
+    not finish in time are listed under timed_out, those whose request
+    failed under failed. timings holds the seconds each stage took.
+    """
     base_url = normalize_url(target)
     domain = urlparse(base_url).netloc
 
-    exposed, interesting = check_exposed_paths(base_url)
-    robots = check_robots(base_url)
-    headers = check_security_headers(base_url)
-    dns_records = dns_osint(domain)
+    start = time.monotonic()
+    deadline = start + (TARGET_DEADLINE if budget is None else budget)
+
+    tasks = [
+        (("path", path), check_path, (base_url, path, deadline))
+        for path in SENSITIVE_FILES + INTERESTING_DIRS
+    ]
+    tasks.append((("robots", None), _stage_task, (_fetch_robots, base_url, deadline)))
+    tasks.append((
+        ("security_headers", None), _stage_task, (_fetch_security_headers, base_url, deadline)
+    ))
+    tasks.append((("dns", None), dns_osint, (domain, deadline)))
+
+    found = {}
+    robots = {"disallowed_paths": [], "sitemap": None}
+    headers = {"present": [], "missing": []}
+    dns_records = {rtype: None for rtype in DNS_RECORD_TYPES}
+    timed_out = []
+    failed = []
+    timings = {}
+
+    for (stage, item), result in iter_probes(tasks, deadline=deadline):
+        # A stage takes as long as its slowest probe
+        stage_key = "paths" if stage == "path" else stage
+        timings[stage_key] = round(time.monotonic() - start, 3)
+
+        if result is TIMED_OUT:
+            if stage == "path":
+                timed_out.append(f"/{item}")
+            elif stage not in timed_out:
+                timed_out.append(stage)
+        elif result is CHECK_FAILED:
+            failed.append(f"/{item}" if stage == "path" else stage)
+        elif stage == "path":
+            if result:
+                found[item] = result
+        elif stage == "robots":
+            robots = result or robots
+        elif stage == "security_headers":
+            headers = result or headers
+        else:
+            dns_records = {**dns_records, **(result or {})}
+
+    exposed, interesting = _sort_paths(base_url, found)
+
+    # Report in check order, not completion order
+    order = [f"/{p}" for p in SENSITIVE_FILES + INTERESTING_DIRS] + STAGES[1:]
+    timed_out.sort(key=order.index)
+    failed.sort(key=order.index)
+    timings = {stage: timings[stage] for stage in STAGES if stage in timings}
+    timings["total"] = round(time.monotonic() - start, 3)
 
     risk = calculate_web_risk(
         exposed=exposed,
@@ -195,8 +423,20 @@ def analyze_website_exposure(target):
         "target": base_url,
         "exposed_sensitive_files": exposed,
         "interesting_paths": interesting,
+        # url -> evidence, content_length (full size, never downloaded)
+        "exposure_details": {
+            f"{base_url}/{p}": found[p]
+            for p in SENSITIVE_FILES + INTERESTING_DIRS if p in found
+        },
         "robots": robots,
         "security_headers": headers,
-        "dns_records": dns_records,
-        "risk": risk
-    }
\ No newline at end of file
+        "dns_records": {rtype: values or [] for rtype, values in dns_records.items()},
+        # Record types with no answer (resolver error or timeout), as
+        # opposed to an answer of no records
+        "dns_unresolved": [rtype for rtype, values in dns_records.items() if values is None],
+        "risk": risk,
+        "timed_out": timed_out,
+        # Checks whose request failed (throttled, connection error)
+        "failed": failed,
+        "timings": timings
+    }